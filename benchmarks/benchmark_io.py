@@ -0,0 +1,48 @@
+import os
+import tempfile
+
+from benchmarks.synthetic_data import generate_image, generate_roi
+from PartSegCore.analysis.save_functions import save_project
+from PartSegCore.roi_info import ROIInfo
+from PartSegImage import ImageWriter, TiffImageReader
+
+
+class TiffReadSuite:
+    params = (["2d", "3d", "time"], ["", "ADOBE_DEFLATE"])
+    param_names = ("kind", "compression")
+
+    def setup(self, kind, compression):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp_dir.name, "image.tif")
+        ImageWriter.save(generate_image(kind, 512 if kind == "2d" else 256, 100), self.path, compression=compression)
+
+    def teardown(self, *_):
+        self.tmp_dir.cleanup()
+
+    def time_read(self, *_):
+        TiffImageReader.read_image(self.path)
+
+    def peakmem_read(self, *_):
+        TiffImageReader.read_image(self.path)
+
+
+class SaveProjectSuite:
+    params = (["2d", "3d"], [".tgz", ".tbz2"])
+    param_names = ("kind", "extension")
+    timeout = 300
+
+    def setup(self, kind, extension):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp_dir.name, f"project{extension}")
+        size = 512 if kind == "2d" else 128
+        self.image = generate_image(kind, size, 100)
+        self.roi_info = ROIInfo(generate_roi(kind, size, 100)).fit_to_image(self.image)
+
+    def teardown(self, *_):
+        self.tmp_dir.cleanup()
+
+    def time_save_project(self, *_):
+        save_project(self.path, self.image, self.roi_info, None, [], {})
+
+    def peakmem_save_project(self, *_):
+        save_project(self.path, self.image, self.roi_info, None, [], {})
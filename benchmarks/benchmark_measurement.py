@@ -0,0 +1,68 @@
+import numpy as np
+
+from benchmarks.synthetic_data import generate_image, generate_roi
+from PartSegCore.analysis.measurement_base import AreaType, Leaf, MeasurementEntry, PerComponent
+from PartSegCore.analysis.measurement_calculation import MeasurementProfile
+from PartSegCore.roi_info import ROIInfo
+from PartSegCore.universal_const import Units
+
+MEASUREMENTS = [
+    "Volume",
+    "Voxels",
+    "Mean pixel brightness",
+    "Median pixel brightness",
+    "Standard deviation of pixel brightness",
+    "Maximum pixel brightness",
+    "Diameter",
+    "Surface",
+    "Moment",
+]
+
+
+def _measurement_profile() -> MeasurementProfile:
+    return MeasurementProfile(
+        name="benchmark",
+        chosen_fields=[
+            MeasurementEntry(
+                name=f"{name} {per_component}",
+                calculation_tree=Leaf(name=name, area=AreaType.ROI, per_component=per_component),
+            )
+            for name in MEASUREMENTS
+            for per_component in (PerComponent.No, PerComponent.Yes)
+        ],
+    )
+
+
+class MeasurementSuite:
+    params = (["2d", "3d", "time"], [10, 100])
+    param_names = ("kind", "components")
+    timeout = 300
+
+    def setup(self, kind, components):
+        size = 512 if kind == "2d" else 128
+        self.image = generate_image(kind, size, components)
+        self.roi = ROIInfo(generate_roi(kind, size, components)).fit_to_image(self.image)
+        self.profile = _measurement_profile()
+
+    def time_calculate(self, *_):
+        self.profile.calculate(self.image, 0, self.roi, Units.nm)
+
+    def peakmem_calculate(self, *_):
+        self.profile.calculate(self.image, 0, self.roi, Units.nm)
+
+
+class ROIInfoSuite:
+    params = (["2d", "3d", "time"], [10, 100, 1000])
+    param_names = ("kind", "components")
+
+    def setup(self, kind, components):
+        size = 1024 if kind == "2d" else 256
+        if kind == "3d" and components == 1000:
+            size = 512
+        self.roi = np.squeeze(generate_roi(kind, size, components))
+
+    def time_calc_bounds(self, *_):
+        ROIInfo.calc_bounds(self.roi)
+
+    def peakmem_calc_bounds(self, *_):
+        ROIInfo.calc_bounds(self.roi)
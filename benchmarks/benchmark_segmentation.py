@@ -0,0 +1,43 @@
+from benchmarks.synthetic_data import BORDER, CORE, generate_image
+from PartSegCore.segmentation.restartable_segmentation_algorithms import LowerThresholdFlowAlgorithm
+from PartSegCore.segmentation.watershed import WatershedSelection
+
+
+def _empty(*_):
+    """report function"""
+
+
+class ThresholdFlowSuite:
+    params = (["2d", "3d"], [10, 100], list(WatershedSelection.__register__.keys()))
+    param_names = ("kind", "components", "flow")
+    timeout = 300
+
+    def setup(self, kind, components, flow):
+        size = 512 if kind == "2d" else 128
+        self.image = generate_image(kind, size, components)
+        self.parameters = LowerThresholdFlowAlgorithm.__argument_class__(
+            channel=0,
+            minimum_size=10,
+            threshold={
+                "name": "Base/Core",
+                "values": {
+                    "core_threshold": {"name": "Manual", "values": {"threshold": (BORDER + CORE) // 2}},
+                    "base_threshold": {"name": "Manual", "values": {"threshold": BORDER // 2}},
+                },
+            },
+            noise_filtering={"name": "None", "values": {}},
+            side_connection=False,
+            flow_type={"name": flow, "values": WatershedSelection[flow].get_default_values()},
+        )
+
+    def _run(self):
+        algorithm = LowerThresholdFlowAlgorithm()
+        algorithm.set_image(self.image)
+        algorithm.set_parameters(self.parameters)
+        return algorithm.calculation_run(_empty)
+
+    def time_calculation_run(self, *_):
+        self._run()
+
+    def peakmem_calculation_run(self, *_):
+        self._run()
@@ -0,0 +1,94 @@
+"""
+Generators of synthetic data for benchmarks.
+
+Images contain ``components`` boxes placed on regular grid. Each box has darker border
+and brighter core, so both single and two level threshold algorithms find one object per box.
+"""
+
+import math
+
+import numpy as np
+
+from PartSegImage import Image
+
+BACKGROUND = 10
+BORDER = 100
+CORE = 200
+
+IMAGE_KINDS = ("2d", "3d", "time")
+
+
+def image_shape(kind: str, size: int) -> tuple[int, int, int, int]:
+    """
+    Shape (time, z, y, x) of image of given kind.
+
+    :param kind: one of :py:data:`IMAGE_KINDS`
+    :param size: size of y and x axes. Number of layers is ``size // 4``. Time data has 4 time points.
+    """
+    if kind == "2d":
+        return 1, 1, size, size
+    if kind == "3d":
+        return 1, max(size // 4, 1), size, size
+    if kind == "time":
+        return 4, max(size // 4, 1), size, size
+    raise ValueError(f"Unknown image kind {kind}")
+
+
+def _grid_boxes(shape: tuple[int, ...], components: int) -> list[tuple[slice, ...]]:
+    """Slices of ``components`` separated boxes placed on regular grid"""
+    spatial = [i for i, size in enumerate(shape) if size > 1]
+    per_axis = math.ceil(components ** (1 / len(spatial)))
+    cell = [shape[i] // per_axis if i in spatial else 1 for i in range(len(shape))]
+    if any(cell[i] < 4 for i in spatial):
+        raise ValueError(f"Too many components ({components}) for shape {shape}")
+    boxes = []
+    for index in np.ndindex(*[per_axis if i in spatial else 1 for i in range(len(shape))]):
+        if len(boxes) == components:
+            break
+        boxes.append(
+            tuple(
+                slice(pos * cell[i] + 1, (pos + 1) * cell[i] - 1) if i in spatial else slice(None)
+                for i, pos in enumerate(index)
+            )
+        )
+    return boxes
+
+
+def _core(box: tuple[slice, ...]) -> tuple[slice, ...]:
+    return tuple(
+        slice(sl.start + (sl.stop - sl.start) // 4, sl.stop - (sl.stop - sl.start) // 4) if sl.start is not None else sl
+        for sl in box
+    )
+
+
+def generate_roi(kind: str, size: int, components: int) -> np.ndarray:
+    """
+    Generate ROI in shape (time, z, y, x) with components labeled from 1.
+    """
+    shape = image_shape(kind, size)
+    roi = np.zeros(shape, dtype=np.uint16 if components > 255 else np.uint8)
+    for i, box in enumerate(_grid_boxes(shape[1:], components), start=1):
+        roi[(slice(None), *box)] = i
+    return roi
+
+
+def generate_image(kind: str, size: int, components: int, channels: int = 2, seed: int = 0) -> Image:
+    """
+    Generate image with noisy background and ``components`` objects.
+
+    :param kind: one of :py:data:`IMAGE_KINDS`
+    :param size: size of y and x axes
+    :param components: number of objects
+    :param channels: number of channels. Next channels have scaled intensity.
+    :param seed: seed of random generator used to create noise
+    """
+    shape = image_shape(kind, size)
+    rng = np.random.default_rng(seed)
+    base = np.full(shape, BACKGROUND, dtype=np.uint16)
+    for box in _grid_boxes(shape[1:], components):
+        base[(slice(None), *box)] = BORDER
+        base[(slice(None), *_core(box))] = CORE
+    data = np.stack(
+        [base * (i + 1) + rng.integers(0, 5, size=shape, dtype=np.uint16) for i in range(channels)], axis=-1
+    )
+    return Image(data, spacing=(10**-6, 10**-7, 10**-7), axes_order="TZYXC", file_path="")
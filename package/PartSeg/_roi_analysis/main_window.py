@@ -503,6 +503,7 @@ class MaskDialog(MaskDialogBase):
             create_history_element_from_project(
                 project_info,
                 mask_property,
+                previous=self.settings.history_current_element() if self.settings.history_size() else None,
             )
         )
         if self.settings.history_redo_size():
@@ -1,4 +1,5 @@
 import locale
+import multiprocessing
 import os
 from enum import Enum
 
@@ -13,6 +14,7 @@ from qtpy.QtWidgets import (
     QLabel,
     QMessageBox,
     QPushButton,
+    QSpinBox,
     QTableWidget,
     QTableWidgetItem,
     QVBoxLayout,
@@ -164,6 +166,15 @@ class MeasurementWidgetBase(QWidget):
         )
         self.units_choose = QEnumComboBox(enum_class=Units)
         self.units_choose.setCurrentEnum(self.settings.get("units_value", Units.nm))
+        self.workers = QSpinBox(self)
+        self.workers.setRange(1, multiprocessing.cpu_count())
+        self.workers.setValue(1)
+        self.workers.setToolTip("Number of threads used to calculate measurements")
+        self.disk_cache = QCheckBox("Disk cache", self)
+        self.disk_cache.setToolTip("Store measurement results on disk and reuse them in next calculations")
+        self.disk_cache.setChecked(self.settings.get("measurement_cache.enabled", False))
+        self.disk_cache.stateChanged.connect(self._disk_cache_changed)
+        self.cache_info = QLabel(self)
         self.settings.measurement_profiles_changed.connect(self.update_measurement_list)
         self.info_field = QTableWidget(self)
         self.info_field.setColumnCount(3)
@@ -184,11 +195,15 @@ class MeasurementWidgetBase(QWidget):
         self.butt_layout.addWidget(self.file_names, 1)
         self.butt_layout.addWidget(self.copy_button, 2)
         self.butt_layout2 = QHBoxLayout()
+        self.butt_layout2.addWidget(self.disk_cache)
+        self.butt_layout2.addWidget(self.cache_info, 1)
         self.butt_layout3 = QHBoxLayout()
         self.butt_layout3.addWidget(QLabel("Units:"))
         self.butt_layout3.addWidget(self.units_choose)
         self.butt_layout3.addWidget(QLabel("Measurement set:"))
         self.butt_layout3.addWidget(self.measurement_type, 2)
+        self.butt_layout3.addWidget(QLabel("Threads:"))
+        self.butt_layout3.addWidget(self.workers)
         v_butt_layout.addLayout(self.up_butt_layout)
         v_butt_layout.addLayout(self.butt_layout)
         v_butt_layout.addLayout(self.butt_layout2)
@@ -200,6 +215,19 @@ class MeasurementWidgetBase(QWidget):
         self.clip = QApplication.clipboard()
         self.previous_profile = None
         self.update_measurement_list()
+        self.update_cache_info()
+
+    def _disk_cache_changed(self):
+        self.settings.set("measurement_cache.enabled", self.disk_cache.isChecked())
+        self.update_cache_info()
+
+    def update_cache_info(self):
+        cache = self.settings.measurement_cache
+        self.cache_info.setText("" if cache is None else f"Cache {cache.statistics()}")
+
+    def calculation_kwargs(self) -> dict:
+        """Additional arguments for :py:meth:`MeasurementProfile.calculate`"""
+        return {"workers": self.workers.value(), "disk_cache": self.settings.measurement_cache}
 
     def check_if_measurement_can_be_calculated(self, name):  # pragma: no cover
         raise NotImplementedError
@@ -377,9 +405,11 @@ class MeasurementWidget(MeasurementWidgetBase):
         dial = ExecuteFunctionDialog(
             compute_class.calculate,
             [self.settings.image, self.channels_chose.currentIndex(), self.settings.roi_info, units],
+            self.calculation_kwargs(),
             text="Measurement calculation",
         )  # , exception_hook=exception_hook)
         dial.exec_()
+        self.update_cache_info()
         stat: MeasurementResult = dial.get_result()
         if stat is None:
             return
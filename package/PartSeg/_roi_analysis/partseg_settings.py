@@ -1,3 +1,4 @@
+import os
 import typing
 import warnings
 from copy import deepcopy
@@ -10,6 +11,7 @@ from PartSegCore.analysis.analysis_utils import SegmentationPipeline
 from PartSegCore.analysis.calculation_plan import CalculationPlan
 from PartSegCore.analysis.io_utils import MaskInfo, ProjectTuple
 from PartSegCore.analysis.load_functions import load_metadata
+from PartSegCore.analysis.measurement_cache import DEFAULT_CACHE_SIZE, DiskMeasurementCache
 from PartSegCore.analysis.measurement_calculation import MeasurementProfile
 from PartSegCore.io_utils import PointsInfo
 from PartSegCore.json_hooks import PartSegEncoder
@@ -51,6 +53,22 @@ class PartSettings(BaseSettings):
         self._segmentation_pipelines_dict.connect("", self.roi_pipelines_changed.emit, maxargs=0)
         self._measurement_profiles_dict.connect("", self.measurement_profiles_changed.emit, maxargs=0)
         self._batch_plans_dict.connect("", self.batch_plans_changed.emit, maxargs=0)
+        self._measurement_cache: typing.Optional[DiskMeasurementCache] = None
+
+    @property
+    def measurement_cache(self) -> typing.Optional[DiskMeasurementCache]:
+        """
+        Persistent cache of measurement results stored in settings directory.
+        ``None`` if it is disabled (``measurement_cache.enabled`` key).
+        """
+        if not self.get("measurement_cache.enabled", False):
+            return None
+        if self._measurement_cache is None:
+            self._measurement_cache = DiskMeasurementCache(
+                os.path.join(self.json_folder_path, "measurement_cache"),
+                self.get("measurement_cache.max_size", DEFAULT_CACHE_SIZE),
+            )
+        return self._measurement_cache
 
     def fix_history(self, algorithm_name, algorithm_values):
         """
@@ -1,5 +1,6 @@
 import json
 import logging
+import multiprocessing
 import os
 import typing
 from contextlib import contextmanager
@@ -25,6 +26,7 @@ from qtpy.QtWidgets import (
     QMenu,
     QMessageBox,
     QPushButton,
+    QSpinBox,
     QSplitter,
     QTabWidget,
     QTextEdit,
@@ -523,6 +525,10 @@ class SelectMeasurementOp(ProtectedGroupBox):
         )
         self.units_choose = QEnumComboBox(enum_class=Units)
         self.units_choose.setCurrentEnum(self.settings.get("units_value", Units.nm))
+        self.workers = QSpinBox(self)
+        self.workers.setRange(1, multiprocessing.cpu_count())
+        self.workers.setValue(1)
+        self.workers.setToolTip("Number of threads used to calculate measurements in each process")
         self.add_measurement_btn = QPushButton("Add measurement calculation")
         self.add_measurement_btn.clicked.connect(self._measurement_add)
         self.measurements_list.currentTextChanged.connect(self._measurement_selected)
@@ -538,7 +544,9 @@ class SelectMeasurementOp(ProtectedGroupBox):
         layout.addWidget(self.choose_channel_for_measurements, 2, 1)
         layout.addWidget(QLabel("Units:"), 3, 0)
         layout.addWidget(self.units_choose, 3, 1)
-        layout.addWidget(self.add_measurement_btn, 4, 0, 1, 2)
+        layout.addWidget(QLabel("Threads:"), 4, 0)
+        layout.addWidget(self.workers, 4, 1)
+        layout.addWidget(self.add_measurement_btn, 5, 0, 1, 2)
         self.setLayout(layout)
 
         self.add_measurement_btn.setDisabled(True)
@@ -578,6 +586,7 @@ class SelectMeasurementOp(ProtectedGroupBox):
                 measurement_profile=measurement_copy,
                 name_prefix=prefix,
                 units=self.units_choose.currentEnum(),
+                workers=self.workers.value(),
             )
         )
 
@@ -77,6 +77,7 @@ class MaskDialog(MaskDialogBase):
             create_history_element_from_segmentation_tuple(
                 project_info,
                 mask_property,
+                previous=self.settings.history_current_element() if self.settings.history_size() else None,
             )
         )
         self.settings.mask = mask
@@ -85,9 +86,7 @@ class MaskDialog(MaskDialogBase):
 
     def prev_mask(self):
         history: HistoryElement = self.settings.history_pop()
-        history.arrays.seek(0)
-        seg = np.load(history.arrays)
-        history.arrays.seek(0)
+        seg = history.get_arrays()
         self.settings._set_roi_info(  # pylint: disable=protected-access
             ROIInfo(seg["segmentation"]),
             False,
@@ -72,10 +72,12 @@ class NapariMeasurementWidget(MeasurementWidgetBase):
         dial = ExecuteFunctionDialog(
             compute_class.calculate,
             [image, self.channels_chose.value.name, roi_info, units],
+            self.calculation_kwargs(),
             text="Measurement calculation",
             parent=self,
         )  # , exception_hook=exception_hook)
         dial.exec_()
+        self.update_cache_info()
         stat: MeasurementResult = dial.get_result()
 
         df = stat.to_dataframe(True)
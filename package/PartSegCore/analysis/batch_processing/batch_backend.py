@@ -24,13 +24,16 @@ Calculation hierarchy:
 from __future__ import annotations
 
 import contextlib
+import copy
 import json
 import logging
 import math
 import os
+import shutil
 import threading
 import traceback
-from collections import OrderedDict
+from collections import OrderedDict, deque
+from concurrent.futures import Future, ThreadPoolExecutor, wait
 from enum import Enum
 from os import path
 from queue import Queue
@@ -45,6 +48,12 @@ import tifffile
 from PartSegCore.algorithm_describe_base import ROIExtractionProfile
 from PartSegCore.analysis.algorithm_description import AnalysisAlgorithmSelection
 from PartSegCore.analysis.batch_processing.parallel_backend import BatchManager, SubprocessOrder
+from PartSegCore.analysis.batch_processing.scheduler import (
+    CostCalibration,
+    CostReport,
+    format_cost_report,
+    order_by_cost,
+)
 from PartSegCore.analysis.calculation_plan import (
     BaseCalculation,
     Calculation,
@@ -66,10 +75,10 @@ from PartSegCore.analysis.io_utils import ProjectTuple
 from PartSegCore.analysis.load_functions import LoadImageForBatch, LoadMaskSegmentation, LoadProject
 from PartSegCore.analysis.measurement_base import has_mask_components, has_roi_components
 from PartSegCore.analysis.save_functions import save_dict
+from PartSegCore.image_operations import set_default_workers
 from PartSegCore.json_hooks import PartSegEncoder
 from PartSegCore.mask_create import calculate_mask
 from PartSegCore.project_info import AdditionalLayerDescription, HistoryElement
-from PartSegCore.roi_info import ROIInfo
 from PartSegCore.segmentation.algorithm_base import ROIExtractionAlgorithm, report_empty_fun
 from PartSegCore.utils import iterate_names
 from PartSegImage import Image, TiffImageReader
@@ -80,6 +89,7 @@ if TYPE_CHECKING:
     import xlsxwriter
 
     from PartSegCore.analysis.measurement_calculation import MeasurementResult
+    from PartSegCore.roi_info import ROIInfo
     from PartSegCore.segmentation import RestartableAlgorithm
 
 # https://support.microsoft.com/en-us/office/excel-specifications-and-limits-1672b34d-7043-467e-8e27-269d656771c3#ID0EDBD=Newer_versions
@@ -129,7 +139,22 @@ def prepare_error_data(exception: Exception) -> ErrorInfo:
         return exception, traceback.extract_tb(exception.__traceback__)
 
 
-def do_calculation(file_info: tuple[int, str], calculation: BaseCalculation) -> WrappedResult:
+def prefetch_data(file_info: tuple[int, str], calculation: BaseCalculation) -> ProjectTuple | list[ProjectTuple]:
+    """
+    Load data of file for :py:func:`do_calculation`.
+    Called by :py:class:`.BatchWorker` in background thread to read next file while current one is calculated.
+
+    :param file_info: index and path to file which should be processed
+    :param calculation: calculation description
+    """
+    return CalculationProcess.load_data(
+        calculation.calculation_plan.execution_tree.operation, FileCalculation(file_info[1], calculation)
+    )
+
+
+def do_calculation(
+    file_info: tuple[int, str], calculation: BaseCalculation, prefetched: Future | None = None
+) -> WrappedResult:
     """
     Main function which will be used for run calculation.
     It create :py:class:`.CalculationProcess` and call it method
@@ -137,17 +162,23 @@ def do_calculation(file_info: tuple[int, str], calculation: BaseCalculation) ->
 
     :param file_info: index and path to file which should be processed
     :param calculation: calculation description
+    :param prefetched: future with data loaded by :py:func:`prefetch_data`
     """
     with contextlib.suppress(AttributeError):
         SimpleITK.ProcessObject_SetGlobalDefaultNumberOfThreads(1)
+    set_default_workers(1)
     calc = CalculationProcess()
     index, file_path = file_info
     try:
-        return index, calc.do_calculation(FileCalculation(file_path, calculation))
+        projects = prefetched.result() if prefetched is not None else None
+        return index, calc.do_calculation(FileCalculation(file_path, calculation), projects)
     except Exception as e:  # pylint: disable=broad-except
         return index, [prepare_error_data(e)]
 
 
+do_calculation.prefetch = prefetch_data
+
+
 class CalculationProcess:
     """
     Main class to calculate PartSeg calculation plan.
@@ -159,7 +190,7 @@ class CalculationProcess:
         self.reused_mask = set()
         self.mask_dict = {}
         self.calculation = None
-        self.measurement: list[MeasurementResult] = []
+        self.measurement: list[MeasurementResult | list[MeasurementResult]] = []
         self.image: Image | None = None
         self.roi_info: ROIInfo | None = None
         self.additional_layers: dict[str, AdditionalLayerDescription] = {}
@@ -167,8 +198,20 @@ class CalculationProcess:
         self.history: list[HistoryElement] = []
         self.algorithm_parameters: dict = {}
         self.results: CalculationResultList = []
+        self.save_executor: ThreadPoolExecutor | None = None
+        self.save_futures: list[Future] = []
+
+    def wait_for_save(self):
+        """Wait until all save operations are finished. Raise first exception raised during save."""
+        futures, self.save_futures = self.save_futures, []
+        wait(futures)
+        for future in futures:
+            future.result()
 
     def _reset_image_cache(self):
+        # save errors are reported only if calculation of file finished without error
+        with contextlib.suppress(Exception):
+            self.wait_for_save()
         self.image = None
         self.roi_info = None
         self.additional_layers = {}
@@ -191,11 +234,16 @@ class CalculationProcess:
                 raise e
             raise ValueError(f"File {calculation.file_path} do not match to {operation}") from e
 
-    def do_calculation(self, calculation: FileCalculation) -> CalculationResultList:
+    def do_calculation(
+        self, calculation: FileCalculation, projects: ProjectTuple | list[ProjectTuple] | None = None
+    ) -> CalculationResultList:
         """
-        Main function for calculation process
+        Main function for calculation process.
+        Files are saved in separate thread, in parallel to rest of calculation.
 
         :param calculation: calculation to do.
+        :param projects: already loaded data of file (see :py:func:`prefetch_data`). If not provided, then
+            data are loaded with :py:meth:`load_data`
         :return:
         """
         self.calculation = calculation
@@ -204,10 +252,21 @@ class CalculationProcess:
         self.measurement = []
         self.results = []
         operation = calculation.calculation_plan.execution_tree.operation
-        projects = self.load_data(operation, calculation)
+        if projects is None:
+            projects = self.load_data(operation, calculation)
 
         if isinstance(projects, ProjectTuple):
             projects = [projects]
+        self.save_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="batch_save")
+        try:
+            self._calculate_projects(projects, calculation)
+        finally:
+            self.save_executor.shutdown()
+            self.save_executor = None
+        return self.results
+
+    def _calculate_projects(self, projects: list[ProjectTuple], calculation: FileCalculation):
+        operation = calculation.calculation_plan.execution_tree.operation
         for project in projects:
             try:
                 self.image = project.image
@@ -224,15 +283,36 @@ class CalculationProcess:
                     self.algorithm_parameters = project.algorithm_parameters
 
                 self.iterate_over(calculation.calculation_plan.execution_tree)
-                for el in self.measurement:
-                    el.set_filename(path.relpath(project.image.file_path, calculation.base_prefix))
-                self.results.append(
-                    ResponseData(path.relpath(project.image.file_path, calculation.base_prefix), self.measurement)
+                self.wait_for_save()
+                name = path.relpath(project.image.file_path, calculation.base_prefix)
+                self.results.extend(
+                    ResponseData(row_name, measurement) for row_name, measurement in self._measurement_rows(name)
                 )
             except Exception as e:  # pylint: disable=broad-except
                 self.results.append(prepare_error_data(e))
             self._reset_image_cache()
-        return self.results
+
+    def _measurement_rows(self, name: str) -> list[tuple[str, list[MeasurementResult]]]:
+        """
+        Split measurements to rows of output file.
+        If any measurement is calculated for each time point (see :py:meth:`step_measurement`),
+        then there is one row for each time point and measurements calculated once are repeated in each of them.
+
+        :param name: name of processed file
+        :return: list of row name and measurements
+        """
+        times = max((len(x) for x in self.measurement if isinstance(x, list)), default=0)
+        if times == 0:
+            rows = [(name, self.measurement)]
+        else:
+            rows = [
+                (f"{name} [T={time}]", [x[time] if isinstance(x, list) else copy.deepcopy(x) for x in self.measurement])
+                for time in range(times)
+            ]
+        for row_name, measurement in rows:
+            for el in measurement:
+                el.set_filename(row_name)
+        return rows
 
     def iterate_over(self, node: CalculationTree | list[CalculationTree]):
         """
@@ -298,7 +378,7 @@ class CalculationProcess:
             segmentation_algorithm.set_parameters(**operation.values)
         result = segmentation_algorithm.calculation_run(report_empty_fun)
         backup_data = self.roi_info, self.additional_layers, self.algorithm_parameters
-        self.roi_info = ROIInfo(result.roi, result.roi_annotation, result.alternative_representation)
+        self.roi_info = result.roi_info
         self.additional_layers = result.additional_layers
         self.algorithm_parameters = {"algorithm_name": operation.algorithm, "values": operation.values}
         self.iterate_over(children)
@@ -339,6 +419,8 @@ class CalculationProcess:
     def step_save(self, operation: Save):
         """
         Perform save operation selected in plan.
+        If :py:attr:`save_executor` is set, then saving is done in its thread
+        and errors are reported by :py:meth:`wait_for_save`.
 
         :param Save operation: save definition
         """
@@ -349,13 +431,18 @@ class CalculationProcess:
             roi_info=self.roi_info,
             additional_layers=self.additional_layers,
             mask=self.mask,
-            history=self.history,
+            history=list(self.history),
             algorithm_parameters=self.algorithm_parameters,
         )
         save_path = get_save_path(operation, self.calculation)
         save_dir = os.path.dirname(save_path)
         os.makedirs(save_dir, exist_ok=True)
-        save_class.save(save_path, project_tuple, operation.values)
+        if self.save_executor is None:
+            save_class.save(save_path, project_tuple, operation.values)
+        else:
+            self.save_futures.append(
+                self.save_executor.submit(save_class.save, save_path, project_tuple, operation.values)
+            )
 
     def step_mask_create(self, operation: MaskCreate, children: list[CalculationTree]):
         """
@@ -378,6 +465,7 @@ class CalculationProcess:
             self.mask,
             self.algorithm_parameters,
             operation.mask_property,
+            previous=self.history[-1] if self.history else None,
         )
         backup = self.mask, self.history
         self.mask = mask
@@ -385,9 +473,23 @@ class CalculationProcess:
         self.iterate_over(children)
         self.mask, self.history = backup
 
+    def _roi_times(self) -> int:
+        """Number of time points of image covered by current ROI"""
+        roi = None if self.roi_info is None else self.roi_info.roi
+        if (
+            roi is None
+            or not self.image.is_time
+            or roi.ndim != len(self.image.array_axis_order)
+            or roi.shape[self.image.time_pos] != self.image.times
+        ):
+            return 1
+        return self.image.times
+
     def step_measurement(self, operation: MeasurementCalculate):
         """
         Calculate measurement defined in current operation.
+        If ROI covers many time points of image, then each time point is measured
+        and time points are calculated in parallel (``operation.workers`` threads).
 
         :param MeasurementCalculate operation: definition of measurement to calculate
         """
@@ -406,12 +508,18 @@ class CalculationProcess:
         # FIXME use additional information
         old_mask = self.image.mask
         self.image.set_mask(self.mask)
-        measurement = operation.measurement_profile.calculate(
-            self.image,
-            channel,
-            self.roi_info,
-            operation.units,
-        )
+        if self._roi_times() > 1:
+            measurement = operation.measurement_profile.calculate_time_series(
+                self.image, channel, self.roi_info, operation.units, workers=operation.workers
+            )
+        else:
+            measurement = operation.measurement_profile.calculate(
+                self.image,
+                channel,
+                self.roi_info,
+                operation.units,
+                workers=operation.workers,
+            )
         self.measurement.append(measurement)
         self.image.set_mask(old_mask)
 
@@ -456,6 +564,8 @@ class CalculationManager:
     """
     This class manage batch processing in PartSeg.
 
+    Files of added calculation are ordered by cost (which needs reading their headers) in background thread.
+    Ordered calculations are passed to workers in :py:meth:`get_results`, in order of adding.
     """
 
     def __init__(self):
@@ -468,6 +578,9 @@ class CalculationManager:
         self.counter_dict = OrderedDict()
         self.errors_list = []
         self.writer = DataWriter()
+        self.cost_calibration = CostCalibration()
+        self._scheduler = ThreadPoolExecutor(max_workers=1, thread_name_prefix="batch_scheduler")
+        self._scheduled: deque[tuple[Calculation, Future]] = deque()
 
     def is_valid_sheet_name(self, excel_path: str, sheet_name: str) -> bool:
         """
@@ -490,6 +603,9 @@ class CalculationManager:
 
     def add_calculation(self, calculation: Calculation):
         """
+        Files are queued from the most expensive one (see :py:func:`.order_by_cost`).
+        Ordering is done in background thread, so this function does not wait on reading of file headers.
+
         :param calculation: Calculation
         """
         self.calculation_dict[calculation.uuid] = calculation
@@ -497,19 +613,47 @@ class CalculationManager:
         size = len(calculation.file_list)
         self.calculation_sizes.append(size)
         self.calculation_size += size
-        self.batch_manager.add_work(
-            list(enumerate(calculation.file_list)), calculation.get_base_calculation(), do_calculation
-        )
+        self._scheduled.append((calculation, self._scheduler.submit(order_by_cost, calculation.file_list)))
         self.writer.add_data_part(calculation)
+        self._start_ordered()
+
+    def _start_ordered(self):
+        """Pass calculations, for which files are already ordered, to workers"""
+        while self._scheduled and self._scheduled[0][1].done():
+            calculation, future = self._scheduled.popleft()
+            try:
+                ordered_files = future.result()
+            except Exception:  # pylint: disable=broad-except
+                logging.exception("Cannot order files by cost")
+                ordered_files = [(ind, file_path, 0.0) for ind, file_path in enumerate(calculation.file_list)]
+            for ind, file_path, cost in ordered_files:
+                self.cost_calibration.add_prediction((calculation.uuid, ind), file_path, cost)
+            self.batch_manager.add_work(
+                [(ind, file_path) for ind, file_path, _ in ordered_files],
+                calculation.get_base_calculation(),
+                do_calculation,
+            )
+
+    def get_cost_report(self, calculation: Calculation | None = None) -> list[CostReport]:
+        """
+        Predicted and measured time of already processed files
+
+        :param calculation: if provided, report only files of this calculation
+        """
+        if calculation is None:
+            return self.cost_calibration.report()
+        return self.cost_calibration.report([(calculation.uuid, ind) for ind in range(len(calculation.file_list))])
 
     @property
     def has_work(self) -> bool:
         """
         Is still some calculation or data writing in progress
         """
-        return self.batch_manager.has_work or not self.writer.writing_finished()
+        return bool(self._scheduled) or self.batch_manager.has_work or not self.writer.writing_finished()
 
     def kill_jobs(self):
+        while self._scheduled:
+            self._scheduled.popleft()[1].cancel()
         self.batch_manager.kill_jobs()
 
     def set_number_of_workers(self, val: int):
@@ -528,14 +672,16 @@ class CalculationManager:
         :return: information about calculation status
         :rtype: BatchResultDescription
         """
-        responses: list[tuple[uuid.UUID, WrappedResult]] = self.batch_manager.get_result()
+        self._start_ordered()
+        responses: list[tuple[uuid.UUID, WrappedResult, float]] = self.batch_manager.get_result(with_time=True)
         new_errors: list[tuple[str, ErrorInfo]] = []
-        for uuid_id, (ind, result_list) in responses:
+        for uuid_id, (ind, result_list), execution_time in responses:
             if uuid_id == "-1":  # pragma: no cover
                 self.errors_list.append((f"Unknown file {ind}", result_list))
                 new_errors.append((f"Unknown file {ind}", result_list))
                 continue
 
+            self.cost_calibration.add_measurement((uuid_id, ind), execution_time)
             self.calculation_done += 1
             self.counter_dict[uuid_id] += 1
             calculation = self.calculation_dict[uuid_id]
@@ -552,6 +698,12 @@ class CalculationManager:
                 if self.counter_dict[uuid_id] == len(calculation.file_list):
                     errors = self.writer.calculation_finished(calculation)
                     new_errors.extend(("", err) for err in errors)
+            if self.counter_dict[uuid_id] == len(calculation.file_list):
+                logging.info(
+                    "Batch calculation %s finished\n%s",
+                    calculation.measurement_file_path,
+                    format_cost_report(self.get_cost_report(calculation)),
+                )
         return BatchResultDescription(new_errors, self.calculation_done, self.counter_dict.copy())
 
 
@@ -564,6 +716,10 @@ class FileType(Enum):
 class SheetData:
     """
     Store single sheet information
+
+    Rows are collected in :py:attr:`row_list` and moved to already written part
+    by :py:meth:`get_new_data` or :py:meth:`get_data_to_write`.
+    Already written part is stored as list of chunks to avoid quadratic cost of repeated concatenation.
     """
 
     def __init__(self, name: str, columns: list[tuple[str, str]], raw=False):
@@ -574,8 +730,17 @@ class SheetData:
             self.columns = pd.MultiIndex.from_tuples(columns)
         else:
             self.columns = pd.MultiIndex.from_tuples([("name", "units"), *columns])
-        self.data_frame = pd.DataFrame([], columns=self.columns)
         self.row_list: list[Any] = []
+        self._chunks: list[pd.DataFrame] = []
+
+    @property
+    def data_frame(self) -> pd.DataFrame:
+        """All data already moved out of :py:attr:`row_list`"""
+        if not self._chunks:
+            return pd.DataFrame([], columns=self.columns)
+        if len(self._chunks) > 1:
+            self._chunks = [pd.concat(self._chunks, axis=0).reset_index(drop=True)]
+        return self._chunks[0]
 
     def add_data(self, data, ind):
         if len(data) != len(self.columns):
@@ -593,6 +758,21 @@ class SheetData:
         for x in data:
             self.add_data(x, ind)
 
+    def get_new_data(self) -> tuple[str, pd.DataFrame]:
+        """
+        Get rows added since last call of this method or :py:meth:`get_data_to_write`
+
+        :return: sheet name and new rows
+        :rtype: Tuple[str, pd.DataFrame]
+        """
+        # rows of the same file (like time points) keep order in which they were added
+        sorted_row = [x[1] for x in sorted(self.row_list, key=lambda x: x[0])]
+        df = pd.DataFrame(sorted_row, columns=self.columns)
+        if sorted_row:
+            self._chunks.append(df)
+        self.row_list = []
+        return self.name, df
+
     def get_data_to_write(self) -> tuple[str, pd.DataFrame]:
         """
         Get data for write
@@ -600,14 +780,7 @@ class SheetData:
         :return: sheet name and data to write
         :rtype: Tuple[str, pd.DataFrame]
         """
-        sorted_row = [x[1] for x in sorted(self.row_list)]
-        df = pd.DataFrame(sorted_row, columns=self.columns)
-        if self.data_frame.empty:
-            self.data_frame = df.reset_index(drop=True)
-        else:
-            df2 = pd.concat((self.data_frame, df), axis=0)
-            self.data_frame = df2.reset_index(drop=True)
-        self.row_list = []
+        self.get_new_data()
         return self.name, self.data_frame
 
     def __repr__(self):
@@ -621,12 +794,19 @@ class FileData:
     This class run separate thread for writing purpose.
     This need additional synchronisation. but not freeze
 
+    Every ``write_threshold`` rows only new rows are appended to csv files in :py:attr:`spill_dir`
+    (one file per sheet). Excel file is created once per finished calculation from all collected data.
+    After successful write of Excel file the spill directory is removed.
+    For text output, new rows are appended directly to the result files.
+
     :param BaseCalculation calculation: calculation information
     :param int write_threshold: every how many lines of data are written to disk
     :cvar component_str: separator for per component sheet information
+    :cvar spill_suffix: suffix of directory with not yet written to Excel data
     """
 
     component_str = "_comp_"  #: separator for per component sheet information
+    spill_suffix = ".partial"  #: suffix of directory with not yet written to Excel data
 
     def __init__(self, calculation: BaseCalculation, write_threshold: int = 40):
         """
@@ -651,6 +831,10 @@ class FileData:
         self.sheet_set = {"Errors"}
         self.new_count = 0
         self.write_threshold = write_threshold
+        self.spill_dir = f"{self.file_path}{self.spill_suffix}"
+        self._spilled_rows: dict[str, int] = {}
+        self._spill_names: dict[str, str] = {}
+        self._spilled_errors = 0
         self.wrote_queue = Queue()
         self.error_queue = Queue()
         self.write_thread = threading.Thread(target=self.wrote_data_to_file)
@@ -772,16 +956,71 @@ class FileData:
         self.new_count += 1
         self._error_info.append((file_path, str(error_description)))
 
-    def dump_data(self):
+    def dump_data(self, full: bool = False):
         """
         Fire writing data to disc
+
+        :param bool full: if write Excel file with all data collected so far.
+            Otherwise only new rows are appended to spill files.
         """
-        data = []
+        new_data = []
         for main_sheet, component_sheets, _ in self.sheet_dict.values():
-            data.append(main_sheet.get_data_to_write())
-            data.extend(sheet.get_data_to_write() for sheet in component_sheets if sheet is not None)
+            new_data.append(main_sheet.get_new_data())
+            new_data.extend(sheet.get_new_data() for sheet in component_sheets if sheet is not None)
+        new_errors = self._error_info[self._spilled_errors :]
+        self._spilled_errors = len(self._error_info)
+        excel_data = None
+        if full and self.file_type != FileType.text_file:
+            data = []
+            for main_sheet, component_sheets, _ in self.sheet_dict.values():
+                data.append(main_sheet.get_data_to_write())
+                data.extend(sheet.get_data_to_write() for sheet in component_sheets if sheet is not None)
+            excel_data = (data, list(self.calculation_info.values()), self._error_info[:])
+
+        self.wrote_queue.put((new_data, new_errors, excel_data))
+
+    def _append_csv(self, file_path: str, data_frame: pd.DataFrame):
+        offset = self._spilled_rows.get(file_path, 0)
+        if offset and data_frame.empty:
+            return
+        data_frame = data_frame.set_axis(range(offset, offset + len(data_frame)), axis=0)
+        data_frame.to_csv(file_path, mode="a" if offset else "w", header=not offset)
+        self._spilled_rows[file_path] = offset + len(data_frame)
+
+    def spill_data(self, sheets: list[tuple[str, pd.DataFrame]], errors: list[tuple[str, str]]):
+        """
+        Append new rows to csv files. For text output these are result files,
+        otherwise files in :py:attr:`spill_dir`.
+
+        :param sheets: list of pairs sheet name and new rows
+        :param errors: list of new errors
+        """
+        if self.file_type == FileType.text_file:
+            base_path, ext = path.splitext(self.file_path)
+            for sheet_name, data_frame in sheets:
+                self._append_csv(f"{base_path}_{sheet_name}{ext}", data_frame)
+            return
+        if all(data_frame.empty for _, data_frame in sheets) and not errors:
+            return
+        os.makedirs(self.spill_dir, exist_ok=True)
+        for sheet_name, data_frame in sheets:
+            if data_frame.empty:
+                continue
+            if sheet_name not in self._spill_names:
+                safe_name = "".join(x if x.isalnum() or x in " -_" else "_" for x in sheet_name)
+                self._spill_names[sheet_name] = f"{len(self._spill_names)}_{safe_name}.csv"
+            self._append_csv(path.join(self.spill_dir, self._spill_names[sheet_name]), data_frame)
+        if errors:
+            self._append_csv(
+                path.join(self.spill_dir, "Errors.csv"),
+                pd.DataFrame(errors, columns=["File path", "error description"]),
+            )
 
-        self.wrote_queue.put((data, list(self.calculation_info.values()), self._error_info[:]))
+    def remove_spill_data(self):
+        """Remove spill directory after its content is stored in Excel file"""
+        shutil.rmtree(self.spill_dir, ignore_errors=True)
+        self._spilled_rows = {}
+        self._spill_names = {}
 
     def wrote_data_to_file(self):
         """
@@ -793,24 +1032,24 @@ class FileData:
             if data == "finish":
                 break
             self.writing = True
+            new_data, new_errors, excel_data = data
             try:
-                if self.file_type == FileType.text_file:
-                    base_path, ext = path.splitext(self.file_path)
-                    for sheet_name, data_frame in data[0]:
-                        data_frame.to_csv(f"{base_path}_{sheet_name}{ext}")
+                self.spill_data(new_data, new_errors)
+                if excel_data is None:
                     continue
                 file_path = self.file_path
                 i = 0
                 while i < 100:
                     i += 1
                     try:
-                        self.write_to_excel(file_path, data)
+                        self.write_to_excel(file_path, excel_data)
                         break
                     except OSError:
                         base, ext = path.splitext(self.file_path)
                         file_path = f"{base}({i}){ext}"
                 if i == 100:  # pragma: no cover
                     raise PermissionError(f"Fail to write result excel {self.file_path}")
+                self.remove_spill_data()
             except Exception as e:  # pragma: no cover   # pylint: disable=broad-except
                 logging.error("[batch_backend] %s", e)
                 self.error_queue.put(prepare_error_data(e))
@@ -966,5 +1205,5 @@ class DataWriter:
         """
         if calculation.measurement_file_path not in self.file_dict:
             raise ValueError("Unknown measurement file")
-        self.file_dict[calculation.measurement_file_path].dump_data()
+        self.file_dict[calculation.measurement_file_path].dump_data(full=True)
         return self.file_dict[calculation.measurement_file_path].get_errors()
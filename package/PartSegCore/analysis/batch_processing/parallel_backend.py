@@ -7,6 +7,22 @@ Main workflow is to add work with :py:meth:`BatchManager.add_work`
 and consume results (:py:meth:`BatchManager.get_result`) until
 :py:attr:`BatchManager.has_work` is evaluating to true
 
+Tasks and results are transferred using plain :py:class:`multiprocessing.Queue`.
+Results are pickled with :py:func:`encode_result` which moves big numpy arrays
+to :py:mod:`multiprocessing.shared_memory` blocks, so only small handles are sent through pipe.
+Blocks of results which will not be used (canceled work, killed manager)
+are released with :py:func:`release_result`.
+Only global parameters of work are stored in :py:class:`multiprocessing.Manager` dict.
+Workers fetch them once per work and later only check if work is not canceled.
+
+If function of work has ``prefetch`` attribute, then ``fun.prefetch(task_data, global_parameters)``
+is called in background thread of worker and future with its result is passed to function
+as ``prefetched`` keyword argument. If :py:data:`READ_AHEAD` is positive, worker takes next tasks
+from queue in advance and prefetch them while current task is calculated. Because prefetched data
+of each such task is kept in memory and task taken in advance cannot be started by other worker,
+it is done only when every worker has already started calculation
+and queue still holds more tasks than workers (see :py:class:`WorkersCounter`).
+
 .. graphviz::
 
    digraph foo {
@@ -15,17 +31,24 @@ and consume results (:py:meth:`BatchManager.get_result`) until
 
 """
 
+import io
 import logging
 import multiprocessing
 import os
+import pickle  # nosec
 import time
 import traceback
 import uuid
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
 from contextlib import suppress
 from enum import Enum
+from multiprocessing import resource_tracker, shared_memory
 from queue import Empty, Queue
 from threading import RLock, Timer
-from typing import Any, Callable
+from typing import Any, Callable, Optional
+
+import numpy as np
 
 __author__ = "Grzegorz Bokota"
 
@@ -42,6 +65,99 @@ class SubprocessOrder(Enum):
     cancel_job = 3
 
 
+SHARED_MEMORY_THRESHOLD = 2**20
+"""Minimal size in bytes of array which is transferred using shared memory"""
+# on Windows shared memory block is released when last handle is closed, so it cannot outlive producer
+USE_SHARED_MEMORY = os.name != "nt"
+READ_AHEAD = 0
+"""Number of tasks for which data is prefetched by worker while current task is calculated"""
+
+
+def _attach_shared_array(name: str, shape: tuple[int, ...], dtype: str) -> np.ndarray:
+    shm = shared_memory.SharedMemory(name=name)
+    try:
+        return np.ndarray(shape, dtype=dtype, buffer=shm.buf).copy()
+    finally:
+        shm.close()
+        shm.unlink()
+
+
+def _release_shared_array(name: str, _shape: tuple[int, ...], _dtype: str) -> None:
+    with suppress(FileNotFoundError):
+        shm = shared_memory.SharedMemory(name=name)
+        shm.close()
+        shm.unlink()
+
+
+class _SharedArrayPickler(pickle.Pickler):
+    def reducer_override(self, obj):
+        if (
+            not USE_SHARED_MEMORY
+            or not isinstance(obj, np.ndarray)
+            or obj.nbytes < SHARED_MEMORY_THRESHOLD
+            or obj.dtype.hasobject
+        ):
+            return NotImplemented
+        shm = shared_memory.SharedMemory(create=True, size=obj.nbytes)
+        try:
+            np.ndarray(obj.shape, dtype=obj.dtype, buffer=shm.buf)[...] = obj
+        finally:
+            shm.close()
+        # ownership is passed to process which decode data
+        resource_tracker.unregister(shm._name, "shared_memory")  # pylint: disable=protected-access
+        return _attach_shared_array, (shm.name, obj.shape, obj.dtype.str)
+
+
+def encode_result(data: Any) -> bytes:
+    """
+    Pickle data for transfer between processes.
+    Arrays bigger than :py:data:`SHARED_MEMORY_THRESHOLD` are copied to shared memory blocks
+    which are released by :py:func:`decode_result`.
+    """
+    buffer = io.BytesIO()
+    _SharedArrayPickler(buffer, protocol=pickle.HIGHEST_PROTOCOL).dump(data)
+    return buffer.getvalue()
+
+
+def decode_result(data: bytes) -> Any:
+    """Reverse of :py:func:`encode_result`. Each encoded data could be decoded only once."""
+    return pickle.loads(data)  # nosec  # noqa: S301
+
+
+class _SharedArrayReleaser(pickle.Unpickler):
+    def find_class(self, module, name):
+        if module == __name__ and name == _attach_shared_array.__name__:
+            return _release_shared_array
+        return super().find_class(module, name)
+
+
+def release_result(data: bytes) -> Any:
+    """
+    Release shared memory blocks of data encoded with :py:func:`encode_result` without copying arrays.
+
+    :return: decoded data with arrays stored in shared memory replaced by None
+    """
+    return _SharedArrayReleaser(io.BytesIO(data)).load()  # nosec
+
+
+class WorkersCounter:
+    """
+    Number of workers shared between :py:class:`BatchManager` and its :py:class:`BatchWorker` instances.
+
+    :ivar spawned: number of workers which should be running
+    :ivar started: number of workers which have taken first task
+    """
+
+    def __init__(self):
+        self.spawned = multiprocessing.Value("i", 0)
+        self.started = multiprocessing.Value("i", 0)
+
+    @staticmethod
+    def change(value, diff: int):
+        with value.get_lock():
+            value.value += diff
+
+
 class BatchManager:
     """
     This class is used for manage pending works.
@@ -56,9 +172,9 @@ class BatchManager:
 
     def __init__(self):
         self.manager = multiprocessing.Manager()
-        self.task_queue = self.manager.Queue()
-        self.order_queue = self.manager.Queue()
-        self.result_queue = self.manager.Queue()
+        self.task_queue = multiprocessing.Queue()
+        self.order_queue = multiprocessing.Queue()
+        self.result_queue = multiprocessing.Queue()
         self.calculation_dict = self.manager.dict()
         self.number_off_available_process = 1
         self.number_off_process = 0
@@ -66,24 +182,43 @@ class BatchManager:
         self.work_task = 0
         self.in_work = False
         self.process_list = []
+        self.canceled_works = set()
+        self.workers = WorkersCounter()
         self.locker = RLock()
 
-    def get_result(self) -> list[tuple[uuid.UUID, Any]]:
+    def get_result(self, with_time: bool = False) -> list[tuple]:
         """
         Clean result queue and return it as list
 
+        :param with_time: if add time of task execution (in seconds) as third element of tuple
         :return: List of results as tuple where first element is uuid of job and second is
-            function result or tuple with exception as first argument and second is traceback
+            function result or tuple with exception as first argument and second is traceback.
+            Results of canceled works are replaced with ``(index, [SubprocessOrder.cancel_job])``.
         """
         res = []
-        while not self.result_queue.empty():
-            res.append(self.result_queue.get())
+        with suppress(Empty):
+            while not self.result_queue.empty():
+                task_uuid, data, execution_time = self.result_queue.get_nowait()
+                if task_uuid in self.canceled_works:
+                    result = release_result(data)[0], [SubprocessOrder.cancel_job]
+                else:
+                    result = decode_result(data)
+                if with_time:
+                    res.append((task_uuid, result, execution_time))
+                else:
+                    res.append((task_uuid, result))
         self.work_task -= len(res)
-        if self.work_task == 0:
+        if self.work_task == 0 and self.number_off_process > 0:
             logging.debug("computation finished")
-            Timer(0.1, self._change_process_num, args=[-self.number_off_available_process]).start()
+            Timer(0.1, self._release_process).start()
         return res
 
+    def _release_process(self):
+        """Stop workers if no new work was added since all results were consumed"""
+        with self.locker:
+            if self.work_task == 0 and self.number_off_process > 0:
+                self._change_process_num(-self.number_off_process)
+
     def add_work(self, individual_parameters_list: list, global_parameters, fun: Callable[[Any, Any], Any]) -> str:
         """
         This function add next works to internal structures.
@@ -94,31 +229,39 @@ class BatchManager:
         :param global_parameters: second argument of fun. If has field uuid then it is used as work uuid
         :param fun: two argument function which will be used to run calculation.
             First argument is task specific, second is const for whole work.
+            If function has ``prefetch`` attribute, then it is called with same arguments in background thread
+            of worker before task is calculated and its result is passed to ``fun``
+            as ``prefetched`` keyword argument (as :py:class:`concurrent.futures.Future`).
         :return: work uuid
         """
-        self.calculation_dict[global_parameters.uuid] = global_parameters, fun
-        self.work_task += len(individual_parameters_list)
+        # work canceled before adding is only reported as canceled by workers
+        if global_parameters.uuid not in self.canceled_works:
+            self.calculation_dict[global_parameters.uuid] = global_parameters, fun
         if hasattr(global_parameters, "uuid"):
             task_uuid = global_parameters.uuid
         else:
             task_uuid = uuid.uuid4()
-        for el in individual_parameters_list:
-            self.task_queue.put((el, task_uuid))
-        if self.number_off_available_process > self.number_off_process:
-            for _ in range(self.number_off_available_process - self.number_off_process):
-                self._spawn_process()
+        with self.locker:
+            self.work_task += len(individual_parameters_list)
+            for el in individual_parameters_list:
+                self.task_queue.put((el, task_uuid))
+            if self.number_off_available_process > self.number_off_process:
+                for _ in range(self.number_off_available_process - self.number_off_process):
+                    self._spawn_process()
         self.in_work = True
         return task_uuid
 
     def _spawn_process(self):
         with self.locker:
             process = multiprocessing.Process(
-                target=spawn_worker, args=(self.task_queue, self.order_queue, self.result_queue, self.calculation_dict)
+                target=spawn_worker,
+                args=(self.task_queue, self.order_queue, self.result_queue, self.calculation_dict, self.workers),
             )
             process.start()
             self.process_list.append(process)
             self.number_off_alive_process += 1
             self.number_off_process += 1
+            self.workers.change(self.workers.spawned, 1)
 
     @property
     def has_work(self) -> bool:
@@ -126,8 +269,15 @@ class BatchManager:
         return self.work_task > 0 or (not self.result_queue.empty())
 
     def kill_jobs(self):
+        """Terminate workers and release shared memory of not consumed results"""
         for p in self.process_list:
             p.terminate()
+        for p in self.process_list:
+            p.join(1)
+        with suppress(Empty):
+            while not self.result_queue.empty():
+                with suppress(Exception):  # pylint: disable=broad-except
+                    release_result(self.result_queue.get_nowait()[1])
 
     def set_number_of_process(self, num: int):
         """
@@ -152,9 +302,15 @@ class BatchManager:
                 self.order_queue.put(SubprocessOrder.kill)
             with self.locker:
                 self.number_off_process += process_diff
+                self.workers.change(self.workers.spawned, process_diff)
             self.join_all()
 
     def cancel_work(self, global_parameters):
+        """
+        Cancel work. Not started tasks are skipped by workers
+        and shared memory of results which are not consumed yet is released in :py:meth:`get_result`.
+        """
+        self.canceled_works.add(global_parameters.uuid)
         with suppress(KeyError):
             del self.calculation_dict[global_parameters.uuid]
 
@@ -200,6 +356,9 @@ class BatchWorker:
     :param order_queue: Queue with additional orders (like kill)
     :param result_queue: Queue to put result
     :param calculation_dict: to store global parameters of task
+    :param read_ahead: number of tasks taken from queue in advance to prefetch their data
+    :param workers: numbers of workers used to check if tasks could be taken in advance.
+        If not provided, worker assumes that it is the only one.
     """
 
     def __init__(
@@ -208,30 +367,116 @@ class BatchWorker:
         order_queue: Queue,
         result_queue: Queue,
         calculation_dict: dict[uuid.UUID, tuple[Any, Callable[[Any, Any], Any]]],
+        read_ahead: int = READ_AHEAD,
+        workers: Optional[WorkersCounter] = None,
     ):
         self.task_queue = task_queue
         self.order_queue = order_queue
         self.result_queue = result_queue
         self.calculation_dict = calculation_dict
+        self.read_ahead = read_ahead
+        self.workers = workers
+        self.started = False
         self.canceled_tasks = set()
+        self.calculation_cache: dict[uuid.UUID, tuple[Any, Callable[[Any, Any], Any]]] = {}
+        self.pending: deque[tuple[tuple[Any, uuid.UUID], Optional[Future]]] = deque()
+        self._prefetch_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="batch_prefetch")
+
+    def _get_calculation(self, task_uuid: uuid.UUID):
+        if task_uuid not in self.calculation_dict:
+            self.calculation_cache.pop(task_uuid, None)
+            return None
+        if task_uuid not in self.calculation_cache:
+            self.calculation_cache[task_uuid] = self.calculation_dict[task_uuid]
+        return self.calculation_cache[task_uuid]
+
+    def _start_prefetch(self, val: tuple[Any, uuid.UUID]) -> Optional[Future]:
+        data, task_uuid = val
+        calc = self._get_calculation(task_uuid)
+        if calc is None:
+            return None
+        global_data, fun = calc
+        prefetch = getattr(fun, "prefetch", None)
+        if prefetch is None:
+            return None
+        return self._prefetch_executor.submit(prefetch, data, global_data)
+
+    def can_read_ahead(self) -> bool:
+        """
+        Check if next task could be taken from queue in advance.
+        It is allowed only if all workers have started calculation (so big tasks from begin of queue
+        are distributed between workers) and queue holds more tasks than workers.
+        """
+        if self.workers is None:
+            return True
+        spawned = self.workers.spawned.value
+        if self.workers.started.value < spawned:
+            return False
+        try:
+            return self.task_queue.qsize() > spawned
+        except NotImplementedError:  # pragma: no cover
+            # qsize is not implemented on macOS
+            return False
 
-    def calculate_task(self, val: tuple[Any, uuid.UUID]):
+    def fill_pending(self):
+        """
+        Take tasks from queue until there is current task and :py:attr:`read_ahead` prefetched ones.
+        Tasks are taken in advance only if :py:meth:`can_read_ahead` allows it.
+        """
+        while len(self.pending) <= self.read_ahead:
+            if self.pending and not self.can_read_ahead():
+                return
+            try:
+                task = self.task_queue.get_nowait()
+            except Empty:
+                return
+            self.pending.append((task, self._start_prefetch(task)))
+            self._mark_started()
+
+    def _mark_started(self):
+        if not self.started and self.workers is not None:
+            self.workers.change(self.workers.started, 1)
+        self.started = True
+
+    def return_pending(self):
+        """Put not calculated tasks back to queue, so other workers could calculate them"""
+        while self.pending:
+            task, prefetched = self.pending.popleft()
+            if prefetched is not None:
+                prefetched.cancel()
+            self.task_queue.put(task)
+
+    def calculate_task(self, val: tuple[Any, uuid.UUID], prefetched: Optional[Future] = None):
         """
         Calculate single task.
         ``val`` is tuple with two elements (task_data, uuid).
         function and global parameters are obtained from :py:attr:`.calculation_dict`
+        and cached in :py:attr:`.calculation_cache`
         """
         data, task_uuid = val
-        calc = self.calculation_dict.get(task_uuid)
+        calc = self._get_calculation(task_uuid)
         if calc is None:
-            self.result_queue.put((task_uuid, (-1, [SubprocessOrder.cancel_job])))
+            if prefetched is not None:
+                prefetched.cancel()
+            self.result_queue.put((task_uuid, encode_result((-1, [SubprocessOrder.cancel_job])), 0.0))
+            return
         global_data, fun = calc
+        start = time.monotonic()
         try:
-            res = fun(data, global_data)
-            self.result_queue.put((task_uuid, res))
+            if prefetched is None:
+                res = fun(data, global_data)
+            else:
+                res = fun(data, global_data, prefetched=prefetched)
+            self.result_queue.put((task_uuid, encode_result(res), time.monotonic() - start))
         except Exception as e:  # pragma: no cover # pylint: disable=broad-except
             logging.exception("Exception in worker")
-            self.result_queue.put((task_uuid, (-1, [(e, traceback.extract_tb(e.__traceback__))])))
+            self.result_queue.put(
+                (
+                    task_uuid,
+                    encode_result((-1, [(e, traceback.extract_tb(e.__traceback__))])),
+                    time.monotonic() - start,
+                )
+            )
 
     def run(self):
         """Worker main loop"""
@@ -242,24 +487,33 @@ class BatchWorker:
                     order = self.order_queue.get_nowait()
                     logging.debug("Order message: %s", order)
                     if order == SubprocessOrder.kill:
+                        self.return_pending()
                         break
-            if not self.task_queue.empty():
+            # data of tasks which stay in pending list are loaded during calculation of current one
+            self.fill_pending()
+            if self.pending:
+                task, prefetched = self.pending.popleft()
                 try:
-                    task = self.task_queue.get_nowait()
-                    self.calculate_task(task)
-                except Empty:  # pragma: no cover
-                    time.sleep(0.1)
-                    continue
+                    self.calculate_task(task, prefetched)
                 except (MemoryError, OSError):  # pragma: no cover
                     pass
                 except Exception as ex:  # pragma: no cover # pylint: disable=broad-except
                     logging.warning("Unsupported exception %s", ex)
             else:
                 time.sleep(0.1)
+        if self.started and self.workers is not None:
+            self.workers.change(self.workers.started, -1)
+        self._prefetch_executor.shutdown(wait=False)
         logging.info("Process %s ended", os.getpid())
 
 
-def spawn_worker(task_queue: Queue, order_queue: Queue, result_queue: Queue, calculation_dict: dict[uuid.UUID, Any]):
+def spawn_worker(
+    task_queue: Queue,
+    order_queue: Queue,
+    result_queue: Queue,
+    calculation_dict: dict[uuid.UUID, Any],
+    workers: Optional[WorkersCounter] = None,
+):
     """
     Function for spawning worker. Designed as argument for :py:meth:`multiprocessing.Process`.
 
@@ -267,6 +521,7 @@ def spawn_worker(task_queue: Queue, order_queue: Queue, result_queue: Queue, cal
     :param order_queue: Queue with additional orders (like kill)
     :param result_queue: Queue for calculation result
     :param calculation_dict: dict with global parameters
+    :param workers: numbers of workers shared between processes
     """
     try:
         register_if_need()
@@ -274,7 +529,7 @@ def spawn_worker(task_queue: Queue, order_queue: Queue, result_queue: Queue, cal
             from PartSeg.plugins import register_if_need as register
 
             register()
-        worker = BatchWorker(task_queue, order_queue, result_queue, calculation_dict)
+        worker = BatchWorker(task_queue, order_queue, result_queue, calculation_dict, workers=workers)
         worker.run()
     except Exception as e:  # pragma: no cover # pylint: disable=broad-except
-        result_queue.put(("-1", (-1, [(e, traceback.extract_tb(e.__traceback__))])))
+        result_queue.put(("-1", encode_result((-1, [(e, traceback.extract_tb(e.__traceback__))])), 0.0))
@@ -0,0 +1,133 @@
+"""
+This module contains utilities for cost aware ordering of batch tasks.
+
+Cost of file is estimated as size of decoded data (read from TIFF header with
+:py:func:`PartSegImage.image_reader.probe_image` or from project metadata with
+:py:func:`PartSegCore.analysis.load_functions.probe_project_image`) or size of file for other formats
+and for projects saved by older versions (which would need to be decompressed to read image header).
+Tasks are dispatched largest first. Because workers pull next task from shared queue when they finish
+previous one, small files fill gaps at the end of calculation and workers do not stay idle
+waiting for one big file started as last.
+
+:py:class:`CostCalibration` collects predicted and measured time of each task,
+so the estimator quality could be verified. :py:func:`format_cost_report` formats it for log.
+"""
+
+import os
+import tarfile
+from collections.abc import Hashable, Iterable
+from typing import NamedTuple, Optional
+
+from PartSegCore.analysis.load_functions import probe_project_image
+from PartSegCore.io_utils import WrongFileTypeException
+from PartSegImage.image_reader import TIFF_EXTENSIONS, probe_image
+
+PROJECT_EXTENSIONS = {".tgz", ".tbz2", ".gz", ".bz2", ".psz"}
+
+
+def estimate_file_cost(file_path: str) -> float:
+    """
+    Estimate cost of processing of file.
+
+    :param str file_path: path to file
+    :return: size of decoded image in bytes for tiff files and projects, size of file otherwise
+        (or if project does not store image description in metadata).
+        0 if file cannot be accessed.
+    """
+    ext = os.path.splitext(file_path)[1].lower()
+    try:
+        if ext in TIFF_EXTENSIONS:
+            return float(probe_image(file_path).nbytes)
+        if ext in PROJECT_EXTENSIONS and (image := probe_project_image(file_path)) is not None:
+            return float(image.nbytes)
+    except (OSError, ValueError, IndexError, KeyError, EOFError, tarfile.TarError, WrongFileTypeException):
+        pass
+    try:
+        return float(os.path.getsize(file_path))
+    except OSError:
+        return 0.0
+
+
+def order_by_cost(file_list: Iterable[str]) -> list[tuple[int, str, float]]:
+    """
+    Order files from most to least expensive.
+
+    :param file_list: list of files
+    :return: list of tuples (index in input list, file path, estimated cost).
+        Files with equal cost keep input order.
+    """
+    costs = [(i, file_path, estimate_file_cost(file_path)) for i, file_path in enumerate(file_list)]
+    return sorted(costs, key=lambda x: -x[2])
+
+
+class CostReport(NamedTuple):
+    file_path: str
+    cost: float
+    predicted_time: float
+    measured_time: float
+
+
+class CostCalibration:
+    """
+    Store estimated cost and measured time of tasks.
+    Predicted time is calculated using mean time per cost unit of already finished tasks.
+    """
+
+    def __init__(self):
+        self._prediction: dict[Hashable, tuple[str, float]] = {}
+        self._measurement: dict[Hashable, float] = {}
+
+    def add_prediction(self, key: Hashable, file_path: str, cost: float):
+        self._prediction[key] = file_path, cost
+
+    def add_measurement(self, key: Hashable, time: float):
+        if key in self._prediction:
+            self._measurement[key] = time
+
+    @property
+    def time_per_cost(self) -> float:
+        """Mean time per unit of cost for finished tasks"""
+        total_cost = sum(self._prediction[key][1] for key in self._measurement)
+        if total_cost == 0:
+            return 0.0
+        return sum(self._measurement.values()) / total_cost
+
+    def predict_time(self, cost: float) -> float:
+        return cost * self.time_per_cost
+
+    def remaining_time(self) -> float:
+        """Predicted time of not finished tasks"""
+        return self.predict_time(
+            sum(cost for key, (_, cost) in self._prediction.items() if key not in self._measurement)
+        )
+
+    def report(self, keys: Optional[Iterable[Hashable]] = None) -> list[CostReport]:
+        """
+        Predicted and measured time of finished tasks
+
+        :param keys: if provided, report only tasks with these keys
+        """
+        time_per_cost = self.time_per_cost
+        if keys is None:
+            keys = self._prediction
+        return [
+            CostReport(*self._prediction[key], self._prediction[key][1] * time_per_cost, self._measurement[key])
+            for key in keys
+            if key in self._measurement
+        ]
+
+
+def format_cost_report(report: list[CostReport]) -> str:
+    """
+    Summary of predicted and measured time of tasks, one line per file, most underestimated first.
+    """
+    if not report:
+        return "No finished tasks"
+    measured = sum(x.measured_time for x in report)
+    predicted = sum(x.predicted_time for x in report)
+    lines = [f"Files: {len(report)}, predicted time: {predicted:.1f} s, measured time: {measured:.1f} s"]
+    lines.extend(
+        f"{x.file_path}: predicted {x.predicted_time:.1f} s, measured {x.measured_time:.1f} s"
+        for x in sorted(report, key=lambda x: x.predicted_time - x.measured_time)
+    )
+    return "\n".join(lines)
@@ -44,7 +44,11 @@ def calculate_pipeline(image: Image, mask: typing.Optional[np.ndarray], pipeline
             time_axis=image.time_pos,
         )
         segmentation_parameters = {"algorithm_name": el.segmentation.name, "values": el.segmentation.values}
-        history.append(HistoryElement.create(roi_info, mask, segmentation_parameters, el.mask_property))
+        history.append(
+            HistoryElement.create(
+                roi_info, mask, segmentation_parameters, el.mask_property, previous=history[-1] if history else None
+            )
+        )
         report_fun("step", 2 * i + 2)
         mask = image.fit_array_to_image(new_mask)
     result, text = calculate_segmentation_step(pipeline.segmentation, image, mask)
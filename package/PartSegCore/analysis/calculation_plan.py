@@ -123,12 +123,14 @@ class MeasurementCalculate(BaseModel):
     :ivar Units ~.units: Type of units in which results of measurements should be represented
     :ivar MeasurementProfile ~.statistic_profile: description of measurements
     :ivar str name_prefix: prefix of column names
+    :ivar int workers: number of threads used to calculate measurements
     """
 
     channel: int
     units: Units
     measurement_profile: MeasurementProfile
     name_prefix: str
+    workers: int = 1
 
     @property
     def name(self):
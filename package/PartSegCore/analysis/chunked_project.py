@@ -0,0 +1,341 @@
+"""
+This module contains chunked project format.
+
+Project is stored in zip archive without zip level compression.
+Each array is split on chunks of fixed size, which are compressed with zstd in thread pool,
+so saving and loading of big projects scales with number of cores.
+Each part of project (metadata, ROI, image channel) could be read separately
+with :py:class:`ChunkedProjectReader`.
+
+Archive layout:
+
+* ``metadata.json`` - format version, description of stored arrays, image metadata, ROI annotations
+* ``algorithm.json`` - ROI extraction parameters
+* ``arrays/<name>/<chunk number>`` - compressed chunks of arrays
+* ``history/history.json``, ``history/arrays_<num>.npz`` - project history (same as in tar project)
+"""
+
+import json
+import os
+import typing
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
+from pathlib import Path
+
+import imagecodecs
+import numpy as np
+from packaging.version import Version
+
+from PartSegCore.analysis.io_utils import ProjectTuple
+from PartSegCore.io_utils import ProjectDescriptor
+from PartSegCore.json_hooks import PartSegEncoder, partseg_object_hook
+from PartSegCore.project_info import AdditionalLayerDescription, HistoryElement
+from PartSegCore.roi_info import ROIInfo
+from PartSegImage import ChannelInfo, Image, ImageDescriptor
+
+chunked_format_version = Version("1.0")
+CHUNK_SIZE = 2**24
+"""size of uncompressed chunk in bytes"""
+COMPRESSION_LEVEL = 3
+
+METADATA_FILE = "metadata.json"
+ALGORITHM_FILE = "algorithm.json"
+HISTORY_FILE = "history/history.json"
+ROI_ARRAY = "roi"
+MASK_ARRAY = "mask"
+POINTS_ARRAY = "points"
+ALTERNATIVE_PREFIX = "alternative/"
+ADDITIONAL_LAYER_PREFIX = "additional_layers/"
+CHANNEL_PREFIX = "image/channel_"
+
+
+def _chunk_name(array_name: str, num: int) -> str:
+    return f"arrays/{array_name}/{num}"
+
+
+def _color_map_to_json(color_map):
+    return color_map.tolist() if isinstance(color_map, np.ndarray) else color_map
+
+
+class ChunkedProjectWriter:
+    """
+    Write project to chunked format. Arrays are compressed in thread pool.
+
+    :param file_path: path to archive
+    :param int workers: number of compression threads, default to number of CPU
+    :param int level: zstd compression level
+    """
+
+    def __init__(
+        self, file_path: typing.Union[str, Path], workers: typing.Optional[int] = None, level: int = COMPRESSION_LEVEL
+    ):
+        self.workers = workers or os.cpu_count() or 1
+        self.level = level
+        self._zip_file = zipfile.ZipFile(file_path, "w", compression=zipfile.ZIP_STORED, allowZip64=True)
+        self._arrays: dict[str, dict] = {}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self._zip_file.close()
+
+    def _compress(self, chunk: memoryview) -> bytes:
+        return imagecodecs.zstd_encode(chunk, level=self.level)
+
+    def write_array(self, name: str, array: np.ndarray, executor: ThreadPoolExecutor):
+        array = np.ascontiguousarray(array)
+        if array.dtype.hasobject:
+            raise ValueError(f"Array {name} of type {array.dtype} cannot be saved")
+        data = memoryview(array.reshape(-1)).cast("B")
+        chunks = [data[i : i + CHUNK_SIZE] for i in range(0, len(data), CHUNK_SIZE)]
+        for i, compressed in enumerate(executor.map(self._compress, chunks)):
+            self._zip_file.writestr(_chunk_name(name, i), compressed)
+        self._arrays[name] = {
+            "shape": list(array.shape),
+            "dtype": array.dtype.str,
+            "chunk_size": CHUNK_SIZE,
+            "chunks": len(chunks),
+        }
+
+    def write_json(self, name: str, data):
+        self._zip_file.writestr(name, json.dumps(data, cls=PartSegEncoder))
+
+    def write_bytes(self, name: str, data: bytes):
+        self._zip_file.writestr(name, data)
+
+    def write_project(self, project: ProjectTuple):
+        image = project.image
+        metadata = {
+            "project_version_info": str(chunked_format_version),
+            "roi_annotations": project.roi_info.annotations,
+            "roi_components": len(project.roi_info.bound_info),
+            "image_descriptor": ImageDescriptor.from_image(image).as_dict(),
+            "image": {
+                "spacing": list(image.spacing),
+                "shift": list(image.shift),
+                "name": image.name,
+                "axes_order": image.axis_order,
+                "channel_info": [
+                    {
+                        "name": info.name,
+                        "color_map": _color_map_to_json(info.color_map),
+                        "contrast_limits": list(info.contrast_limits),
+                    }
+                    for info in image.channel_info
+                ],
+            },
+            "additional_layers": {},
+        }
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            for i in range(image.channels):
+                self.write_array(f"{CHANNEL_PREFIX}{i}", image.get_channel(i), executor)
+            if project.roi_info.roi is not None:
+                self.write_array(ROI_ARRAY, project.roi_info.roi, executor)
+            for name, array in project.roi_info.alternative.items():
+                self.write_array(ALTERNATIVE_PREFIX + name, array, executor)
+            if project.mask is not None:
+                self.write_array(MASK_ARRAY, project.mask, executor)
+            if project.points is not None:
+                self.write_array(POINTS_ARRAY, np.asarray(project.points), executor)
+            for key, layer in project.additional_layers.items():
+                self.write_array(ADDITIONAL_LAYER_PREFIX + key, layer.data, executor)
+                metadata["additional_layers"][key] = {"layer_type": layer.layer_type, "name": layer.name}
+        self.write_json(ALGORITHM_FILE, project.algorithm_parameters)
+        self._write_history(project.history)
+        metadata["arrays"] = self._arrays
+        self.write_json(METADATA_FILE, metadata)
+
+    def _write_history(self, history: list[HistoryElement]):
+        el_info = []
+        for i, el in enumerate(history):
+            el_info.append(
+                {
+                    "index": i,
+                    "roi_extraction_parameters": el.roi_extraction_parameters,
+                    "mask_property": el.mask_property,
+                    "annotations": el.annotations,
+                }
+            )
+            self.write_bytes(f"history/arrays_{i}.npz", el.get_arrays_buffer().getvalue())
+        if el_info:
+            self.write_json(HISTORY_FILE, el_info)
+
+
+class ChunkedProjectReader:
+    """
+    Read project, or its parts, from chunked format. Chunks are decompressed in thread pool.
+
+    :param file_path: path to archive
+    :param int workers: number of decompression threads, default to number of CPU
+    """
+
+    def __init__(self, file_path: typing.Union[str, Path], workers: typing.Optional[int] = None):
+        self.file_path = str(file_path)
+        self.workers = workers or os.cpu_count() or 1
+        self._zip_file = zipfile.ZipFile(file_path)
+        self.metadata = self._read_json(METADATA_FILE)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def close(self):
+        self._zip_file.close()
+
+    def _read_json(self, name: str):
+        return json.loads(self._zip_file.read(name), object_hook=partseg_object_hook)
+
+    @property
+    def version(self) -> Version:
+        return Version(self.metadata["project_version_info"])
+
+    @property
+    def array_names(self) -> list[str]:
+        return list(self.metadata["arrays"])
+
+    def read_array(self, name: str) -> np.ndarray:
+        """Read and decompress one array"""
+        description = self.metadata["arrays"][name]
+        array = np.empty(description["shape"], dtype=np.dtype(description["dtype"]))
+        data = memoryview(array.reshape(-1)).cast("B")
+        chunk_size = description["chunk_size"]
+
+        def _decompress(num):
+            out = data[num * chunk_size : (num + 1) * chunk_size]
+            imagecodecs.zstd_decode(self._zip_file.read(_chunk_name(name, num)), out=out)
+
+        with ThreadPoolExecutor(max_workers=min(self.workers, max(description["chunks"], 1))) as executor:
+            list(executor.map(_decompress, range(description["chunks"])))
+        return array
+
+    def _read_optional_array(self, name: str) -> typing.Optional[np.ndarray]:
+        return self.read_array(name) if name in self.metadata["arrays"] else None
+
+    def read_algorithm_parameters(self) -> dict:
+        return self._read_json(ALGORITHM_FILE)
+
+    def read_image(self) -> Image:
+        image_meta = self.metadata["image"]
+        channels = [self.read_array(f"{CHANNEL_PREFIX}{i}") for i in range(len(image_meta["channel_info"]))]
+        return Image(
+            channels,
+            spacing=tuple(image_meta["spacing"]),
+            file_path=self.file_path,
+            channel_info=[ChannelInfo(**info) for info in image_meta["channel_info"]],
+            axes_order=image_meta["axes_order"],
+            shift=tuple(image_meta["shift"]),
+            name=image_meta["name"],
+        )
+
+    def read_roi_info(self) -> ROIInfo:
+        alternative = {
+            name[len(ALTERNATIVE_PREFIX) :]: self.read_array(name)
+            for name in self.array_names
+            if name.startswith(ALTERNATIVE_PREFIX)
+        }
+        annotations = self.metadata.get("roi_annotations") or {}
+        annotations = {int(k): v for k, v in annotations.items()}
+        return ROIInfo(self._read_optional_array(ROI_ARRAY), annotations=annotations, alternative=alternative)
+
+    def read_mask(self) -> typing.Optional[np.ndarray]:
+        return self._read_optional_array(MASK_ARRAY)
+
+    def read_history(self) -> list[HistoryElement]:
+        if HISTORY_FILE not in self._zip_file.namelist():
+            return []
+        return [
+            HistoryElement(
+                roi_extraction_parameters=el["roi_extraction_parameters"],
+                mask_property=el["mask_property"],
+                arrays=BytesIO(self._zip_file.read(f"history/arrays_{el['index']}.npz")),
+                annotations=el.get("annotations"),
+            )
+            for el in self._read_json(HISTORY_FILE)
+        ]
+
+    def read_additional_layers(self) -> dict[str, AdditionalLayerDescription]:
+        return {
+            key: AdditionalLayerDescription(
+                data=self.read_array(ADDITIONAL_LAYER_PREFIX + key), layer_type=value["layer_type"], name=value["name"]
+            )
+            for key, value in self.metadata.get("additional_layers", {}).items()
+        }
+
+    def read_image_descriptor(self) -> ImageDescriptor:
+        """Description of image based only on metadata"""
+        if "image_descriptor" in self.metadata:
+            return ImageDescriptor.from_dict(self.metadata["image_descriptor"])
+        image_meta = self.metadata["image"]
+        channel = self.metadata["arrays"][f"{CHANNEL_PREFIX}0"]
+        return ImageDescriptor(
+            shape=tuple(channel["shape"]),
+            axes=image_meta["axes_order"].replace("C", ""),
+            dtype=np.dtype(channel["dtype"]).str,
+            channels=len(image_meta["channel_info"]),
+            spacing=tuple(image_meta["spacing"]),
+            channel_names=tuple(info["name"] for info in image_meta["channel_info"]),
+        )
+
+    def read_descriptor(self) -> ProjectDescriptor:
+        """Description of project based only on metadata"""
+        roi = self.metadata["arrays"].get(ROI_ARRAY)
+        return ProjectDescriptor(
+            file_path=self.file_path,
+            image=self.read_image_descriptor(),
+            roi_shape=tuple(roi["shape"]) if roi is not None else None,
+            roi_components=self.metadata.get("roi_components"),
+            has_mask=MASK_ARRAY in self.metadata["arrays"],
+            algorithm_name=self.read_algorithm_parameters().get("algorithm_name"),
+        )
+
+    def read_project(self) -> ProjectTuple:
+        image = self.read_image()
+        mask = self.read_mask()
+        image.set_mask(mask)
+        errors = ""
+        if self.version > chunked_format_version:
+            errors = "This project is from new version of PartSeg. It may load incorrect."
+        return ProjectTuple(
+            file_path=self.file_path,
+            image=image,
+            roi_info=self.read_roi_info(),
+            additional_layers=self.read_additional_layers(),
+            mask=mask,
+            history=self.read_history(),
+            algorithm_parameters=self.read_algorithm_parameters(),
+            errors=errors,
+            points=self._read_optional_array(POINTS_ARRAY),
+        )
+
+
+def save_chunked_project(
+    file_path: typing.Union[str, Path],
+    project: ProjectTuple,
+    workers: typing.Optional[int] = None,
+    level: int = COMPRESSION_LEVEL,
+):
+    """
+    Save project in chunked format.
+
+    :param file_path: path to archive
+    :param project: project to save
+    :param workers: number of compression threads, default to number of CPU
+    :param level: zstd compression level
+    """
+    with ChunkedProjectWriter(file_path, workers=workers, level=level) as writer:
+        writer.write_project(project)
+
+
+def load_chunked_project(file_path: typing.Union[str, Path], workers: typing.Optional[int] = None) -> ProjectTuple:
+    """
+    Load project saved in chunked format.
+
+    :param file_path: path to archive
+    :param workers: number of decompression threads, default to number of CPU
+    """
+    with ChunkedProjectReader(file_path, workers=workers) as reader:
+        return reader.read_project()
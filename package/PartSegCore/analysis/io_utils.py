@@ -73,10 +73,13 @@ class MaskInfo(typing.NamedTuple):
     mask_array: np.ndarray
 
 
-def create_history_element_from_project(project_info: ProjectTuple, mask_property: MaskProperty):
+def create_history_element_from_project(
+    project_info: ProjectTuple, mask_property: MaskProperty, previous: typing.Optional[HistoryElement] = None
+):
     return HistoryElement.create(
         roi_info=project_info.roi_info,
         mask=project_info.mask,
         roi_extraction_parameters=project_info.algorithm_parameters,
         mask_property=mask_property,
+        previous=previous,
     )
@@ -4,6 +4,8 @@ import logging
 import os
 import tarfile
 import typing
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
 from contextlib import suppress
 from copy import copy
 from functools import partial
@@ -19,17 +21,22 @@ from tifffile import TiffFile
 
 from PartSegCore.algorithm_describe_base import Register, ROIExtractionProfile
 from PartSegCore.analysis import AnalysisAlgorithmSelection
+from PartSegCore.analysis.chunked_project import ChunkedProjectReader, load_chunked_project
 from PartSegCore.analysis.io_utils import MaskInfo, ProjectTuple, project_version_info
 from PartSegCore.io_utils import (
     IO_MASK_METADATA_FILE,
     LoadBase,
     LoadPoints,
+    ProjectDescriptor,
     SegmentationType,
     WrongFileTypeException,
     check_segmentation_type,
+    iter_tar_members,
     load_metadata_base,
     load_metadata_part,
+    load_npz_from_tar,
     open_tar_file,
+    open_tar_member,
     proxy_callback,
     tar_to_buff,
 )
@@ -38,7 +45,7 @@ from PartSegCore.mask.io_functions import LoadROIImage
 from PartSegCore.project_info import HistoryElement
 from PartSegCore.roi_info import ROIInfo
 from PartSegCore.universal_const import UNIT_SCALE, Units
-from PartSegImage import GenericImageReader
+from PartSegImage import GenericImageReader, ImageDescriptor, TiffImageReader
 
 __all__ = [
     "LoadImageForBatch",
@@ -47,12 +54,16 @@ __all__ = [
     "LoadMaskSegmentation",
     "LoadProfileFromJSON",
     "LoadProject",
+    "LoadProjectChunked",
     "LoadStackImage",
     "load_dict",
     "load_metadata",
+    "probe_project",
+    "probe_project_image",
 ]
 
 from PartSegImage.image import Image
+from PartSegImage.image_reader import cache_by_file_state
 
 
 def _load_history(tar_file):
@@ -61,9 +72,7 @@ def _load_history(tar_file):
         history_buff = tar_file.extractfile(tar_file.getmember("history/history.json")).read()
         history_json = load_metadata(history_buff)
         for el in history_json:
-            history_buffer = BytesIO()
-            history_buffer.write(tar_file.extractfile(f"history/arrays_{el['index']}.npz").read())
-            history_buffer.seek(0)
+            history_buffer = tar_to_buff(tar_file, f"history/arrays_{el['index']}.npz")
             el_up = update_algorithm_dict(el)
             segmentation_parameters = {"algorithm_name": el_up["algorithm_name"], "values": el_up["values"]}
             history.append(
@@ -77,44 +86,61 @@ def _load_history(tar_file):
     return history
 
 
-def load_project_from_tar(tar_file, file_path):
+def _read_tiff_member(member, memmap=False) -> Image:
+    with member:
+        return TiffImageReader.read_image(member, memmap=memmap)
+
+
+def _read_tiff_array(tar_file, member_name) -> np.ndarray:
+    with open_tar_member(tar_file, member_name) as member:
+        return tifffile.imread(member)
+
+
+def load_project_from_tar(tar_file, file_path, memmap: bool = False):
+    """
+    Load project from tar archive.
+    Members are decoded directly from archive file (uncompressed archives) or from member content
+    read once to memory (compressed archives). Image is decoded in separate thread in parallel to ROI.
+
+    :param tar_file: archive with project
+    :param file_path: path to project file
+    :param memmap: memory map image data from archive. Works only for uncompressed archive on disc.
+        Archive file should not be overwritten while image is used.
+    """
     if check_segmentation_type(tar_file) != SegmentationType.analysis:
         raise WrongFileTypeException
-    image_buffer = BytesIO()
-    image_tar = tar_file.extractfile(tar_file.getmember("image.tif"))
-    image_buffer.write(image_tar.read())
-    image_buffer.seek(0)
-    reader = GenericImageReader()
-    image = reader.read(image_buffer, ext=".tif")
-    image.file_path = file_path
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        image_future = executor.submit(_read_tiff_member, open_tar_member(tar_file, "image.tif"), memmap)
 
-    algorithm_str = tar_file.extractfile("algorithm.json").read()
-    algorithm_dict = load_metadata(algorithm_str)
-    algorithm_dict = update_algorithm_dict(algorithm_dict)
-    with contextlib.suppress(KeyError):
-        algorithm_dict["algorithm_name"] = AnalysisAlgorithmSelection[algorithm_dict["algorithm_name"]].get_name()
+        algorithm_str = tar_file.extractfile("algorithm.json").read()
+        algorithm_dict = load_metadata(algorithm_str)
+        algorithm_dict = update_algorithm_dict(algorithm_dict)
+        with contextlib.suppress(KeyError):
+            algorithm_dict["algorithm_name"] = AnalysisAlgorithmSelection[algorithm_dict["algorithm_name"]].get_name()
 
-    metadata = json.loads(tar_file.extractfile(IO_MASK_METADATA_FILE).read(), object_hook=partseg_object_hook)
+        metadata = json.loads(tar_file.extractfile(IO_MASK_METADATA_FILE).read(), object_hook=partseg_object_hook)
 
-    version = parse_version(metadata.get("project_version_info", "1.0"))
+        version = parse_version(metadata.get("project_version_info", "1.0"))
 
-    if version == Version("1.0"):
-        seg_dict = np.load(tar_to_buff(tar_file, "segmentation.npz"))
-        mask = seg_dict.get("mask")
-        roi = seg_dict["segmentation"]
-    else:
-        roi = tifffile.imread(tar_to_buff(tar_file, "segmentation.tif"))
-        if "mask.tif" in tar_file.getnames():
-            mask = tifffile.imread(tar_to_buff(tar_file, "mask.tif"))
-            if np.max(mask) == 1:
-                mask = mask.astype(bool)
+        if version == Version("1.0"):
+            seg_dict = load_npz_from_tar(tar_file, "segmentation.npz")
+            mask = seg_dict.get("mask")
+            roi = seg_dict["segmentation"]
         else:
-            mask = None
-    if "alternative.npz" in tar_file.getnames():
-        alternative = np.load(tar_to_buff(tar_file, "alternative.npz"))
-    else:
-        alternative = {}
-    history = _load_history(tar_file)
+            roi = _read_tiff_array(tar_file, "segmentation.tif")
+            if "mask.tif" in tar_file.getnames():
+                mask = _read_tiff_array(tar_file, "mask.tif")
+                if np.max(mask) == 1:
+                    mask = mask.astype(bool)
+            else:
+                mask = None
+        if "alternative.npz" in tar_file.getnames():
+            alternative = load_npz_from_tar(tar_file, "alternative.npz")
+        else:
+            alternative = {}
+        history = _load_history(tar_file)
+        image = image_future.result()
+    image.file_path = file_path
     image.set_mask(mask)
     roi_info = ROIInfo(roi, annotations=metadata.get("roi_annotations"), alternative=alternative)
     if version <= project_version_info:
@@ -142,17 +168,92 @@ def load_project_from_tar(tar_file, file_path):
 
 
 def load_project(
-    file: typing.Union[str, Path, tarfile.TarFile, TextIOBase, BufferedIOBase, RawIOBase, IOBase]
+    file: typing.Union[str, Path, tarfile.TarFile, TextIOBase, BufferedIOBase, RawIOBase, IOBase], memmap: bool = False
 ) -> ProjectTuple:
-    """Load project from archive"""
+    """Load project from archive. Description of ``memmap`` in :py:func:`load_project_from_tar`"""
     tar_file, file_path = open_tar_file(file)
     try:
-        return load_project_from_tar(tar_file, file_path)
+        return load_project_from_tar(tar_file, file_path, memmap=memmap)
     finally:
         if isinstance(file, (str, Path)):
             tar_file.close()
 
 
+def _probe_project_tar(file_path: str) -> ProjectDescriptor:
+    metadata = algorithm_dict = image_descriptor = None
+    names = set()
+    for name, read in iter_tar_members(file_path):
+        names.add(name)
+        if name == IO_MASK_METADATA_FILE:
+            metadata = json.loads(read())
+        elif name == "algorithm.json":
+            algorithm_dict = json.loads(read())
+        elif name == "image.tif" and (metadata is None or "image" not in metadata):
+            # projects saved by older versions do not contain image description in metadata
+            image_descriptor = TiffImageReader.read_metadata(BytesIO(read()))
+        if (
+            metadata is not None
+            and algorithm_dict is not None
+            and ("image" in metadata or image_descriptor is not None)
+        ):
+            break
+    if metadata is None or algorithm_dict is None:
+        raise WrongFileTypeException
+    if "image" in metadata:
+        image_descriptor = ImageDescriptor.from_dict(metadata["image"])
+    if "has_mask" in metadata:
+        has_mask = metadata["has_mask"]
+    elif "segmentation.npz" in names:
+        has_mask = None
+    else:
+        has_mask = "mask.tif" in names
+    return ProjectDescriptor(
+        file_path=file_path,
+        image=image_descriptor,
+        roi_shape=tuple(metadata["roi_shape"]) if "roi_shape" in metadata else None,
+        roi_components=metadata.get("roi_components"),
+        has_mask=has_mask,
+        algorithm_name=algorithm_dict.get("algorithm_name") if isinstance(algorithm_dict, dict) else None,
+    )
+
+
+@cache_by_file_state()
+def probe_project(file_path: typing.Union[str, Path]) -> ProjectDescriptor:
+    """
+    Read description of project (image shape, channels, spacing, number of ROI components)
+    without decoding of stored arrays. Only ``metadata.json`` and ``algorithm.json`` are read
+    (and image header for projects saved by older versions).
+    Result is cached until file is modified.
+
+    :param file_path: path to project (tar archive or chunked project)
+    """
+    if zipfile.is_zipfile(file_path):
+        with ChunkedProjectReader(file_path) as reader:
+            return reader.read_descriptor()
+    return _probe_project_tar(file_path)
+
+
+@cache_by_file_state()
+def probe_project_image(file_path: typing.Union[str, Path]) -> typing.Optional[ImageDescriptor]:
+    """
+    Cheap version of :py:func:`probe_project` returning only description of image.
+    From tar archive only first member is read, so nothing is decompressed
+    behind ``metadata.json``. Result is cached until file is modified.
+
+    :param file_path: path to project (tar archive or chunked project)
+    :return: description of image or None if it is not available without decompressing
+        other members (projects saved by older versions)
+    """
+    if zipfile.is_zipfile(file_path):
+        return probe_project(file_path).image
+    for name, read in iter_tar_members(file_path):
+        if name != IO_MASK_METADATA_FILE:
+            return None
+        metadata = json.loads(read())
+        return ImageDescriptor.from_dict(metadata["image"]) if "image" in metadata else None
+    return None
+
+
 class LoadProject(LoadBase):
     @classmethod
     def get_name(cls):
@@ -173,6 +274,28 @@ class LoadProject(LoadBase):
         return load_project(load_locations[0])
 
 
+class LoadProjectChunked(LoadBase):
+    """Load project saved in chunked format (see :py:mod:`PartSegCore.analysis.chunked_project`)"""
+
+    @classmethod
+    def get_name(cls):
+        return "Chunked project (*.psz)"
+
+    @classmethod
+    def get_short_name(cls):
+        return "project_chunked"
+
+    @classmethod
+    def load(
+        cls,
+        load_locations: list[typing.Union[str, BytesIO, Path]],
+        range_changed: typing.Optional[typing.Callable[[int, int], typing.Any]] = None,
+        step_changed: typing.Optional[typing.Callable[[int], typing.Any]] = None,
+        metadata: typing.Optional[dict] = None,
+    ) -> ProjectTuple:
+        return load_chunked_project(load_locations[0])
+
+
 class LoadStackImage(LoadBase):
     @classmethod
     def get_name(cls):
@@ -413,6 +536,7 @@ load_dict = Register(
     LoadStackImage,
     LoadImageMask,
     LoadProject,
+    LoadProjectChunked,
     LoadMaskSegmentation,
     LoadPoints,
     class_methods=LoadBase.need_functions,
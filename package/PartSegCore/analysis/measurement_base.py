@@ -391,6 +391,22 @@ class MeasurementMethodBase(AlgorithmDescribeBase, ABC):
         """
         raise NotImplementedError
 
+    @classmethod
+    def calculate_per_label(cls, labels: np.ndarray, components: np.ndarray, **kwargs) -> Optional[np.ndarray]:
+        """
+        Calculate measurement for all components at once.
+        Overwrite this function if measurement could be calculated with label indexed reductions
+        (like :py:func:`numpy.bincount`). Otherwise :py:meth:`calculate_property` is called for each component
+        separately.
+
+        :param labels: array with components labeled by positive integers, same shape as ``area_array``
+        :param components: labels of components for which measurement should be calculated
+        :param kwargs: same arguments as for :py:meth:`calculate_property`
+        :return: array with measurement values in ``components`` order
+            or None if such calculation is not supported for given arguments
+        """
+        return None
+
     @classmethod
     def get_starting_leaf(cls) -> Leaf:
         """This leaf is put on a default list"""
@@ -0,0 +1,180 @@
+"""
+This module contains persistent cache of measurement results.
+
+Results of measurement leaves are stored on disk, so they survive between calls of
+:py:meth:`PartSegCore.analysis.measurement_calculation.MeasurementProfile.calculate`
+(for example, when one column is added to measurement set).
+Key of each entry is build from content hash of data (channels, ROI, mask), description of leaf
+and :py:data:`CACHE_VERSION`, so results calculated by other version of PartSeg are not reused.
+Total size of cache is bounded and least recently used entries are removed first.
+"""
+
+import hashlib
+import os
+import pickle  # nosec
+import threading
+from collections import OrderedDict
+from collections.abc import Iterable
+from importlib.metadata import PackageNotFoundError, version
+from typing import Any, NamedTuple, Optional
+
+import numpy as np
+
+CACHE_SUFFIX = ".pkl"
+CACHE_FORMAT = 1
+try:
+    CACHE_VERSION = f"{CACHE_FORMAT}-{version('PartSeg')}"
+except PackageNotFoundError:  # pragma: no cover
+    CACHE_VERSION = f"{CACHE_FORMAT}-unknown"
+"""Version of cache entries. Part of every key, as implementation of measurements could change between versions"""
+DEFAULT_CACHE_SIZE = 2**28
+CACHE_MISS = object()
+"""Sentinel to pass as ``default`` to :py:meth:`DiskMeasurementCache.get`, as ``None`` is valid cached value"""
+
+
+class CacheStatistics(NamedTuple):
+    hits: int
+    misses: int
+    entries: int
+    size: int
+
+    def __str__(self):
+        return f"hits: {self.hits}, misses: {self.misses}, entries: {self.entries}, size: {self.size / 2**20:.1f} MB"
+
+
+def hash_arrays(arrays: Iterable[Optional[np.ndarray]], *extra: Any) -> str:
+    """
+    Calculate content hash of arrays.
+
+    :param arrays: arrays to be hashed. ``None`` values are allowed.
+    :param extra: additional values which representation should be part of hash (like voxel size)
+    :return: hex digest
+    """
+    hasher = hashlib.sha1(usedforsecurity=False)
+    for array in arrays:
+        if array is None:
+            hasher.update(b"None")
+            continue
+        contiguous = np.ascontiguousarray(array)
+        hasher.update(f"{contiguous.dtype.str}{contiguous.shape}".encode())
+        hasher.update(contiguous.data)
+    for value in extra:
+        hasher.update(repr(value).encode())
+    return hasher.hexdigest()
+
+
+class DiskMeasurementCache:
+    """
+    Size bounded cache of measurement results stored in directory.
+
+    :param str cache_dir: path to directory with cache entries. Created if it does not exist.
+    :param int max_size: maximum size of cache in bytes.
+    """
+
+    def __init__(self, cache_dir: str, max_size: int = DEFAULT_CACHE_SIZE):
+        self.cache_dir = cache_dir
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._entries: OrderedDict[str, int] = OrderedDict()
+        self._size = 0
+        os.makedirs(cache_dir, exist_ok=True)
+        self._load_index()
+
+    def _load_index(self):
+        entries = []
+        for entry in os.scandir(self.cache_dir):
+            if entry.is_file() and entry.name.endswith(CACHE_SUFFIX):
+                stat = entry.stat()
+                entries.append((stat.st_mtime, entry.name[: -len(CACHE_SUFFIX)], stat.st_size))
+        for _, key, size in sorted(entries):
+            self._entries[key] = size
+            self._size += size
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, key + CACHE_SUFFIX)
+
+    @staticmethod
+    def make_key(data_hash: str, description: str) -> str:
+        """
+        Combine hash of data, description of calculation and :py:data:`CACHE_VERSION` to file name safe key.
+
+        :param data_hash: hash of data calculated with :py:func:`hash_arrays`
+        :param description: description of calculation
+        """
+        return hashlib.sha1(f"{CACHE_VERSION}|{data_hash}|{description}".encode(), usedforsecurity=False).hexdigest()
+
+    def get(self, key: str, default=None):
+        """
+        Get cached value. Use :py:data:`CACHE_MISS` as ``default`` to distinguish missing entry from cached ``None``.
+
+        :param key: key created with :py:meth:`make_key`
+        :param default: value returned if key is not present in cache
+        """
+        with self._lock:
+            if key not in self._entries:
+                self.misses += 1
+                return default
+            self._entries.move_to_end(key)
+        try:
+            with open(self._path(key), "rb") as f_p:
+                value = pickle.load(f_p)  # nosec  # noqa: S301
+            os.utime(self._path(key))
+        except (OSError, EOFError, pickle.UnpicklingError):
+            with self._lock:
+                self.misses += 1
+                self._remove(key)
+            return default
+        with self._lock:
+            self.hits += 1
+        return value
+
+    def put(self, key: str, value):
+        data = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        if len(data) > self.max_size:
+            return
+        tmp_path = f"{self._path(key)}.{threading.get_ident()}.tmp"
+        try:
+            with open(tmp_path, "wb") as f_p:
+                f_p.write(data)
+            os.replace(tmp_path, self._path(key))
+        except OSError:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            return
+        with self._lock:
+            self._size -= self._entries.pop(key, 0)
+            self._entries[key] = len(data)
+            self._size += len(data)
+            while self._size > self.max_size:
+                self._remove(next(iter(self._entries)))
+
+    def _remove(self, key: str):
+        self._size -= self._entries.pop(key, 0)
+        if os.path.exists(self._path(key)):
+            os.remove(self._path(key))
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._entries
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def size(self) -> int:
+        """Total size of cache entries in bytes"""
+        return self._size
+
+    def statistics(self) -> CacheStatistics:
+        return CacheStatistics(self.hits, self.misses, len(self._entries), self._size)
+
+    def reset_statistics(self):
+        self.hits = 0
+        self.misses = 0
+
+    def clear(self):
+        """Remove all entries from cache"""
+        with self._lock:
+            for key in list(self._entries):
+                self._remove(key)
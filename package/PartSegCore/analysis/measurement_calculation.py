@@ -1,7 +1,10 @@
+import itertools
+import threading
 import warnings
-from collections import OrderedDict
+from collections import OrderedDict, deque
 from collections.abc import Generator, Iterator, MutableMapping, Sequence
-from contextlib import suppress
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import nullcontext, suppress
 from enum import Enum
 from functools import reduce
 from math import pi
@@ -19,7 +22,8 @@ import SimpleITK
 from local_migrator import register_class, rename_key
 from mahotas.features import haralick
 from pydantic import Field
-from scipy.spatial.distance import cdist
+from scipy import ndimage
+from scipy.spatial import cKDTree
 from sympy import Rational, symbols
 
 from PartSegCore import autofit as af
@@ -35,8 +39,9 @@ from PartSegCore.analysis.measurement_base import (
     has_mask_components,
     has_roi_components,
 )
+from PartSegCore.analysis.measurement_cache import CACHE_MISS, DiskMeasurementCache, hash_arrays
 from PartSegCore.mask_partition_utils import BorderRim, MaskDistanceSplit
-from PartSegCore.roi_info import ROIInfo
+from PartSegCore.roi_info import BoundInfo, ROIInfo
 from PartSegCore.segmentation.restartable_segmentation_algorithms import LowerThresholdAlgorithm
 from PartSegCore.universal_const import UNIT_SCALE, Units
 from PartSegCore.utils import BaseModel
@@ -262,6 +267,22 @@ class MeasurementResult(MutableMapping[str, MeasurementResultType]):
         return res
 
 
+class MeasurementCache(dict):
+    """
+    Cache of measurements results (``help_dict``) used when measurements are calculated in many threads.
+    It provides lock per key, so identical measurement leaves are calculated only once.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self._lock = threading.Lock()
+        self._key_locks: dict[str, threading.Lock] = {}
+
+    def key_lock(self, key: str) -> threading.Lock:
+        with self._lock:
+            return self._key_locks.setdefault(key, threading.Lock())
+
+
 class MeasurementProfile(BaseModel):
     name: str
     chosen_fields: list[MeasurementEntry]
@@ -399,6 +420,18 @@ class MeasurementProfile(BaseModel):
             kw2["roi_alternative"][name] = array[bounds]
         return kw2
 
+    @staticmethod
+    def _calculate_per_label(
+        kw, node: Leaf, method: MeasurementMethodBase, components: np.ndarray
+    ) -> Optional[np.ndarray]:
+        if method.need_full_data() or kw["area_array"] is None:
+            return None
+        if node.per_component == PerComponent.Per_Mask_component:
+            labels = np.where(kw["area_array"] > 0, kw["mask"], 0)
+        else:
+            labels = kw["area_array"]
+        return method.calculate_per_label(labels=labels, components=np.asarray(components), **kw)
+
     def _calculate_leaf_value(
         self, node: Union[Node, Leaf], segmentation_mask_map: ComponentsInfo, kwargs: dict
     ) -> Union[float, np.ndarray]:
@@ -408,19 +441,30 @@ class MeasurementProfile(BaseModel):
         if node.per_component == PerComponent.No:
             return method.calculate_property(**kw)
         # TODO use cache for per component calculate
-        val = []
         if method.area_type(node.area) == AreaType.ROI and node.per_component != PerComponent.Per_Mask_component:
             components = segmentation_mask_map.roi_components
         else:
             components = segmentation_mask_map.mask_components
-        for i in components:
-            kw2 = self._clip_arrays(kw, node, method, i)
-            val.append(method.calculate_property(**kw2))
-        val = np.array(val)
+        val = self._calculate_per_label(kw, node, method, components)
+        if val is None:
+            val = np.array([method.calculate_property(**self._clip_arrays(kw, node, method, i)) for i in components])
         if node.per_component == PerComponent.Mean:
             val = np.mean(val) if val.size else 0
         return val
 
+    def _calculate_leaf_value_disk_cache(
+        self, node: Leaf, segmentation_mask_map: ComponentsInfo, kwargs: dict, hash_str: str
+    ) -> Union[float, np.ndarray]:
+        disk_cache: Optional[DiskMeasurementCache] = kwargs.get("_disk_cache")
+        if disk_cache is None:
+            return self._calculate_leaf_value(node, segmentation_mask_map, kwargs)
+        key = disk_cache.make_key(kwargs["_data_hash"], hash_str)
+        val = disk_cache.get(key, CACHE_MISS)
+        if val is CACHE_MISS:
+            val = self._calculate_leaf_value(node, segmentation_mask_map, kwargs)
+            disk_cache.put(key, val)
+        return val
+
     def _calculate_leaf(
         self, node: Leaf, segmentation_mask_map: ComponentsInfo, help_dict: dict, kwargs: dict
     ) -> tuple[Union[float, np.ndarray], symbols, AreaType]:
@@ -432,12 +476,14 @@ class MeasurementProfile(BaseModel):
         area_type = method.area_type(node.area)
         if node.per_component == PerComponent.Per_Mask_component:
             area_type = AreaType.Mask
-        if hash_str in help_dict:
-            val = help_dict[hash_str]
-        else:
-            kwargs["help_dict"] = help_dict
-            val = self._calculate_leaf_value(node, segmentation_mask_map, kwargs)
-            help_dict[hash_str] = val
+        lock = help_dict.key_lock(hash_str) if isinstance(help_dict, MeasurementCache) else nullcontext()
+        with lock:
+            if hash_str in help_dict:
+                val = help_dict[hash_str]
+            else:
+                kwargs["help_dict"] = help_dict
+                val = self._calculate_leaf_value_disk_cache(node, segmentation_mask_map, kwargs, hash_str)
+                help_dict[hash_str] = val
         unit: symbols = method.get_units(3) if kwargs["image"].is_stack else method.get_units(2)
         if node.power != 1:
             return pow(val, node.power), pow(unit, Rational(node.power)), area_type
@@ -548,6 +594,8 @@ class MeasurementProfile(BaseModel):
         range_changed: Callable[[int, int], Any] = empty_fun,
         step_changed: Callable[[int], Any] = empty_fun,
         time: int = 0,
+        workers: int = 1,
+        disk_cache: Optional[DiskMeasurementCache] = None,
     ) -> MeasurementResult:
         """
         Calculate measurements on given set of parameters
@@ -559,6 +607,8 @@ class MeasurementProfile(BaseModel):
         :param range_changed: callback function to set information about steps range
         :param step_changed: callback function for set information about steps done
         :param time: which data point should be measured
+        :param workers: number of threads used to calculate measurements
+        :param disk_cache: optional persistent cache of measurement results
         :return: measurements
         """
 
@@ -573,6 +623,8 @@ class MeasurementProfile(BaseModel):
                 result_units=result_units,
                 segmentation_mask_map=segmentation_mask_map,
                 time=time,
+                workers=workers,
+                disk_cache=disk_cache,
             ),
             start=1,
         ):
@@ -581,6 +633,109 @@ class MeasurementProfile(BaseModel):
 
         return result
 
+    def _calculate_time_point(
+        self,
+        image: Image,
+        channel_num: int,
+        roi: ROIInfo,
+        result_units: Units,
+        time: int,
+        disk_cache: Optional[DiskMeasurementCache],
+        mask_bound_info: Optional[dict[int, BoundInfo]],
+    ) -> MeasurementResult:
+        segmentation_mask_map = self.get_segmentation_mask_map(image, roi, time)
+        result = MeasurementResult(segmentation_mask_map)
+        for name, data in self._calculate_yield(
+            image, channel_num, roi, result_units, segmentation_mask_map, time, 1, disk_cache, mask_bound_info
+        ):
+            result[name] = data
+        return result
+
+    def calculate_time_yield(
+        self,
+        image: Image,
+        channel_num: int,
+        roi: Union[np.ndarray, ROIInfo],
+        result_units: Units,
+        times: Optional[Sequence[int]] = None,
+        workers: int = 1,
+        disk_cache: Optional[DiskMeasurementCache] = None,
+    ) -> Generator[tuple[int, MeasurementResult], None, None]:
+        """
+        Calculate measurements for many time points of image.
+        Time points are calculated in parallel in threads, which share image data.
+
+        :param image: image on which measurements should be calculated
+        :param channel_num: channel number on which measurements should be calculated
+        :param roi: array with segmentation labeled as positive integers
+        :param result_units: units which should be used to present results.
+        :param times: time points which should be measured. All time points if not provided.
+        :param workers: number of time points calculated in parallel.
+        :param disk_cache: optional persistent cache of measurement results
+        :return: pairs of time point and its measurements, in order of ``times`` independent of ``workers``
+        """
+        if times is None:
+            times = range(image.times)
+        if isinstance(roi, np.ndarray):
+            roi = ROIInfo(roi).fit_to_image(image)
+        mask_bound_info = self._mask_bound_info(image)
+        args = (image, channel_num, roi, result_units)
+        if workers <= 1:
+            for time in times:
+                yield time, self._calculate_time_point(*args, time, disk_cache, mask_bound_info)
+            return
+
+        executor = ThreadPoolExecutor(max_workers=workers)
+        pending: deque[tuple[int, Future]] = deque()
+        times_iter = iter(times)
+
+        def submit(count: int):
+            for time_ in itertools.islice(times_iter, count):
+                pending.append(
+                    (time_, executor.submit(self._calculate_time_point, *args, time_, disk_cache, mask_bound_info))
+                )
+
+        try:
+            # limit number of calculated time points kept in memory
+            submit(2 * workers)
+            while pending:
+                time, future = pending.popleft()
+                result = future.result()
+                submit(1)
+                yield time, result
+        finally:
+            executor.shutdown(wait=True, cancel_futures=True)
+
+    def calculate_time_series(
+        self,
+        image: Image,
+        channel_num: int,
+        roi: Union[np.ndarray, ROIInfo],
+        result_units: Units,
+        range_changed: Callable[[int, int], Any] = empty_fun,
+        step_changed: Callable[[int], Any] = empty_fun,
+        times: Optional[Sequence[int]] = None,
+        workers: int = 1,
+        disk_cache: Optional[DiskMeasurementCache] = None,
+    ) -> list[MeasurementResult]:
+        """
+        Calculate measurements for many time points of image. See :py:meth:`calculate_time_yield`.
+
+        :param range_changed: callback function to set information about steps range
+        :param step_changed: callback function for set information about number of calculated time points
+        :return: list of measurements, one for each time point
+        """
+        if times is None:
+            times = range(image.times)
+        range_changed(0, len(times))
+        res = []
+        for i, (_, result) in enumerate(
+            self.calculate_time_yield(image, channel_num, roi, result_units, times, workers, disk_cache), start=1
+        ):
+            res.append(result)
+            step_changed(i)
+        return res
+
     def calculate_yield(
         self,
         image: Image,
@@ -589,6 +744,8 @@ class MeasurementProfile(BaseModel):
         result_units: Units,
         segmentation_mask_map: ComponentsInfo,
         time: int = 0,
+        workers: int = 1,
+        disk_cache: Optional[DiskMeasurementCache] = None,
     ) -> Generator[MeasurementResultInputType, None, None]:
         """
         Calculate measurements on given set of parameters
@@ -598,9 +755,37 @@ class MeasurementProfile(BaseModel):
         :param result_units: units which should be used to present results.
         :param segmentation_mask_map: information which component of roi belongs to which mask component.
         :param time: which data point should be measured
+        :param workers: number of threads used to calculate measurements.
+            Results are yielded in order of :py:attr:`chosen_fields` independent of this value.
+        :param disk_cache: optional persistent cache of measurement results.
+            Results are stored under content hash of channels, ROI and mask.
         :return: measurements
         """
+        return self._calculate_yield(
+            image, channel_num, roi, result_units, segmentation_mask_map, time, workers, disk_cache
+        )
+
+    @staticmethod
+    def _mask_bound_info(image: Image) -> Optional[dict[int, BoundInfo]]:
+        if not isinstance(image.mask, np.ndarray):
+            return None
+        return {
+            k: v.del_dim(image.time_pos) if len(v.lower) == 4 else v
+            for k, v in ROIInfo(image.mask).fit_to_image(image).bound_info.items()
+        }
 
+    def _calculate_yield(
+        self,
+        image: Image,
+        channel_num: int,
+        roi: Union[np.ndarray, ROIInfo],
+        result_units: Units,
+        segmentation_mask_map: ComponentsInfo,
+        time: int,
+        workers: int,
+        disk_cache: Optional[DiskMeasurementCache],
+        mask_bound_info: Optional[dict[int, BoundInfo]] = None,
+    ) -> Generator[MeasurementResultInputType, None, None]:
         def get_time(array: np.ndarray):
             if array is not None and array.ndim == 4:
                 return array.take(time, axis=image.time_pos)
@@ -608,23 +793,19 @@ class MeasurementProfile(BaseModel):
 
         if self._need_mask and image.mask is None:
             raise ValueError("measurement need mask")
-        channel = image.get_channel(channel_num).astype(float)
-        cache_dict = {}
+        channel = get_time(image.get_channel(channel_num)).astype(float)
+        cache_dict = MeasurementCache() if workers > 1 else {}
         result_scalar = UNIT_SCALE[result_units.value]
         if isinstance(roi, np.ndarray):
             roi = ROIInfo(roi).fit_to_image(image)
-        mask_bound_info = None
-        if isinstance(image.mask, np.ndarray):
-            mask_bound_info = {
-                k: v.del_dim(image.time_pos) if len(v.lower) == 4 else v
-                for k, v in ROIInfo(image.mask).fit_to_image(image).bound_info.items()
-            }
+        if mask_bound_info is None:
+            mask_bound_info = self._mask_bound_info(image)
         roi_alternative = {}
         for name, array in roi.alternative.items():
             roi_alternative[name] = get_time(array)
         kw = {
             "image": image,
-            "channel": get_time(channel),
+            "channel": channel,
             "segmentation": get_time(roi.roi),
             "roi": get_time(roi.roi),
             "bounds_info": {
@@ -644,9 +825,40 @@ class MeasurementProfile(BaseModel):
             mm[kw["segmentation"] > 0] = 0
             kw["mask_without_segmentation"] = mm
 
-        for entry in self.chosen_fields:
-            name = self.name_prefix + entry.name
-            yield name, self._calc_single_field(entry, segmentation_mask_map, cache_dict, kw, result_units)
+        kw["help_dict"] = cache_dict
+        if disk_cache is not None:
+            kw["_disk_cache"] = disk_cache
+            kw["_data_hash"] = hash_arrays(
+                [kw["channel"], kw["segmentation"], kw["mask"]]
+                + [kw[f"channel_{num}"] for num in sorted(self.get_channels_num(), key=str)]
+                + [roi_alternative[name] for name in sorted(roi_alternative)],
+                sorted(roi_alternative),
+                roi.annotations,
+                image.spacing,
+                result_scalar,
+            )
+
+        if workers <= 1:
+            for entry in self.chosen_fields:
+                name = self.name_prefix + entry.name
+                yield name, self._calc_single_field(entry, segmentation_mask_map, cache_dict, kw, result_units)
+            return
+
+        executor = ThreadPoolExecutor(max_workers=workers)
+        try:
+            futures = [
+                (
+                    self.name_prefix + entry.name,
+                    executor.submit(
+                        self._calc_single_field, entry, segmentation_mask_map, cache_dict, kw, result_units
+                    ),
+                )
+                for entry in self.chosen_fields
+            ]
+            for name, future in futures:
+                yield name, future.result()
+        finally:
+            executor.shutdown(wait=True, cancel_futures=True)
 
     def _calc_single_field(
         self,
@@ -712,6 +924,38 @@ def get_main_axis_length(
     return calculate_main_axis(area_array, channel, [x * result_scalar for x in voxel_size])[index]
 
 
+def label_sum(labels: np.ndarray, components: np.ndarray, weights: Optional[np.ndarray] = None) -> np.ndarray:
+    """
+    Calculate number of voxels (or sum of ``weights``) for each of ``components`` in one pass.
+
+    :param labels: array with components labeled by non-negative integers
+    :param components: labels for which values should be returned
+    :param weights: optional array of same shape as labels
+    """
+    if components.size == 0:
+        return np.zeros(0, dtype=np.int64 if weights is None else np.float64)
+    flat = labels.ravel()
+    if flat.dtype == bool:
+        flat = flat.view(np.uint8)
+    res = np.bincount(flat, weights=None if weights is None else weights.ravel(), minlength=int(np.max(components)) + 1)
+    return res[components]
+
+
+def label_mean(labels: np.ndarray, components: np.ndarray, channel: np.ndarray) -> np.ndarray:
+    """Mean of ``channel`` for each of ``components``. 0 for empty components"""
+    counts = label_sum(labels, components)
+    sums = label_sum(labels, components, channel)
+    return np.divide(sums, counts, out=np.zeros(sums.shape, dtype=np.float64), where=counts > 0)
+
+
+def _label_extreme(fun, labels: np.ndarray, components: np.ndarray, channel: np.ndarray) -> np.ndarray:
+    if components.size == 0:
+        return np.zeros(0, dtype=channel.dtype)
+    res = np.asarray(fun(channel, labels.view(np.uint8) if labels.dtype == bool else labels, components))
+    res[label_sum(labels, components) == 0] = 0
+    return res
+
+
 def hash_fun_call_name(
     fun: Union[Callable, MeasurementMethodBase],
     arguments: dict,
@@ -737,6 +981,49 @@ def hash_fun_call_name(
     return f"{fun_name}: {arguments} # {area} & {per_component} * {channel} ^ {components_num}"
 
 
+def shared_geometry(
+    kwargs: dict, fun: Callable, arguments: dict, *args, channel: Optional[Channel] = None, full_data: bool = False
+):
+    """
+    Calculate geometry (like distance transform of mask or its border) used by many measurements only once
+    in measurement calculation. Result is stored in ``help_dict`` from ``kwargs``. Geometry of not cropped data
+    is shared between all components and all per component modes.
+
+    :param kwargs: arguments passed to :py:meth:`MeasurementMethodBase.calculate_property`
+    :param fun: function calculating geometry, called with ``args``
+    :param arguments: parameters of calculation which are not fixed in measurement calculation
+    :param channel: channel number if geometry depends on channel data, None otherwise
+    :param full_data: if measurement do not crop data to component (see :py:meth:`.need_full_data`)
+    """
+    help_dict = kwargs.get("help_dict")
+    if help_dict is None or "_area" not in kwargs:
+        return fun(*args)
+    channel = Channel(-1) if channel is None else channel
+    component_num = kwargs.get("_component_num", NO_COMPONENT)
+    if full_data or kwargs["_area"] != AreaType.ROI or component_num == NO_COMPONENT:
+        hash_name = hash_fun_call_name(fun, arguments, AreaType.Mask, PerComponent.No, channel, NO_COMPONENT)
+    else:
+        hash_name = hash_fun_call_name(
+            fun, arguments, kwargs["_area"], kwargs["_per_component"], channel, component_num
+        )
+    lock = help_dict.key_lock(hash_name) if isinstance(help_dict, MeasurementCache) else nullcontext()
+    with lock:
+        if hash_name not in help_dict:
+            help_dict[hash_name] = fun(*args)
+    return help_dict[hash_name]
+
+
+def _nonzero_slices(array: np.ndarray, margin: Union[int, Sequence[int]] = 0) -> tuple[slice, ...]:
+    """bounding box of nonzero part of ``array`` extended by ``margin`` (whole array if there is nothing)"""
+    objects = ndimage.find_objects((array > 0).astype(np.uint8))
+    if not objects:
+        return tuple(slice(0, size) for size in array.shape)
+    return tuple(
+        slice(max(sl.start - m, 0), min(sl.stop + m, size))
+        for sl, m, size in zip(objects[0], np.broadcast_to(margin, array.ndim), array.shape)
+    )
+
+
 class Volume(MeasurementMethodBase):
     text_info = "Volume", "Calculate volume of current segmentation"
 
@@ -744,6 +1031,12 @@ class Volume(MeasurementMethodBase):
     def calculate_property(cls, area_array, voxel_size, result_scalar, **_):  # pylint: disable=arguments-differ
         return np.count_nonzero(area_array) * pixel_volume(voxel_size, result_scalar)
 
+    @classmethod
+    def calculate_per_label(
+        cls, labels, components, voxel_size, result_scalar, **_
+    ):  # pylint: disable=arguments-differ
+        return label_sum(labels, components) * float(pixel_volume(voxel_size, result_scalar))
+
     @classmethod
     def get_units(cls, ndim):
         return symbols("{}") ** ndim
@@ -756,6 +1049,10 @@ class Voxels(MeasurementMethodBase):
     def calculate_property(cls, area_array, **_):  # pylint: disable=arguments-differ
         return np.count_nonzero(area_array)
 
+    @classmethod
+    def calculate_per_label(cls, labels, components, **_):  # pylint: disable=arguments-differ
+        return label_sum(labels, components)
+
     @classmethod
     def get_units(cls, ndim):
         return symbols("1")
@@ -873,6 +1170,12 @@ class PixelBrightnessSum(MeasurementMethodBase):
                 raise ValueError(f"channel ({channel.shape}) and mask ({area_array.shape}) do not fit each other")
         return np.sum(channel[area_array > 0]) if np.any(area_array) else 0
 
+    @classmethod
+    def calculate_per_label(cls, labels, components, channel, **_):  # pylint: disable=arguments-differ
+        if labels.shape != channel.shape:
+            return None
+        return label_sum(labels, components, channel)
+
     @classmethod
     def get_units(cls, ndim):
         return symbols("Pixel_brightness")
@@ -903,6 +1206,12 @@ class MaximumPixelBrightness(MeasurementMethodBase):
             raise ValueError(f"channel ({channel.shape}) and mask ({area_array.shape}) do not fit each other")
         return np.max(channel[area_array > 0]) if np.any(area_array) else 0
 
+    @classmethod
+    def calculate_per_label(cls, labels, components, channel, **_):  # pylint: disable=arguments-differ
+        if labels.shape != channel.shape:
+            return None
+        return _label_extreme(ndimage.maximum, labels, components, channel)
+
     @classmethod
     def get_units(cls, ndim):
         return symbols("Pixel_brightness")
@@ -921,6 +1230,12 @@ class MinimumPixelBrightness(MeasurementMethodBase):
             raise ValueError("channel and mask do not fit each other")
         return np.min(channel[area_array > 0]) if np.any(area_array) else 0
 
+    @classmethod
+    def calculate_per_label(cls, labels, components, channel, **_):  # pylint: disable=arguments-differ
+        if labels.shape != channel.shape:
+            return None
+        return _label_extreme(ndimage.minimum, labels, components, channel)
+
     @classmethod
     def get_units(cls, ndim):
         return symbols("Pixel_brightness")
@@ -939,6 +1254,12 @@ class MeanPixelBrightness(MeasurementMethodBase):
             raise ValueError("channel and mask do not fit each other")
         return np.mean(channel[area_array > 0]) if np.any(area_array) else 0
 
+    @classmethod
+    def calculate_per_label(cls, labels, components, channel, **_):  # pylint: disable=arguments-differ
+        if labels.shape != channel.shape:
+            return None
+        return label_mean(labels, components, channel)
+
     @classmethod
     def get_units(cls, ndim):
         return symbols("Pixel_brightness")
@@ -978,6 +1299,25 @@ class StandardDeviationOfPixelBrightness(MeasurementMethodBase):
             raise ValueError("channel and mask do not fit each other")
         return np.std(channel[area_array > 0]) if np.any(area_array) else 0
 
+    @classmethod
+    def calculate_per_label(cls, labels, components, channel, **_):  # pylint: disable=arguments-differ
+        if labels.shape != channel.shape:
+            return None
+        if components.size == 0:
+            return np.zeros(0, dtype=np.float64)
+        mean_lut = np.zeros(int(np.max(components)) + 1, dtype=np.float64)
+        mean_lut[components] = label_mean(labels, components, channel)
+        # labels above components maximum land in bins which are not read
+        deviation = (channel - mean_lut[np.minimum(labels, mean_lut.size - 1)]) ** 2
+        counts = label_sum(labels, components)
+        variance = np.divide(
+            label_sum(labels, components, deviation),
+            counts,
+            out=np.zeros(components.shape, dtype=np.float64),
+            where=counts > 0,
+        )
+        return np.sqrt(variance)
+
     @classmethod
     def get_units(cls, ndim):
         return symbols("Pixel_brightness")
@@ -1145,6 +1485,21 @@ class Surface(MeasurementMethodBase):
         return symbols("{}") ** 2
 
 
+def rim_border_mask(mask, distance, units, voxel_size, **kwargs) -> Optional[np.ndarray]:
+    """:py:meth:`BorderRim.border_mask` shared by measurements in one measurement calculation"""
+    if mask is None:
+        return None
+    return shared_geometry(
+        kwargs,
+        BorderRim.border_mask,
+        {"distance": distance, "units": units, "voxel_size": tuple(voxel_size)},
+        mask,
+        distance,
+        units,
+        voxel_size,
+    )
+
+
 class RimVolume(MeasurementMethodBase):
     text_info = "rim volume", "Calculate volumes for elements in radius (in physical units) from mask"
     __argument_class__ = BorderRim.__argument_class__
@@ -1155,12 +1510,24 @@ class RimVolume(MeasurementMethodBase):
 
     @staticmethod
     def calculate_property(area_array, voxel_size, result_scalar, **kwargs):  # pylint: disable=arguments-differ
-        border_mask_array = BorderRim.border_mask(voxel_size=voxel_size, result_scalar=result_scalar, **kwargs)
+        border_mask_array = rim_border_mask(voxel_size=voxel_size, **kwargs)
         if border_mask_array is None:
             return None
         final_mask = np.array((border_mask_array > 0) * (area_array > 0))
         return np.count_nonzero(final_mask) * pixel_volume(voxel_size, result_scalar)
 
+    @classmethod
+    def calculate_per_label(
+        cls, labels, components, voxel_size, result_scalar, **kwargs
+    ):  # pylint: disable=arguments-differ
+        if kwargs.get("_area") == AreaType.ROI:
+            return None
+        border_mask_array = rim_border_mask(voxel_size=voxel_size, **kwargs)
+        if border_mask_array is None or border_mask_array.size != labels.size:
+            return None
+        rim_labels = np.where(border_mask_array.reshape(labels.shape) > 0, labels, 0)
+        return label_sum(rim_labels, components) * float(pixel_volume(voxel_size, result_scalar))
+
     @classmethod
     def get_units(cls, ndim):
         return symbols("{}") ** ndim
@@ -1187,12 +1554,22 @@ class RimPixelBrightnessSum(MeasurementMethodBase):
             if channel.shape[0] != 1:  # pragma: no cover
                 raise ValueError("This measurements do not support time data")
             channel = channel[0]
-        border_mask_array = BorderRim.border_mask(**kwargs)
+        border_mask_array = rim_border_mask(**kwargs)
         if border_mask_array is None:
             return None
         final_mask = np.array((border_mask_array > 0) * (area_array > 0))
         return np.sum(channel[final_mask]) if np.any(final_mask) else 0
 
+    @classmethod
+    def calculate_per_label(cls, labels, components, channel, **kwargs):  # pylint: disable=arguments-differ
+        if kwargs.get("_area") == AreaType.ROI or channel.size != labels.size:
+            return None
+        border_mask_array = rim_border_mask(**kwargs)
+        if border_mask_array is None or border_mask_array.size != labels.size:
+            return None
+        rim_labels = np.where(border_mask_array.reshape(labels.shape) > 0, labels, 0)
+        return label_sum(rim_labels, components, channel.reshape(labels.shape))
+
     @classmethod
     def get_units(cls, ndim):
         return symbols("Pixel_brightness")
@@ -1229,8 +1606,9 @@ class DistanceMaskROI(MeasurementMethodBase):
     @staticmethod
     def calculate_points(channel, area_array, voxel_size, result_scalar, point_type: DistancePoint) -> np.ndarray:
         if point_type == DistancePoint.Border:
-            area_pos = np.transpose(np.nonzero(get_border(area_array))).astype(float)
-            area_pos += 0.5
+            bounds = _nonzero_slices(area_array, margin=1)
+            area_pos = np.transpose(np.nonzero(get_border(area_array[bounds]))).astype(float)
+            area_pos += [sl.start + 0.5 for sl in bounds]
             for i, val in enumerate((x * result_scalar for x in reversed(voxel_size)), start=1):
                 area_pos[:, -i] *= val
         elif point_type == DistancePoint.Mass_center:
@@ -1241,6 +1619,11 @@ class DistanceMaskROI(MeasurementMethodBase):
             area_pos = np.array([af.density_mass_center(area_array > 0, voxel_size) * result_scalar])
         return area_pos
 
+    @classmethod
+    def points_tree(cls, channel, area_array, voxel_size, result_scalar, point_type: DistancePoint) -> cKDTree:
+        """KD-tree of points from :py:meth:`calculate_points` for nearest point queries"""
+        return cKDTree(cls.calculate_points(channel, area_array, voxel_size, result_scalar, point_type))
+
     @classmethod
     def calculate_property(  # pylint: disable=arguments-differ
         cls,
@@ -1260,15 +1643,28 @@ class DistanceMaskROI(MeasurementMethodBase):
             channel = channel[0]
         if not (np.any(mask) and np.any(area_array)):
             return 0
-        mask_pos = cls.calculate_points(channel, mask, voxel_size, result_scalar, distance_from_mask)
+        mask_tree = shared_geometry(
+            kwargs,
+            cls.points_tree,
+            {
+                "method": cls.__name__,
+                "point_type": distance_from_mask,
+                "profile": kwargs.get("profile"),
+                "voxel_size": tuple(voxel_size),
+                "result_scalar": result_scalar,
+            },
+            channel,
+            mask,
+            voxel_size,
+            result_scalar,
+            distance_from_mask,
+            channel=(
+                kwargs.get("channel_num", Channel(-1)) if distance_from_mask != DistancePoint.Border else Channel(-1)
+            ),
+            full_data=cls.need_full_data(),
+        )
         seg_pos = cls.calculate_points(channel, area_array, voxel_size, result_scalar, distance_to_roi)
-        if 1 in {mask_pos.shape[0], seg_pos.shape[0]}:
-            return np.min(cdist(mask_pos, seg_pos))
-
-        min_val = np.inf
-        for i in range(seg_pos.shape[0]):
-            min_val = min(min_val, np.min(cdist(mask_pos, np.array([seg_pos[i]]))))
-        return min_val
+        return np.min(mask_tree.query(seg_pos)[0])
 
     @classmethod
     def get_starting_leaf(cls):
@@ -1327,22 +1723,9 @@ class DistanceROIROI(DistanceMaskROI):
             if channel.shape[0] != 1:
                 raise ValueError("This measurements do not support time data")
             channel = channel[0]
-        try:
-            hash_name = hash_fun_call_name(
-                calculate_segmentation_step,
-                profile,
-                kwargs["_area"],
-                kwargs["_per_component"],
-                Channel(-1),
-                kwargs["_component_num"],
-            )
-            if hash_name in kwargs["help_dict"]:
-                result = kwargs["help_dict"][hash_name]
-            else:
-                result, _ = calculate_segmentation_step(profile, image, mask)
-                kwargs["help_dict"][hash_name] = result
-        except KeyError:
-            result, _ = calculate_segmentation_step(profile, image, mask)
+        result = shared_geometry(
+            kwargs, calculate_segmentation_step, {"profile": profile}, profile, image, mask, full_data=True
+        )[0]
 
         if np.any(result.roi[area_array > 0]):
             return 0
@@ -1355,6 +1738,8 @@ class DistanceROIROI(DistanceMaskROI):
             result_scalar,
             distance_from_mask=distance_from_new_roi,
             distance_to_roi=distance_to_roi,
+            profile=profile,
+            **kwargs,
         )
 
     @staticmethod
@@ -1396,35 +1781,25 @@ class ROINeighbourhoodROI(DistanceMaskROI):
         units: Units,
         **kwargs,
     ):  # pylint: disable=arguments-differ
-        try:
-            hash_name = hash_fun_call_name(
-                calculate_segmentation_step,
-                profile,
-                kwargs["_area"],
-                kwargs["_per_component"],
-                Channel(-1),
-                kwargs["_component_num"],
-            )
-            if hash_name in kwargs["help_dict"]:
-                result = kwargs["help_dict"][hash_name]
-            else:
-                result, _ = calculate_segmentation_step(profile, image, mask)
-                kwargs["help_dict"][hash_name] = result
-        except KeyError:
-            result, _ = calculate_segmentation_step(profile, image, mask)
+        result = shared_geometry(
+            kwargs, calculate_segmentation_step, {"profile": profile}, profile, image, mask, full_data=True
+        )[0]
         area_array = image.fit_array_to_image(area_array)
         units_scalar = UNIT_SCALE[units.value]
         final_radius = [int((distance / units_scalar) / x) for x in reversed(voxel_size)]
 
+        squeezed = (area_array > 0).astype(np.uint8).squeeze()
+        # dilation is limited to bounding box of component extended by radius
+        if len(final_radius) == squeezed.ndim:
+            bounds = _nonzero_slices(squeezed, margin=final_radius[::-1])
+        else:
+            bounds = tuple(slice(0, size) for size in squeezed.shape)
         dilated = SimpleITK.GetArrayFromImage(
-            SimpleITK.BinaryDilate(
-                SimpleITK.GetImageFromArray((area_array > 0).astype(np.uint8).squeeze()), final_radius
-            )
+            SimpleITK.BinaryDilate(SimpleITK.GetImageFromArray(squeezed[bounds]), final_radius)
         )
-        dilated = dilated.reshape(area_array.shape)
-        roi = image.fit_array_to_image(result.roi)
+        roi = image.fit_array_to_image(result.roi).reshape(squeezed.shape)[bounds]
 
-        components = set(np.unique(roi[dilated > 0]))
+        components = set(np.unique(roi[dilated.reshape(roi.shape) > 0]))
         if 0 in components:
             components.remove(0)
 
@@ -1439,6 +1814,24 @@ class SplitOnPartParameters(MaskDistanceSplit.__argument_class__):
     part_selection: int = Field(2, title="Which part (from border)", ge=1, le=1024)
 
 
+def mask_distance_split(mask, num_of_parts, equal_volume, voxel_size, **kwargs) -> np.ndarray:
+    """
+    :py:meth:`MaskDistanceSplit.split` with distance transform and split shared
+    by measurements in one measurement calculation
+    """
+    distance_arr = shared_geometry(
+        kwargs, MaskDistanceSplit.mask_distance, {"voxel_size": tuple(voxel_size)}, mask, voxel_size
+    )
+    return shared_geometry(
+        kwargs,
+        MaskDistanceSplit.split_distance,
+        {"voxel_size": tuple(voxel_size), "num_of_parts": num_of_parts, "equal_volume": equal_volume},
+        distance_arr,
+        num_of_parts,
+        equal_volume,
+    )
+
+
 class SplitOnPartVolume(MeasurementMethodBase):
     text_info = (
         "distance splitting volume",
@@ -1450,10 +1843,22 @@ class SplitOnPartVolume(MeasurementMethodBase):
     def calculate_property(
         part_selection, area_array, voxel_size, result_scalar, **kwargs
     ):  # pylint: disable=arguments-differ
-        masked = MaskDistanceSplit.split(voxel_size=voxel_size, **kwargs)
+        masked = mask_distance_split(voxel_size=voxel_size, **kwargs)
         mask = masked == part_selection
         return np.count_nonzero(mask * area_array) * pixel_volume(voxel_size, result_scalar)
 
+    @classmethod
+    def calculate_per_label(
+        cls, labels, components, part_selection, voxel_size, result_scalar, **kwargs
+    ):  # pylint: disable=arguments-differ
+        if kwargs.get("_area") == AreaType.ROI or kwargs.get("mask") is None:
+            return None
+        masked = mask_distance_split(voxel_size=voxel_size, **kwargs)
+        if masked.size != labels.size:
+            return None
+        part_labels = np.where(masked.reshape(labels.shape) == part_selection, labels, 0)
+        return label_sum(part_labels, components) * float(pixel_volume(voxel_size, result_scalar))
+
     @classmethod
     def get_units(cls, ndim):
         return symbols("{}") ** ndim
@@ -1476,12 +1881,24 @@ class SplitOnPartPixelBrightnessSum(MeasurementMethodBase):
 
     @staticmethod
     def calculate_property(part_selection, channel, area_array, **kwargs):  # pylint: disable=arguments-differ
-        masked = MaskDistanceSplit.split(**kwargs)
+        masked = mask_distance_split(**kwargs)
         mask = np.array(masked == part_selection)
         if channel.ndim - mask.ndim == 1:
             channel = channel[0]
         return np.sum(channel[mask * area_array > 0])
 
+    @classmethod
+    def calculate_per_label(
+        cls, labels, components, part_selection, channel, **kwargs
+    ):  # pylint: disable=arguments-differ
+        if kwargs.get("_area") == AreaType.ROI or kwargs.get("mask") is None or channel.size != labels.size:
+            return None
+        masked = mask_distance_split(**kwargs)
+        if masked.size != labels.size:
+            return None
+        part_labels = np.where(masked.reshape(labels.shape) == part_selection, labels, 0)
+        return label_sum(part_labels, components, channel.reshape(labels.shape))
+
     @classmethod
     def get_units(cls, ndim):
         return symbols("Pixel_brightness")
@@ -1533,6 +1950,190 @@ def _rescale_image(data: np.ndarray):
     return ((data - min_val) / ((max_val - min_val) / 254)).astype(np.uint8)
 
 
+HARALICK_2D_DELTAS = ((0, 1), (1, 1), (1, 0), (1, -1))
+HARALICK_3D_DELTAS = (
+    (1, 0, 0),
+    (1, 1, 0),
+    (0, 1, 0),
+    (1, -1, 0),
+    (0, 0, 1),
+    (1, 0, 1),
+    (0, 1, 1),
+    (1, 1, 1),
+    (1, -1, 1),
+    (1, 0, -1),
+    (0, 1, -1),
+    (1, 1, -1),
+    (1, -1, -1),
+)
+"""co-occurrence directions in same order as in :py:func:`mahotas.features.haralick`"""
+_GRAY_LEVELS = 256
+
+
+def _rescale_per_label(channel: np.ndarray, labels: np.ndarray, max_label: int):
+    """
+    Quantize channel to uint8 for each label separately, in the same way as :py:func:`_rescale_image`
+    does for a component crop with zeroed outside.
+
+    :return: quantized image (0 outside labels) and mask of labels for which it is not possible
+    """
+    index = np.arange(1, max_label + 1)
+    sizes = np.bincount(labels.ravel(), minlength=max_label + 1)[1:]
+    invalid = np.zeros(max_label + 1, dtype=bool)
+    invalid[1:] = sizes == 0
+    mask = labels > 0
+    label_values = labels[mask]
+    values = channel[mask]
+    if channel.dtype == np.uint8 or max_label == 0:
+        direct = np.ones(max_label, dtype=bool)
+    else:
+        # component crop contains zeroed voxels unless component fills whole image
+        has_outside = sizes < labels.size
+        min_val = np.asarray(ndimage.minimum(channel, labels, index), dtype=channel.dtype)
+        max_val = np.asarray(ndimage.maximum(channel, labels, index), dtype=channel.dtype)
+        min_val[has_outside] = np.minimum(min_val[has_outside], 0)
+        max_val[has_outside] = np.maximum(max_val[has_outside], 0)
+        if np.issubdtype(channel.dtype, np.integer):
+            direct = (min_val >= 0) & (max_val < 255)
+        else:
+            direct = np.zeros(max_label, dtype=bool)
+        # zeroed outside is not ignored after shift or scale is not defined
+        invalid[1:] |= ~direct & ((has_outside & (min_val < 0)) | (min_val == max_val))
+    result = np.zeros(values.shape, dtype=np.uint8)
+    scaled = ~direct[label_values - 1] & ~invalid[label_values]
+    kept = direct[label_values - 1] & ~invalid[label_values]
+    result[kept] = values[kept]
+    if np.any(scaled):
+        scaled_labels = label_values[scaled] - 1
+        scale = (max_val - min_val) / 254
+        result[scaled] = ((values[scaled] - min_val[scaled_labels]) / scale[scaled_labels]).astype(np.uint8)
+    quantized = np.zeros(labels.shape, dtype=np.uint8)
+    quantized[mask] = result
+    return quantized, invalid
+
+
+def _label_cooccurrence(quantized: np.ndarray, labels: np.ndarray, delta: Sequence[int], max_label: int):
+    """
+    Co-occurrence pairs of all labels for one direction, ignoring zeros.
+    As matrices are symmetric, only pairs with first level not greater than second one are stored.
+
+    :return: sparse entries as arrays of label, lower level, higher level and number of voxel pairs
+    """
+    src, dst = [], []
+    for offset, size in zip(delta, labels.shape):
+        src.append(slice(max(-offset, 0), size - max(offset, 0)))
+        dst.append(slice(max(offset, 0), size + min(offset, 0)))
+    first, second = quantized[tuple(src)], quantized[tuple(dst)]
+    first_labels = labels[tuple(src)]
+    valid = (first_labels == labels[tuple(dst)]) & (first > 0) & (second > 0)
+    first, second = first[valid], second[valid]
+    key = first_labels[valid].astype(np.int64) * _GRAY_LEVELS
+    key += np.minimum(first, second)
+    key *= _GRAY_LEVELS
+    key += np.maximum(first, second)
+    key_num = (max_label + 1) * _GRAY_LEVELS * _GRAY_LEVELS
+    if key_num <= 4 * key.size:
+        counts = np.bincount(key, minlength=key_num)
+        key = np.flatnonzero(counts)
+        counts = counts[key]
+    else:
+        key, counts = np.unique(key, return_counts=True)
+    return key // (_GRAY_LEVELS * _GRAY_LEVELS), (key // _GRAY_LEVELS) % _GRAY_LEVELS, key % _GRAY_LEVELS, counts
+
+
+def _entropy_rows(prob: np.ndarray) -> np.ndarray:
+    return -np.sum(prob * np.log2(np.where(prob > 0, prob, 1)), axis=1)
+
+
+def _haralick_from_cooccurrence(entries, max_label: int, levels: np.ndarray) -> np.ndarray:
+    """
+    All 13 Haralick features (as in :py:func:`mahotas.features.haralick`) for all labels.
+
+    :param entries: sparse co-occurrence matrices from :py:func:`_label_cooccurrence`
+    :param levels: size of co-occurrence matrix of each label (maximum gray level plus one)
+    :return: array of shape (max_label + 1, 13), NaN for labels without any pair
+    """
+    label, low, high, counts = entries
+    size = max_label + 1
+    # off diagonal entry represents two cells of symmetric matrix, diagonal one is counted twice
+    off_diagonal = low != high
+    multiplicity = np.where(off_diagonal, 2, 1)
+
+    def label_sum_(weights):
+        return np.bincount(label, weights=multiplicity * weights, minlength=size)
+
+    def marginal(pos, length, weights):
+        return np.bincount(label * length + pos, weights=weights, minlength=size * length).reshape(size, length)
+
+    total = np.bincount(label, weights=2 * counts, minlength=size)
+    empty = total == 0
+    prob = np.where(off_diagonal, counts, 2 * counts) / total[label]
+    diff = high - low
+    plus = high + low
+    px = marginal(low, _GRAY_LEVELS, prob) + marginal(high, _GRAY_LEVELS, np.where(off_diagonal, prob, 0))
+    p_plus = marginal(plus, 2 * _GRAY_LEVELS, multiplicity * prob)
+    p_minus = marginal(diff, _GRAY_LEVELS, multiplicity * prob)
+    gray = np.arange(_GRAY_LEVELS)
+    ux = px @ gray
+    vx = px @ gray**2 - ux**2
+
+    res = np.empty((size, len(HARALIC_FEATURES)), dtype=np.float64)
+    res[:, 0] = label_sum_(prob * prob)
+    res[:, 1] = label_sum_(diff**2 * prob)
+    res[:, 2] = np.divide(label_sum_(low * high * prob) - ux**2, vx, out=np.ones(size), where=vx > 0)
+    res[:, 3] = vx
+    res[:, 4] = label_sum_(prob / (1 + diff**2))
+    res[:, 5] = label_sum_(plus * prob)
+    res[:, 6] = label_sum_(plus**2 * prob) - res[:, 5] ** 2
+    res[:, 7] = _entropy_rows(p_plus)
+    res[:, 8] = -label_sum_(prob * np.log2(prob))
+    res[:, 9] = np.sum(p_minus**2, axis=1) / levels - (np.sum(p_minus, axis=1) / levels) ** 2
+    res[:, 10] = _entropy_rows(p_minus)
+    hx = _entropy_rows(px)
+    hxy1 = -label_sum_(prob * np.log2(px[label, low] * px[label, high]))
+    hxy2 = 2 * hx * px.sum(axis=1)
+    res[:, 11] = np.divide(res[:, 8] - hxy1, hx, out=res[:, 8] - hxy1, where=hx != 0)
+    res[:, 12] = np.sqrt(np.maximum(0, 1 - np.exp(-2 * (hxy2 - res[:, 8]))))
+    res[empty] = np.nan
+    return res
+
+
+def haralick_per_label(channel: np.ndarray, labels: np.ndarray, distance: int = 1) -> np.ndarray:
+    """
+    Calculate Haralick features for all components of ``labels`` at once.
+    Result for each component is same as result of :py:meth:`Haralick.calculate_haralick`
+    called on component crop. Co-occurrence matrices of all components are collected in one pass over image
+    for each direction and all features are calculated from them.
+
+    :param channel: channel data, same shape as labels
+    :param labels: array with components labeled by non-negative integers
+    :param distance: distance between voxels of co-occurrence pair
+    :return: array of shape (labels.max() + 1, 13) with features mean over directions.
+        Rows of components for which features cannot be calculated this way are NaN.
+    """
+    labels = labels.squeeze()
+    channel = channel.reshape(labels.shape)
+    if labels.ndim == 2:
+        deltas = HARALICK_2D_DELTAS
+    elif labels.ndim == 3:
+        deltas = HARALICK_3D_DELTAS
+    else:
+        raise ValueError(f"Haralick features could be calculated only for 2D and 3D images, not {labels.ndim}D")
+    if labels.dtype == bool:
+        labels = labels.view(np.uint8)
+    max_label = int(labels.max(initial=0))
+    quantized, invalid = _rescale_per_label(channel, labels, max_label)
+    levels = ndimage.maximum(quantized, labels, np.arange(max_label + 1)).astype(np.float64) + 1
+    res = np.zeros((max_label + 1, len(HARALIC_FEATURES)), dtype=np.float64)
+    for delta in deltas:
+        entries = _label_cooccurrence(quantized, labels, [x * distance for x in delta], max_label)
+        res += _haralick_from_cooccurrence(entries, max_label, levels)
+    res /= len(deltas)
+    res[invalid] = np.nan
+    res[0] = np.nan
+    return res
+
+
 class HaralickParameters(BaseModel):
     feature: HaralickEnum = HaralickEnum.AngularSecondMoment
     distance: int = Field(1, ge=1, le=10)
@@ -1571,6 +2172,49 @@ class Haralick(MeasurementMethodBase):
         res = cls.calculate_haralick(channel, area_array, distance)
         return res[feature.index()]
 
+    @classmethod
+    def calculate_per_label(  # pylint: disable=arguments-differ
+        cls, labels, components, channel, distance, feature, _cache=False, **kwargs
+    ):
+        if isinstance(feature, str):
+            feature = HaralickEnum(feature)
+        if labels.shape != channel.shape or labels.squeeze().ndim not in {2, 3}:
+            return None
+        if _cache and "_area" in kwargs and "_per_component" in kwargs:
+            help_dict: dict = kwargs["help_dict"]
+            _per_component: PerComponent = kwargs["_per_component"]
+            if _per_component == PerComponent.Mean:
+                _per_component = PerComponent.Yes
+            hash_name = hash_fun_call_name(
+                haralick_per_label,
+                {"distance": distance},
+                kwargs["_area"],
+                _per_component,
+                kwargs["channel_num"],
+                NO_COMPONENT,
+            )
+            lock = help_dict.key_lock(hash_name) if isinstance(help_dict, MeasurementCache) else nullcontext()
+            with lock:
+                if hash_name not in help_dict:
+                    help_dict[hash_name] = haralick_per_label(channel, labels, distance)
+            features = help_dict[hash_name]
+        else:
+            features = haralick_per_label(channel, labels, distance)
+        if components.size and components.max() >= features.shape[0]:
+            return None
+        result = features[components, feature.index()]
+        if np.any(missing := np.isnan(result)):
+            # components which cannot be calculated at once are calculated on their crops
+            objects = ndimage.find_objects(labels.view(np.uint8) if labels.dtype == bool else labels)
+            for i in np.flatnonzero(missing):
+                if components[i] == 0 or objects[components[i] - 1] is None:
+                    return None
+                bounds = tuple(slice(max(x.start - 1, 0), x.stop + 1) for x in objects[components[i] - 1])
+                result[i] = cls.calculate_haralick(channel[bounds], labels[bounds] == components[i], distance)[
+                    feature.index()
+                ]
+        return result
+
     @staticmethod
     def calculate_haralick(channel, area_array, distance):
         data = channel.copy()
@@ -10,13 +10,14 @@ import numpy as np
 import tifffile
 
 from PartSegCore.algorithm_describe_base import AlgorithmProperty, Register
+from PartSegCore.analysis.chunked_project import save_chunked_project
 from PartSegCore.analysis.io_utils import ProjectTuple, project_version_info
 from PartSegCore.io_utils import NotSupportedImage, SaveBase, SaveMaskAsTiff, SaveROIAsNumpy, SaveROIAsTIFF, get_tarinfo
 from PartSegCore.json_hooks import PartSegEncoder
 from PartSegCore.project_info import HistoryElement
 from PartSegCore.roi_info import ROIInfo
 from PartSegCore.universal_const import UNIT_SCALE, Units
-from PartSegImage import Channel, Image, ImageWriter
+from PartSegImage import Channel, Image, ImageDescriptor, ImageWriter
 
 __all__ = [
     "SaveAsNumpy",
@@ -24,6 +25,7 @@ __all__ = [
     "SaveCmap",
     "SaveProfilesToJSON",
     "SaveProject",
+    "SaveProjectChunked",
     "SaveXYZ",
     "save_dict",
 ]
@@ -42,6 +44,25 @@ def save_project(
     ext = os.path.splitext(file_path)[1]
     tar_mod = "w:bz2" if ext.lower() in [".bz2", ".tbz2"] else "w:gz"
     with tarfile.open(file_path, tar_mod) as tar:
+        # metadata are stored first, so they could be read without decompressing whole archive
+        meta_str = json.dumps(
+            {
+                "project_version_info": str(project_version_info),
+                "roi_annotations": roi_info.annotations,
+                "image": ImageDescriptor.from_image(image).as_dict(),
+                "roi_shape": roi_info.roi.shape,
+                "roi_components": len(roi_info.bound_info),
+                "has_mask": mask is not None,
+            },
+            cls=PartSegEncoder,
+        )
+        meta_buff = BytesIO(meta_str.encode("utf-8"))
+        tar_meta = get_tarinfo("metadata.json", meta_buff)
+        tar.addfile(tar_meta, meta_buff)
+        para_str = json.dumps(algorithm_parameters, cls=PartSegEncoder)
+        parameters_buff = BytesIO(para_str.encode("utf-8"))
+        tar_algorithm = get_tarinfo("algorithm.json", parameters_buff)
+        tar.addfile(tar_algorithm, parameters_buff)
         segmentation_buff = BytesIO()
         # noinspection PyTypeChecker
         tifffile.imwrite(segmentation_buff, roi_info.roi)
@@ -64,17 +85,6 @@ def save_project(
         ImageWriter.save(image, image_buff, compression=None)
         tar_image = get_tarinfo("image.tif", image_buff)
         tar.addfile(tarinfo=tar_image, fileobj=image_buff)
-        para_str = json.dumps(algorithm_parameters, cls=PartSegEncoder)
-        parameters_buff = BytesIO(para_str.encode("utf-8"))
-        tar_algorithm = get_tarinfo("algorithm.json", parameters_buff)
-        tar.addfile(tar_algorithm, parameters_buff)
-        meta_str = json.dumps(
-            {"project_version_info": str(project_version_info), "roi_annotations": roi_info.annotations},
-            cls=PartSegEncoder,
-        )
-        meta_buff = BytesIO(meta_str.encode("utf-8"))
-        tar_meta = get_tarinfo("metadata.json", meta_buff)
-        tar.addfile(tar_meta, meta_buff)
         el_info = []
         for i, el in enumerate(history):
             el_info.append(
@@ -86,10 +96,10 @@ def save_project(
                     "annotations": el.annotations,
                 }
             )
-            el.arrays.seek(0)
-            hist_info = get_tarinfo(f"history/arrays_{i}.npz", el.arrays)
-            el.arrays.seek(0)
-            tar.addfile(hist_info, el.arrays)
+            arrays = el.get_arrays_buffer()
+            hist_info = get_tarinfo(f"history/arrays_{i}.npz", arrays)
+            arrays.seek(0)
+            tar.addfile(hist_info, arrays)
         if el_info:
             hist_str = json.dumps(el_info, cls=PartSegEncoder)
             hist_buff = BytesIO(hist_str.encode("utf-8"))
@@ -189,6 +199,36 @@ class SaveProject(SaveBase):
         )
 
 
+class SaveProjectChunked(SaveBase):
+    """
+    Save project in chunked format (see :py:mod:`PartSegCore.analysis.chunked_project`).
+    Arrays are compressed with zstd in thread pool, so it is much faster than :py:class:`SaveProject`.
+    """
+
+    @classmethod
+    def get_name(cls):
+        return "Chunked project (*.psz)"
+
+    @classmethod
+    def get_short_name(cls):
+        return "project_chunked"
+
+    @classmethod
+    def get_fields(cls):
+        return []
+
+    @classmethod
+    def save(
+        cls,
+        save_location: typing.Union[str, Path],
+        project_info: ProjectTuple,
+        parameters: typing.Optional[dict] = None,
+        range_changed=None,
+        step_changed=None,
+    ):
+        save_chunked_project(save_location, project_info)
+
+
 class SaveCmap(SaveBase):
     @classmethod
     def get_name(cls):
@@ -410,6 +450,7 @@ class SavePipelineToJSON(SaveProject):
 
 save_dict = Register(
     SaveProject,
+    SaveProjectChunked,
     SaveCmap,
     SaveXYZ,
     SaveAsTiff,
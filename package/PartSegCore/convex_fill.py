@@ -1,6 +1,12 @@
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional
+
 import numpy as np
 from scipy.spatial import ConvexHull
 
+from PartSegCore.image_operations import get_default_workers
+from PartSegCore.roi_info import label_statistics
+
 try:
     from scipy.spatial import QhullError
 except ImportError:
@@ -30,23 +36,42 @@ def check(p1, p2, idxs):
     return idxs[1] * sign <= max_col_idx * sign
 
 
-def create_polygon(shape, vertices):
+def polygon_rows(shape, vertices):
     """
-    Creates np.array with dimensions defined by shape
-    Fills polygon defined by vertices with ones, all other values zero"""
-    idxs = np.indices(shape)  # Create 3D array of indices
-    base_array = np.zeros(shape, dtype=float)  # Initialize your array of zeros
-
-    fill = np.ones(base_array.shape) * True  # Initialize boolean array defining shape fill
+    Scanline version of :py:func:`create_polygon`.
+    Each edge of polygon limits columns of every row from one side,
+    so polygon is described by lower and upper column bound of each row.
 
-    # Create check array for each edge segment, combine into fill array
+    :return: lower and upper bound (inclusive) of columns inside polygon for each row
+    """
+    rows = np.arange(shape[0], dtype=float)
+    lower = np.zeros(shape[0])
+    upper = np.full(shape[0], shape[1] - 1, dtype=float)
+    vertices = vertices.astype(float)
     for k in range(vertices.shape[0]):
-        fill = np.all([fill, check(vertices[k - 1], vertices[k], idxs)], axis=0)
+        p1, p2 = vertices[k - 1], vertices[k]
+        # the same formula as in check function
+        if p1[0] == p2[0]:
+            max_col_idx = (rows - p1[0]) * shape[0]
+            sign = np.sign(p2[1] - p1[1])
+        else:
+            max_col_idx = (rows - p1[0]) / (p2[0] - p1[0]) * (p2[1] - p1[1]) + p1[1]
+            sign = np.sign(p2[0] - p1[0])
+        if sign > 0:
+            upper = np.minimum(upper, np.floor(max_col_idx))
+        elif sign < 0:
+            lower = np.maximum(lower, np.ceil(max_col_idx))
+    return lower, upper
 
-    # Set all values inside polygon to one
-    base_array[fill] = 1
 
-    return base_array
+def create_polygon(shape, vertices):
+    """
+    Creates np.array with dimensions defined by shape
+    Fills polygon defined by vertices with ones, all other values zero"""
+    lower, upper = polygon_rows(shape, vertices)
+    columns = np.arange(shape[1])
+    fill = (columns >= lower[:, np.newaxis]) & (columns <= upper[:, np.newaxis])
+    return fill.astype(float)
 
 
 def _convex_fill(array: np.ndarray):
@@ -62,37 +87,56 @@ def _convex_fill(array: np.ndarray):
         return None
 
 
-def convex_fill(array: np.ndarray):
+def _fill_component(array: np.ndarray, cut_area: tuple[slice, ...], num: int) -> np.ndarray:
+    """Mask of convex hull of component ``num`` in ``cut_area`` (calculated for each layer in 3d)"""
+    component = array[cut_area] == num
+    if array.ndim == 2:
+        res = _convex_fill(component)
+        return component if res is None else res > 0
+    fill = np.zeros(component.shape, dtype=bool)
+    for j, layer in enumerate(component):
+        res = _convex_fill(layer)
+        if res is not None:
+            fill[j] = res > 0
+    return fill
+
+
+def convex_fill(array: np.ndarray, workers: Optional[int] = None):
+    """
+    Replace each component of labeled array with its convex hull (for 3d array in each layer separately).
+    Components are processed in order of labels, so convex hull of component could cover component with bigger label.
+
+    Bounding boxes of components are calculated in one pass,
+    and convex hulls are calculated inside bounding boxes in thread pool.
+
+    :param array: labeled array, modified in place
+    :param workers: number of threads, default from :py:func:`PartSegCore.image_operations.set_default_workers`
+    """
     arr_shape = array.shape
     array = np.squeeze(array)
     if array.ndim not in [2, 3]:
         raise ValueError("Convex hull support only 2 and 3 dimension images")
-    components = np.bincount(array.flat)
-    for i in range(1, components.size):
-        if components[i] == 0:
+    statistics = label_statistics(array)
+    components = [(num, tuple(bound.get_slices())) for num, bound in sorted(statistics.bound_info.items())]
+
+    def _fill(component: tuple[int, tuple[slice, ...]]) -> np.ndarray:
+        return _fill_component(array, component[1], component[0])
+
+    workers = min(workers or get_default_workers(), len(components))
+    if workers > 1:
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            fills = list(executor.map(_fill, components))
+    else:
+        fills = [_fill(component) for component in components]
+
+    for (num, cut_area), fill in zip(components, fills):
+        if np.count_nonzero(array[cut_area] == num) == statistics.sizes[num]:
+            array[cut_area][fill] = num
             continue
-        component: np.ndarray = array == i
-        points = np.nonzero(component)
-        if len(points) == 0 or len(points[0]) == 0:  # pylint: disable=consider-using-in
+        # part of component is covered by convex hull of previous component
+        points = np.nonzero(array[cut_area] == num)
+        if len(points[0]) == 0:
             continue
-        lower_bound = np.min(points, axis=1)
-        upper_bound = np.max(points, axis=1)
-        cut_area = tuple(slice(x, y + 1) for x, y in zip(lower_bound, upper_bound))
-        if array.ndim == 3:
-            cut_area = (slice(None),) + cut_area[1:]
-        component = component[cut_area]
-        if array.ndim == 2:
-            res = _convex_fill(component)
-            if res is None:
-                continue
-            array[cut_area][res > 0] = i
-        elif array.ndim == 3:
-            for j in range(lower_bound[0], upper_bound[0] + 1):
-                res = _convex_fill(component[j])
-                if res is None:
-                    continue
-                new_cut = (j,) + cut_area[1:]
-                tmp = array[new_cut]
-                tmp[res > 0] = i
-                array[new_cut] = tmp
+        new_cut = tuple(slice(sl.start + np.min(x), sl.start + np.max(x) + 1) for sl, x in zip(cut_area, points))
+        array[new_cut][_fill_component(array, new_cut, num)] = num
     return array.reshape(arr_shape)
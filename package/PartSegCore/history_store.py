@@ -0,0 +1,212 @@
+"""
+This module contains storage for arrays of :py:class:`PartSegCore.project_info.HistoryElement`.
+
+Snapshot of ROI, its alternatives and mask is compressed in background thread,
+so creation of history element does not block caller.
+When total size of compressed snapshots kept in memory exceeds memory budget,
+the oldest snapshots are moved to files in temporary directory.
+If ROI differs from ROI of previous snapshot only in small part,
+then only list of changed voxels is stored (if it is smaller than compressed ROI).
+"""
+
+import os
+import shutil
+import tempfile
+import threading
+import weakref
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from io import BytesIO
+from itertools import count
+from typing import Optional
+
+import numpy as np
+
+DEFAULT_MEMORY_BUDGET = 2**28
+MAX_DIFF_CHAIN = 16
+"""maximum number of sparse diffs which need to be applied to reconstruct ROI"""
+ROI_DIFF_INDEX = "roi_diff_index"
+ROI_DIFF_VALUES = "roi_diff_values"
+
+
+def _compress(arrays: dict[str, np.ndarray]) -> bytes:
+    buffer = BytesIO()
+    np.savez_compressed(buffer, **arrays)
+    return buffer.getvalue()
+
+
+def _decompress(data: bytes) -> dict[str, np.ndarray]:
+    with np.load(BytesIO(data)) as npz_file:
+        return dict(npz_file.items())
+
+
+def _remove_file(path: str):
+    if os.path.exists(path):
+        os.remove(path)
+
+
+class HistorySnapshot:
+    """
+    Compressed arrays of one history element. Should be created with :py:meth:`HistoryStore.add`.
+
+    Until compression finish, the snapshot keeps copy of arrays.
+    """
+
+    def __init__(self, store: "HistoryStore", arrays: dict[str, np.ndarray], previous: Optional["HistorySnapshot"]):
+        self._store = store
+        self._arrays: Optional[dict[str, np.ndarray]] = arrays
+        self._data: Optional[bytes] = None
+        self._path: Optional[str] = None
+        self._previous: Optional[HistorySnapshot] = None
+        self.chain_length = 0
+        self._lock = threading.Lock()
+        self._future: Future = store._submit(self._compress_arrays, previous)
+
+    def _compress_arrays(self, previous: Optional["HistorySnapshot"]):
+        arrays = self._arrays
+        data = _compress(arrays)
+        if previous is not None and previous.chain_length < MAX_DIFF_CHAIN:
+            previous_roi = previous.get_arrays()["roi"]
+            roi = arrays["roi"]
+            if previous_roi.shape == roi.shape and previous_roi.dtype == roi.dtype:
+                changed = np.flatnonzero(previous_roi != roi)
+                if changed.size * (changed.itemsize + roi.itemsize) < len(data):
+                    diff_arrays = {name: array for name, array in arrays.items() if name != "roi"}
+                    diff_arrays[ROI_DIFF_INDEX] = changed
+                    diff_arrays[ROI_DIFF_VALUES] = roi.flat[changed]
+                    diff_data = _compress(diff_arrays)
+                    if len(diff_data) < len(data):
+                        data = diff_data
+                        self._previous = previous
+                        self.chain_length = previous.chain_length + 1
+        with self._lock:
+            self._data = data
+            self._arrays = None
+        self._store._register(self, len(data))
+
+    def _spill(self, path: str):
+        with self._lock:
+            if self._data is None:
+                return
+            with open(path, "wb") as f_p:
+                f_p.write(self._data)
+            self._path = path
+            self._data = None
+            weakref.finalize(self, _remove_file, path)
+
+    def _read_data(self) -> bytes:
+        self._future.result()
+        with self._lock:
+            if self._data is not None:
+                return self._data
+            with open(self._path, "rb") as f_p:
+                return f_p.read()
+
+    @property
+    def ready(self) -> bool:
+        """If background compression is finished"""
+        return self._future.done()
+
+    @property
+    def is_diff(self) -> bool:
+        """If ROI is stored as difference to previous snapshot"""
+        self._future.result()
+        return self._previous is not None
+
+    @property
+    def in_memory(self) -> bool:
+        """If compressed data is kept in memory (not in file)"""
+        self._future.result()
+        return self._path is None
+
+    def get_arrays(self) -> dict[str, np.ndarray]:
+        """Stored arrays. ROI is stored under ``roi`` key, mask (if present) under ``mask``."""
+        with self._lock:
+            arrays = self._arrays
+        if arrays is not None:
+            return {name: np.copy(array) for name, array in arrays.items()}
+        arrays = _decompress(self._read_data())
+        if self._previous is not None:
+            roi = self._previous.get_arrays()["roi"]
+            roi.flat[arrays.pop(ROI_DIFF_INDEX)] = arrays.pop(ROI_DIFF_VALUES)
+            arrays = {"roi": roi, **arrays}
+        return arrays
+
+    def get_buffer(self) -> BytesIO:
+        """Buffer with npz file containing all arrays (without differences)"""
+        if self.is_diff:
+            return BytesIO(_compress(self.get_arrays()))
+        return BytesIO(self._read_data())
+
+    def wait(self):
+        """Wait until compression finish"""
+        self._future.result()
+
+
+class HistoryStore:
+    """
+    Storage of history snapshots.
+
+    :param int memory_budget: maximum size (in bytes) of compressed snapshots kept in memory.
+    :param Optional[str] directory: directory for snapshots exceeding memory budget.
+        If not provided, then temporary directory is created when needed.
+    """
+
+    def __init__(self, memory_budget: int = DEFAULT_MEMORY_BUDGET, directory: Optional[str] = None):
+        self.memory_budget = memory_budget
+        self._directory = directory
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="history")
+        self._lock = threading.Lock()
+        self._in_memory: OrderedDict[int, tuple[weakref.ref, int]] = OrderedDict()
+        self._memory_size = 0
+        self._counter = count()
+
+    def _submit(self, fun, *args) -> Future:
+        return self._executor.submit(fun, *args)
+
+    @property
+    def directory(self) -> str:
+        if self._directory is None:
+            self._directory = tempfile.mkdtemp(prefix="partseg_history_")
+            weakref.finalize(self, shutil.rmtree, self._directory, ignore_errors=True)
+        return self._directory
+
+    @property
+    def memory_size(self) -> int:
+        """Size of compressed snapshots kept in memory"""
+        return self._memory_size
+
+    def add(self, arrays: dict[str, np.ndarray], previous: Optional[HistorySnapshot] = None) -> HistorySnapshot:
+        """
+        Create snapshot of arrays. Compression is done in background.
+
+        :param arrays: arrays to store, ``roi`` key is required
+        :param previous: previous snapshot. If provided, ROI could be stored as difference to it.
+        """
+        if previous is not None and previous._store is not self:  # pylint: disable=protected-access
+            previous = None
+        return HistorySnapshot(self, {name: np.copy(array) for name, array in arrays.items()}, previous)
+
+    def _register(self, snapshot: HistorySnapshot, size: int):
+        key = next(self._counter)
+        to_spill = []
+        with self._lock:
+            self._in_memory[key] = (weakref.ref(snapshot, lambda _ref: self._forget(key)), size)
+            self._memory_size += size
+            while self._memory_size > self.memory_budget and self._in_memory:
+                old_key, (ref, old_size) = self._in_memory.popitem(last=False)
+                self._memory_size -= old_size
+                to_spill.append((old_key, ref))
+        for old_key, ref in to_spill:
+            if (old_snapshot := ref()) is not None:
+                old_snapshot._spill(  # pylint: disable=protected-access
+                    os.path.join(self.directory, f"snapshot_{old_key}.npz")
+                )
+
+    def _forget(self, key: int):
+        with self._lock:
+            if key in self._in_memory:
+                self._memory_size -= self._in_memory.pop(key)[1]
+
+
+default_history_store = HistoryStore()
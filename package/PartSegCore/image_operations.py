@@ -1,6 +1,8 @@
+import os
 from collections.abc import Iterable
+from concurrent.futures import ThreadPoolExecutor
 from enum import Enum
-from typing import Union
+from typing import Optional, Union
 
 import numpy as np
 import SimpleITK as sitk
@@ -32,7 +34,25 @@ class NoiseFilterType(Enum):
         return self.name
 
 
-def _generic_image_operation(image, radius, fun, layer):
+_default_workers = os.cpu_count() or 1
+
+
+def set_default_workers(workers: Optional[int]):
+    """
+    Set number of threads used for filtering of separate layers (and time points) of image.
+
+    :param workers: number of threads. ``None`` means number of CPU.
+    """
+    global _default_workers  # noqa: PLW0603  # pylint: disable=global-statement
+    _default_workers = max(workers or os.cpu_count() or 1, 1)
+
+
+def get_default_workers() -> int:
+    """Number of threads used for filtering of separate layers of image"""
+    return _default_workers
+
+
+def _generic_image_operation(image, radius, fun, layer, workers: Optional[int] = None):
     if image.ndim == 3 and image.shape[0] == 1:
         layer = True
     if image.ndim == 2:
@@ -43,66 +63,85 @@ def _generic_image_operation(image, radius, fun, layer):
         radius = list(reversed(radius))
     if not layer and image.ndim <= 3:
         return sitk.GetArrayFromImage(fun(sitk.GetImageFromArray(image), radius))
-    return _generic_image_operations_recurse(np.copy(image), radius, fun, layer)
+    return _generic_image_operations_parallel(image, radius, fun, layer, workers)
 
 
-def _generic_image_operations_recurse(image, radius, fun, layer):
-    if (not layer and image.ndim == 3) or image.ndim == 2:
-        return sitk.GetArrayFromImage(fun(sitk.GetImageFromArray(image), radius))
+def _generic_image_operations_parallel(image, radius, fun, layer, workers: Optional[int] = None):
+    """
+    Apply operation on each layer (or each stack for ``layer=False``) of image.
+    SimpleITK releases GIL, so layers are processed in thread pool.
+    Results are written to preallocated array of the same type as ``image``, input is not modified.
+    """
+    base_ndim = 2 if layer else 3
+    out = np.empty_like(image)
+    indices = list(np.ndindex(image.shape[:-base_ndim]))
 
-    for layer_data in image:
-        layer_data[...] = _generic_image_operations_recurse(layer_data, radius, fun, layer)
-    return image
+    def _process(index):
+        out[index] = sitk.GetArrayFromImage(fun(sitk.GetImageFromArray(image[index]), radius))
+
+    workers = min(workers or _default_workers, len(indices))
+    if workers <= 1:
+        for index in indices:
+            _process(index)
+        return out
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        # list is used to propagate exceptions
+        list(executor.map(_process, indices))
+    return out
 
 
-def gaussian(image: np.ndarray, radius: float, layer=True):
+def gaussian(image: np.ndarray, radius: float, layer=True, workers: Optional[int] = None):
     """
     Gaussian blur of image.
 
     :param np.ndarray image: image to apply gaussian filter
     :param float radius: radius for gaussian kernel
     :param bool layer: if operation should be run on each layer separately
+    :param workers: number of threads used for processing layers, default from :py:func:`set_default_workers`
     :return:
     """
-    return _generic_image_operation(image, radius, sitk.DiscreteGaussian, layer)
+    return _generic_image_operation(image, radius, sitk.DiscreteGaussian, layer, workers)
 
 
-def bilateral(image: np.ndarray, radius: float, layer=True):
+def bilateral(image: np.ndarray, radius: float, layer=True, workers: Optional[int] = None):
     """
     Gaussian blur of image.
 
     :param np.ndarray image: image to apply gaussian filter
     :param float radius: radius for gaussian kernel
     :param bool layer: if operation should be run on each layer separately
+    :param workers: number of threads used for processing layers, default from :py:func:`set_default_workers`
     :return:
     """
-    return _generic_image_operation(image, radius, sitk.Bilateral, layer)
+    return _generic_image_operation(image, radius, sitk.Bilateral, layer, workers)
 
 
-def median(image: np.ndarray, radius: Union[int, list[int]], layer=True):
+def median(image: np.ndarray, radius: Union[int, list[int]], layer=True, workers: Optional[int] = None):
     """
     Median blur of image.
 
     :param np.ndarray image: image to apply median filter
     :param float radius: radius for median kernel
     :param bool layer: if operation should be run on each layer separately
+    :param workers: number of threads used for processing layers, default from :py:func:`set_default_workers`
     :return:
     """
     if not isinstance(radius, Iterable):
         radius = [radius] * min(image.ndim, 2 if layer else 3)
-    return _generic_image_operation(image, radius, sitk.Median, layer)
+    return _generic_image_operation(image, radius, sitk.Median, layer, workers)
 
 
-def dilate(image, radius, layer=True):
+def dilate(image, radius, layer=True, workers=None):
     """
     Dilate of image.
 
     :param image: image to apply dilation
     :param radius: dilation radius
     :param layer: if operation should be run on each layer separately
+    :param workers: number of threads used for processing layers, default from :py:func:`set_default_workers`
     :return:
     """
-    return _generic_image_operation(image, radius, sitk.GrayscaleDilate, layer)
+    return _generic_image_operation(image, radius, sitk.GrayscaleDilate, layer, workers)
 
 
 def apply_filter(filter_type, image, radius, layer=True) -> np.ndarray:
@@ -123,16 +162,17 @@ def apply_filter(filter_type, image, radius, layer=True) -> np.ndarray:
     return image
 
 
-def erode(image, radius, layer=True):
+def erode(image, radius, layer=True, workers=None):
     """
     Erosion of image
 
     :param image: image to apply erosion
     :param radius: erosion radius
     :param layer: if operation should be run on each layer separately
+    :param workers: number of threads used for processing layers, default from :py:func:`set_default_workers`
     :return:
     """
-    return _generic_image_operation(image, radius, sitk.GrayscaleErode, layer)
+    return _generic_image_operation(image, radius, sitk.GrayscaleErode, layer, workers)
 
 
 def to_binary_image(image):
@@ -9,6 +9,7 @@ from enum import Enum
 from io import BufferedIOBase, BytesIO, IOBase, RawIOBase, StringIO, TextIOBase
 from pathlib import Path
 from tarfile import TarFile, TarInfo
+from tarfile import open as tar_open
 
 import imageio
 import numpy as np
@@ -20,7 +21,7 @@ from PartSegCore.algorithm_describe_base import AlgorithmDescribeBase, Algorithm
 from PartSegCore.json_hooks import partseg_object_hook
 from PartSegCore.project_info import ProjectInfoBase
 from PartSegCore.utils import EventedDict, ProfileDict, check_loaded_dict, iterate_names
-from PartSegImage import ImageWriter
+from PartSegImage import ImageDescriptor, ImageWriter
 from PartSegImage.image import minimal_dtype
 
 
@@ -320,11 +321,83 @@ class SaveMaskAsTiff(SaveBase):
 
 
 def tar_to_buff(tar_file, member_name) -> BytesIO:
-    tar_value = tar_file.extractfile(tar_file.getmember(member_name))
-    buffer = BytesIO()
-    buffer.write(tar_value.read())
-    buffer.seek(0)
-    return buffer
+    # BytesIO created from bytes shares memory with it, so content is not copied second time
+    return BytesIO(tar_file.extractfile(tar_file.getmember(member_name)).read())
+
+
+def _uncompressed_tar_path(tar_file: TarFile) -> typing.Optional[str]:
+    """Path to archive if it is uncompressed file on disc (so members could be accessed by offset)"""
+    fileobj = tar_file.fileobj
+    if not isinstance(fileobj, (io.BufferedReader, io.FileIO)):
+        return None
+    name = getattr(fileobj, "name", None)
+    if isinstance(name, str) and os.path.isfile(name):
+        return name
+    return None
+
+
+def open_tar_member(tar_file: TarFile, member_name: str) -> typing.Union[tifffile.FileHandle, BytesIO]:
+    """
+    Open member of tar archive for decoding.
+
+    For uncompressed archive stored on disc, return :py:class:`tifffile.FileHandle` limited to member data,
+    so data is read directly from archive file (and could be memory mapped).
+    For compressed archives, member content is read once to :py:class:`BytesIO`.
+
+    :param tar_file: archive
+    :param member_name: name of member
+    :return: file like object, which should be closed after use
+    """
+    member = tar_file.getmember(member_name)
+    path = _uncompressed_tar_path(tar_file)
+    if path is not None and member.isreg() and not member.issparse():
+        return tifffile.FileHandle(path, offset=member.offset_data, size=member.size)
+    return BytesIO(tar_file.extractfile(member).read())
+
+
+def load_npz_from_tar(tar_file: TarFile, member_name: str) -> dict[str, np.ndarray]:
+    """Load all arrays from npz file stored in tar archive"""
+    with open_tar_member(tar_file, member_name) as member, np.load(member) as npz_file:
+        return dict(npz_file.items())
+
+
+def iter_tar_members(file_path: typing.Union[str, Path]) -> typing.Iterator[tuple[str, typing.Callable[[], bytes]]]:
+    """
+    Iterate over regular members of archive in order of storage.
+    Archive is decompressed only as far as iteration goes,
+    so reading of members placed at beginning of archive is cheap even for big compressed archive.
+
+    :param file_path: path to archive
+    :return: iterator over pairs (member name, function returning member content).
+        Content has to be read before moving to next member.
+    """
+    with tar_open(file_path, "r|*") as tar_file:
+        for member in tar_file:
+            if member.isreg():
+                yield member.name, lambda member=member: tar_file.extractfile(member).read()
+
+
+class ProjectDescriptor(typing.NamedTuple):
+    """
+    Lightweight description of project, read without decoding of stored arrays.
+    Fields which could not be determined without decoding arrays are set to ``None``.
+
+    :ivar file_path: path to project
+    :ivar image: description of image stored in project (``None`` if project does not contain image)
+    :ivar roi_shape: shape of ROI array
+    :ivar roi_components: number of ROI components
+    :ivar has_mask: if project contains mask
+    :ivar algorithm_name: name of ROI extraction algorithm
+    :ivar selected_components: components selected in project (only for mask projects)
+    """
+
+    file_path: str
+    image: typing.Optional[ImageDescriptor]
+    roi_shape: typing.Optional[tuple[int, ...]] = None
+    roi_components: typing.Optional[int] = None
+    has_mask: typing.Optional[bool] = None
+    algorithm_name: typing.Optional[str] = None
+    selected_components: typing.Optional[tuple[int, ...]] = None
 
 
 class SaveScreenshot(SaveBase):
@@ -1,9 +1,13 @@
+from typing import Optional
+
 from PartSegCore.mask.io_functions import MaskProjectTuple
 from PartSegCore.mask_create import MaskProperty
 from PartSegCore.project_info import HistoryElement
 
 
-def create_history_element_from_segmentation_tuple(project_info: MaskProjectTuple, mask_property: MaskProperty):
+def create_history_element_from_segmentation_tuple(
+    project_info: MaskProjectTuple, mask_property: MaskProperty, previous: Optional[HistoryElement] = None
+):
     return HistoryElement.create(
         roi_info=project_info.roi_info,
         mask=project_info.mask,
@@ -12,4 +16,5 @@ def create_history_element_from_segmentation_tuple(project_info: MaskProjectTupl
             "parameters": project_info.roi_extraction_parameters,
         },
         mask_property=mask_property,
+        previous=previous,
     )
@@ -21,6 +21,7 @@ from PartSegCore.io_utils import (
     IO_MASK_METADATA_FILE,
     LoadBase,
     LoadPoints,
+    ProjectDescriptor,
     SaveBase,
     SaveMaskAsTiff,
     SaveROIAsNumpy,
@@ -29,8 +30,11 @@ from PartSegCore.io_utils import (
     WrongFileTypeException,
     check_segmentation_type,
     get_tarinfo,
+    iter_tar_members,
     load_metadata_base,
+    load_npz_from_tar,
     open_tar_file,
+    open_tar_member,
     proxy_callback,
     tar_to_buff,
 )
@@ -40,6 +44,7 @@ from PartSegCore.roi_info import ROIInfo
 from PartSegCore.utils import BaseModel
 from PartSegImage import BaseImageWriter, GenericImageReader, Image, IMAGEJImageWriter, ImageWriter, TiffImageReader
 from PartSegImage.image import FRAME_THICKNESS, reduce_array
+from PartSegImage.image_reader import cache_by_file_state
 
 try:
     from napari_builtins.io import napari_write_points
@@ -149,6 +154,8 @@ def _save_mask_roi_metadata(
         "components": [int(x) for x in project.selected_components],
         "parameters": {str(k): v for k, v in project.roi_extraction_parameters.items()},
         "shape": project.roi_info.roi.shape,
+        "roi_components": len(project.roi_info.bound_info),
+        "has_mask": project.mask is not None,
         "annotations": project.roi_info.annotations,
         "keep_data_outside_mask": not parameters.mask_data,
         "frame_thickness": parameters.frame_thickness,
@@ -197,10 +204,10 @@ def _save_mask_history(project: MaskProjectTuple, tar_file: tarfile.TarFile):
                 "annotations": hist.annotations,
             }
         )
-        hist.arrays.seek(0)
-        hist_info = get_tarinfo(f"history/arrays_{i}.npz", hist.arrays)
-        hist.arrays.seek(0)
-        tar_file.addfile(hist_info, hist.arrays)
+        arrays = hist.get_arrays_buffer()
+        hist_info = get_tarinfo(f"history/arrays_{i}.npz", arrays)
+        arrays.seek(0)
+        tar_file.addfile(hist_info, arrays)
     if el_info:
         hist_str = json.dumps(el_info, cls=PartSegEncoder)
         hist_buff = BytesIO(hist_str.encode("utf-8"))
@@ -219,9 +226,10 @@ def save_stack_segmentation(
     tar_file, _file_path = open_tar_file(file_data, "w:gz")
     step_changed(1)
     try:
-        _save_mask_roi(segmentation_info, tar_file, parameters)
-        step_changed(2)
+        # metadata are stored first, so they could be read without decompressing whole archive
         _save_mask_roi_metadata(segmentation_info, tar_file, parameters, file_data)
+        step_changed(2)
+        _save_mask_roi(segmentation_info, tar_file, parameters)
         step_changed(3)
         if segmentation_info.mask is not None:
             _save_mask_mask(segmentation_info, tar_file)
@@ -250,12 +258,9 @@ def load_stack_segmentation_from_tar(tar_file: tarfile.TarFile, file_path: str,
     else:
         segmentation_file_name = "segmentation.tif"
         segmentation_load_fun = TiffImageReader.read_image
-    segmentation_buff = BytesIO()
-    segmentation_tar = tar_file.extractfile(tar_file.getmember(segmentation_file_name))
-    segmentation_buff.write(segmentation_tar.read())
-    step_changed(3)
-    segmentation_buff.seek(0)
-    roi = segmentation_load_fun(segmentation_buff)
+    with open_tar_member(tar_file, segmentation_file_name) as segmentation_buff:
+        step_changed(3)
+        roi = segmentation_load_fun(segmentation_buff)
     if isinstance(roi, Image):
         spacing = roi.spacing
         roi = roi.get_channel(0)
@@ -263,13 +268,14 @@ def load_stack_segmentation_from_tar(tar_file: tarfile.TarFile, file_path: str,
         spacing = None
     step_changed(4)
     if "mask.tif" in tar_file.getnames():
-        mask = tifffile.imread(tar_to_buff(tar_file, "mask.tif"))
+        with open_tar_member(tar_file, "mask.tif") as mask_buff:
+            mask = tifffile.imread(mask_buff)
         if np.max(mask) == 1:
             mask = mask.astype(bool)
     else:
         mask = None
     if "alternative.npz" in tar_file.getnames():
-        alternative = np.load(tar_to_buff(tar_file, "alternative.npz"))
+        alternative = load_npz_from_tar(tar_file, "alternative.npz")
     else:
         alternative = {}
     roi_info = ROIInfo(reduce_array(roi), annotations=metadata.get("annotations", {}), alternative=alternative)
@@ -279,9 +285,7 @@ def load_stack_segmentation_from_tar(tar_file: tarfile.TarFile, file_path: str,
         history_buff = tar_file.extractfile(tar_file.getmember("history/history.json")).read()
         history_json = load_metadata(history_buff)
         for el in history_json:
-            history_buffer = BytesIO()
-            history_buffer.write(tar_file.extractfile(f"history/arrays_{el['index']}.npz").read())
-            history_buffer.seek(0)
+            history_buffer = tar_to_buff(tar_file, f"history/arrays_{el['index']}.npz")
             history.append(
                 HistoryElement(
                     roi_extraction_parameters=el["segmentation_parameters"],
@@ -320,6 +324,31 @@ def load_stack_segmentation(file_data: typing.Union[str, Path], range_changed=No
             tar_file.close()
 
 
+@cache_by_file_state()
+def probe_stack_segmentation(file_path: typing.Union[str, Path]) -> ProjectDescriptor:
+    """
+    Read description of ROI project (shape, number of ROI components, selected components)
+    reading only ``metadata.json`` from archive. Result is cached until file is modified.
+
+    :param file_path: path to project
+    """
+    metadata = None
+    for name, read in iter_tar_members(file_path):
+        if name == IO_MASK_METADATA_FILE:
+            metadata = json.loads(read())
+            break
+    if metadata is None or "components" not in metadata:
+        raise WrongFileTypeException
+    return ProjectDescriptor(
+        file_path=file_path,
+        image=None,
+        roi_shape=tuple(metadata["shape"]) if "shape" in metadata else None,
+        roi_components=metadata.get("roi_components"),
+        has_mask=metadata.get("has_mask"),
+        selected_components=tuple(metadata["components"]),
+    )
+
+
 class LoadROI(LoadBase):
     """
     Load ROI segmentation data.
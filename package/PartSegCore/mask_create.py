@@ -1,10 +1,12 @@
 import typing
+from concurrent.futures import ThreadPoolExecutor
 
 import numpy as np
 import SimpleITK as sitk
 from local_migrator import register_class
+from scipy import ndimage
 
-from PartSegCore.image_operations import RadiusType, dilate, erode
+from PartSegCore.image_operations import RadiusType, dilate, erode, get_default_workers
 from PartSegCore.utils import BaseModel
 from PartSegImage.image import minimal_dtype
 
@@ -104,11 +106,13 @@ def calculate_mask(
     spacing: typing.Iterable[typing.Union[float, int]],
     components: typing.Optional[list[int]] = None,
     time_axis: typing.Optional[int] = 0,
+    workers: typing.Optional[int] = None,
 ) -> np.ndarray:
     """
     Function for calculate mask base on MaskProperty.
     If dilate_radius is negative then holes closing is done before erode,
-    otherwise it is done after dilate
+    otherwise it is done after dilate.
+    Time points are processed in thread pool and written to preallocated array.
 
     :param MaskProperty mask_description: information how calculate mask
     :param np.ndarray roi: array on which mask is calculated
@@ -118,6 +122,8 @@ def calculate_mask(
     :param typing.Optional[list[int]] components: If present inform which components
         should be used when calculation mask, otherwise use all.
     :param typing.Optional[int] time_axis: which axis of array should be treated as time. IF none then none.
+    :param typing.Optional[int] workers: number of threads used for processing time points,
+        default from :py:func:`PartSegCore.image_operations.set_default_workers`
     :return: new mask
     :rtype: np.ndarray
     """
@@ -136,17 +142,30 @@ def calculate_mask(
     mask = np.copy(roi) if mask_description.save_components else np.array(roi > 0)
     if time_axis is None:
         return _calculate_mask(mask_description, dilate_radius, mask, old_mask)
-    slices: list[typing.Union[slice, int]] = [slice(None) for _ in range(mask.ndim)]
-    final_shape = list(mask.shape)
-    final_shape[time_axis] = 1
-    final_shape = tuple(final_shape)
-    res = []
-    for i in range(mask.shape[time_axis]):
-        slices[time_axis] = i
-        t_slices = tuple(slices)
+    time_size = mask.shape[time_axis]
+    workers = min(workers or get_default_workers(), time_size)
+
+    def _time_point(index: int) -> tuple[tuple[typing.Union[slice, int], ...], np.ndarray]:
+        t_slices = (slice(None),) * time_axis + (index,)
         _old_mask = old_mask[t_slices] if old_mask is not None else None
-        res.append(_calculate_mask(mask_description, dilate_radius, mask[t_slices], _old_mask).reshape(final_shape))
-    return np.concatenate(res, axis=time_axis)
+        # with many frames processed in parallel the layers of a frame are processed sequentially
+        return t_slices, _calculate_mask(
+            mask_description, dilate_radius, mask[t_slices], _old_mask, 1 if workers > 1 else None
+        )
+
+    t_slices, frame = _time_point(0)
+    res = np.empty((*mask.shape[:time_axis], time_size, *frame.shape[time_axis:]), dtype=frame.dtype)
+    res[t_slices] = frame
+    del frame
+    if workers <= 1:
+        for i in range(1, time_size):
+            t_slices, frame = _time_point(i)
+            res[t_slices] = frame
+        return res
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        for t_slices, frame in executor.map(_time_point, range(1, time_size)):
+            res[t_slices] = frame
+    return res
 
 
 def _calculate_mask(
@@ -154,14 +173,15 @@ def _calculate_mask(
     dilate_radius: list[int],
     mask: np.ndarray,
     old_mask: typing.Union[None, np.ndarray],
+    workers: typing.Optional[int] = None,
 ) -> np.ndarray:
     if mask_description.dilate != RadiusType.NO and mask_description.dilate_radius != 0:
         if mask_description.dilate_radius > 0:
-            mask = dilate(mask, dilate_radius, mask_description.dilate == RadiusType.R2D)
+            mask = dilate(mask, dilate_radius, mask_description.dilate == RadiusType.R2D, workers)
             mask = _fill_holes(mask_description, mask)
         elif mask_description.dilate_radius < 0:
             mask = _fill_holes(mask_description, mask)
-            mask = erode(mask, dilate_radius, mask_description.dilate == RadiusType.R2D)
+            mask = erode(mask, dilate_radius, mask_description.dilate == RadiusType.R2D, workers)
     elif mask_description.fill_holes != RadiusType.NO:
         mask = _fill_holes(mask_description, mask)
     if mask_description.reversed_mask:
@@ -174,24 +194,21 @@ def _calculate_mask(
 def _cut_components(
     mask: np.ndarray, image: np.ndarray, borders: int = 0
 ) -> typing.Iterator[tuple[np.ndarray, list[slice], int]]:
-    sizes = np.bincount(mask.flat)
-    for i, size in enumerate(sizes[1:], 1):
-        if size > 0:
-            points = np.nonzero(mask == i)
-            lower_bound = np.min(points, axis=1)
-            upper_bound = np.max(points, axis=1)
-            new_cut = tuple(slice(x, y + 1) for x, y in zip(lower_bound, upper_bound))
-            new_size = [y - x + 1 + 2 * borders for x, y in zip(lower_bound, upper_bound)]
-            if borders > 0:
-                res = np.zeros(new_size, dtype=image.dtype)
-                res_cut = tuple(slice(borders, x - borders) for x in tuple(res.shape))
-                tmp_res = np.copy(image[new_cut])
-                tmp_res[mask[new_cut] != i] = 0
-                res[res_cut] = tmp_res
-            else:
-                res = image[new_cut]
-                res[mask[new_cut] != i] = 0
-            yield res, tuple(new_cut), i
+    labels = mask.view(np.uint8) if mask.dtype == bool else mask
+    # bounding boxes of all components in one pass
+    for i, new_cut in enumerate(ndimage.find_objects(labels), start=1):
+        if new_cut is None:
+            continue
+        if borders > 0:
+            res = np.zeros([sl.stop - sl.start + 2 * borders for sl in new_cut], dtype=image.dtype)
+            res_cut = tuple(slice(borders, x - borders) for x in tuple(res.shape))
+            tmp_res = np.copy(image[new_cut])
+            tmp_res[mask[new_cut] != i] = 0
+            res[res_cut] = tmp_res
+        else:
+            res = image[new_cut]
+            res[mask[new_cut] != i] = 0
+        yield res, new_cut, i
 
 
 def _fill_holes(mask_description: MaskProperty, mask: np.ndarray) -> np.ndarray:
@@ -226,27 +243,16 @@ def fill_holes_in_mask(mask: np.ndarray, volume: int) -> np.ndarray:
     :return: modified mask
     """
     holes_mask = (mask == 0).astype(np.uint8)
-    component_mask = sitk.GetArrayFromImage(
-        sitk.RelabelComponent(sitk.ConnectedComponent(sitk.GetImageFromArray(holes_mask)))
-    )
-    border_set: set[int] = set()
-    for dim_num in range(component_mask.ndim):
-        border_set.update(list(np.unique(np.take(component_mask, [0, -1], axis=dim_num))))
-    if 0 in border_set:
-        border_set.remove(0)
-    components_num = component_mask.max()
-    if component_mask.dtype.type(components_num) >= component_mask.dtype.type(components_num + 1):
-        raise ValueError("overflow error")
-    for num in border_set:
-        component_mask[component_mask == num] = components_num + 1
+    component_mask = sitk.GetArrayFromImage(sitk.ConnectedComponent(sitk.GetImageFromArray(holes_mask)))
+    sizes = np.bincount(component_mask.ravel())
+    # lookup table: True for mask (label 0) and holes which should be filled
+    fill = np.ones(sizes.size, dtype=bool)
     if volume > 0:
-        sizes = np.bincount(component_mask.flat)
-        for i, v in enumerate(sizes[1:], 1):
-            if v <= volume and i < components_num + 1:
-                component_mask[component_mask == i] = 0
-    else:
-        component_mask[component_mask <= components_num] = 0
-    return component_mask == 0
+        fill[sizes > volume] = False
+    for dim_num in range(component_mask.ndim):
+        fill[np.take(component_mask, [0, -1], axis=dim_num)] = False
+    fill[0] = True
+    return fill[component_mask]
 
 
 def fill_2d_holes_in_mask(mask: np.ndarray, volume: int) -> np.ndarray:
@@ -124,9 +124,32 @@ class MaskDistanceSplit(AlgorithmDescribeBase):
         :param voxel_size: image voxel size
         :return: mask region labelled starting from 1 near border
         """
+        return MaskDistanceSplit.split_distance(
+            MaskDistanceSplit.mask_distance(mask, voxel_size), num_of_parts, equal_volume
+        )
+
+    @staticmethod
+    def mask_distance(mask: np.ndarray, voxel_size) -> np.ndarray:
+        """
+        Euclidean distance (with respect of voxel size) of each mask voxel from background.
+
+        :param mask: 2d or 3d numpy array
+        :param voxel_size: image voxel size
+        """
         if len(voxel_size) == 2 and mask.ndim == 3:
             voxel_size = (1, *voxel_size)
-        distance_arr = distance_transform_edt(mask, sampling=voxel_size)
+        return distance_transform_edt(mask, sampling=voxel_size)
+
+    @staticmethod
+    def split_distance(distance_arr: np.ndarray, num_of_parts: int, equal_volume: bool) -> np.ndarray:
+        """
+        Split mask on parts base on distance from background calculated with :py:meth:`mask_distance`.
+
+        :param distance_arr: distance of voxels from background
+        :param num_of_parts: num of parts on which mask should be split
+        :param equal_volume: if split should be on equal volume or equal thick
+        :return: mask region labelled starting from 1 near border
+        """
         if equal_volume:
             # TODO add more bins, fix tests for more bins
             hist, bins = np.histogram(distance_arr[distance_arr > 0], bins=10 * num_of_parts)
@@ -144,7 +167,7 @@ class MaskDistanceSplit(AlgorithmDescribeBase):
         else:
             max_dist = np.max(distance_arr)
             bounds = np.linspace(0, max_dist, num_of_parts, False)
-        mask = np.zeros(mask.shape, dtype=np.uint8 if num_of_parts < 255 else np.uint16)
+        mask = np.zeros(distance_arr.shape, dtype=np.uint8 if num_of_parts < 255 else np.uint16)
         for bound in bounds:
             mask[distance_arr > bound] += 1
         return mask
@@ -4,6 +4,7 @@ from typing import Any, ClassVar, Optional, Protocol, Union, runtime_checkable
 
 import numpy as np
 
+from PartSegCore.history_store import HistorySnapshot, HistoryStore, default_history_store
 from PartSegCore.mask_create import MaskProperty, calculate_mask
 from PartSegCore.roi_info import ROIInfo
 from PartSegCore.utils import BaseModel, numpy_repr
@@ -32,10 +33,17 @@ class AdditionalLayerDescription:
 
 
 class HistoryElement(BaseModel):
+    """
+    Element of project history.
+
+    :ivar arrays: arrays of ROI, its alternatives and mask. Buffer with npz file
+        (when loaded from project file) or :py:class:`.HistorySnapshot` compressed in background.
+    """
+
     roi_extraction_parameters: dict[str, Any]
     annotations: Optional[dict[int, Any]]
     mask_property: MaskProperty
-    arrays: BytesIO
+    arrays: Union[BytesIO, HistorySnapshot]
 
     class Config:
         arbitrary_types_allowed = True
@@ -47,28 +55,56 @@ class HistoryElement(BaseModel):
         mask: Union[np.ndarray, None],
         roi_extraction_parameters: dict,
         mask_property: MaskProperty,
+        previous: Optional["HistoryElement"] = None,
+        store: Optional[HistoryStore] = None,
     ):
+        """
+        Create history element. Arrays are compressed in background.
+
+        :param roi_info: ROI information to store
+        :param mask: mask to store
+        :param roi_extraction_parameters: parameters of ROI extraction
+        :param mask_property: description of mask creation
+        :param previous: previous history element. If present, ROI may be stored as difference to its ROI.
+        :param store: store for arrays. If not provided, then ``default_history_store`` is used.
+        """
         if "name" in roi_extraction_parameters:  # pragma: no cover
             raise ValueError("name")
-        arrays = BytesIO()
         arrays_dict = {"roi": roi_info.roi}
         arrays_dict.update(roi_info.alternative.items())
         if mask is not None:
             arrays_dict["mask"] = mask
-
-        np.savez_compressed(arrays, **arrays_dict)
-        arrays.seek(0)
+        previous_snapshot = None
+        if previous is not None and isinstance(previous.arrays, HistorySnapshot):
+            previous_snapshot = previous.arrays
+        if store is None:
+            store = default_history_store
         return cls(
             roi_extraction_parameters=roi_extraction_parameters,
             mask_property=mask_property,
-            arrays=arrays,
+            arrays=store.add(arrays_dict, previous_snapshot),
             annotations=roi_info.annotations,
         )
 
-    def get_roi_info_and_mask(self) -> tuple[ROIInfo, Optional[np.ndarray]]:
+    def get_arrays(self) -> dict[str, np.ndarray]:
+        """Dict with stored arrays"""
+        if isinstance(self.arrays, HistorySnapshot):
+            return self.arrays.get_arrays()
+        self.arrays.seek(0)
+        with np.load(self.arrays) as seg:
+            res = dict(seg.items())
         self.arrays.seek(0)
-        seg = np.load(self.arrays)
+        return res
+
+    def get_arrays_buffer(self) -> BytesIO:
+        """Buffer with npz file with stored arrays. Used for saving project."""
+        if isinstance(self.arrays, HistorySnapshot):
+            return self.arrays.get_buffer()
         self.arrays.seek(0)
+        return self.arrays
+
+    def get_roi_info_and_mask(self) -> tuple[ROIInfo, Optional[np.ndarray]]:
+        seg = self.get_arrays()
         alternative = {name: array for name, array in seg.items() if name not in {"roi", "mask"}}
         roi_info = ROIInfo(seg["roi"], annotations=self.annotations, alternative=alternative)
         mask = seg.get("mask")
@@ -1,7 +1,7 @@
-from collections import defaultdict
 from typing import Any, NamedTuple, Optional
 
 import numpy as np
+from scipy.ndimage import find_objects
 
 from PartSegCore.utils import numpy_repr
 from PartSegCore_compiled_backend.utils import calc_bounds
@@ -30,6 +30,76 @@ class BoundInfo(NamedTuple):
         return f"{self.__class__.__name__}(lower={list(self.lower)}, upper={list(self.upper)})"
 
 
+class LabelStatistics(NamedTuple):
+    """
+    Statistics of labeled array.
+
+    :ivar int max_label: maximum label in array
+    :ivar np.ndarray sizes: number of voxels of each label (including 0 as background), length ``max_label + 1``
+    :ivar Dict[int,BoundInfo] bound_info: mapping from component number to bounding box
+    :ivar Optional[np.ndarray] centroids: array of shape ``(max_label + 1, ndim)`` with centroids of labels
+        (``nan`` for not present ones), ``None`` if not calculated
+    """
+
+    max_label: int
+    sizes: np.ndarray
+    bound_info: dict[int, BoundInfo]
+    centroids: Optional[np.ndarray] = None
+
+    def expand_dims(self, old_shape: tuple[int, ...], new_shape: tuple[int, ...]) -> Optional["LabelStatistics"]:
+        """
+        Adjust statistics to array reshaped by inserting or removing single dimensional entries.
+        Return ``None`` if shapes differs in other way.
+        """
+        old_axes = [i for i, size in enumerate(old_shape) if size != 1]
+        new_axes = [i for i, size in enumerate(new_shape) if size != 1]
+        if [old_shape[i] for i in old_axes] != [new_shape[i] for i in new_axes]:
+            return None
+
+        def _map(array: np.ndarray, dtype) -> np.ndarray:
+            res = np.zeros((*array.shape[:-1], len(new_shape)), dtype=dtype)
+            res[..., new_axes] = array[..., old_axes]
+            return res
+
+        bound_info = {
+            num: BoundInfo(lower=_map(bound.lower, bound.lower.dtype), upper=_map(bound.upper, bound.upper.dtype))
+            for num, bound in self.bound_info.items()
+        }
+        centroids = None
+        if self.centroids is not None:
+            centroids = _map(self.centroids, self.centroids.dtype)
+            centroids[self.sizes == 0] = np.nan
+        return LabelStatistics(self.max_label, self.sizes, bound_info, centroids)
+
+
+def _bincount(array: np.ndarray, weights: Optional[np.ndarray] = None) -> np.ndarray:
+    if not np.can_cast(array.dtype, np.intp, "safe"):
+        array = array.astype(np.intp)
+    return np.bincount(array.ravel(), weights=weights)
+
+
+def label_statistics(roi: np.ndarray, centroids: bool = False) -> LabelStatistics:
+    """
+    Calculate statistics of labeled array (maximum label, sizes and bounding boxes of components).
+    Sizes and maximum label are calculated in one pass with :py:func:`numpy.bincount`.
+
+    :param roi: array with labels (non-negative integers)
+    :param centroids: if calculate centroids of components
+    """
+    sizes = _bincount(roi)
+    max_label = len(sizes) - 1
+    centroids_array = None
+    if centroids:
+        centroids_array = np.empty((len(sizes), roi.ndim), dtype=np.float64)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            for axis, size in enumerate(roi.shape):
+                shape = [1] * roi.ndim
+                shape[axis] = size
+                coordinates = np.broadcast_to(np.arange(size).reshape(shape), roi.shape)
+                centroids_array[:, axis] = _bincount(roi, weights=coordinates.ravel()) / sizes
+    return LabelStatistics(max_label, sizes, ROIInfo.calc_bounds(roi), centroids_array)
+
+
 class ROIInfo:
     """
     Object to storage meta information about given segmentation.
@@ -40,6 +110,10 @@ class ROIInfo:
     :ivar numpy.ndarray sizes: array with sizes of components
     :ivar Dict[int, Any] annotations: annotations of roi
     :ivar Dict[str, np.ndarray] alternative: alternative representation of roi
+    :ivar Optional[LabelStatistics] statistics: statistics of roi
+
+    :param statistics: already calculated statistics of ``roi`` (for example by roi extraction algorithm).
+        If not provided, then are calculated with :py:func:`label_statistics`.
     """
 
     def __init__(
@@ -47,28 +121,34 @@ class ROIInfo:
         roi: Optional[np.ndarray],
         annotations: Optional[dict[int, Any]] = None,
         alternative: Optional[dict[str, np.ndarray]] = None,
+        statistics: Optional[LabelStatistics] = None,
     ):
         annotations = {} if annotations is None else annotations
         self.annotations = {int(k): v for k, v in annotations.items()}
         self.alternative = {} if alternative is None else alternative
         if roi is None:
             self.roi = None
+            self.statistics = None
             self.bound_info = {}
             self.sizes = []
             return
-        max_val = np.max(roi)
-        dtype = minimal_dtype(max_val)
-        roi = roi.astype(dtype)
+        if statistics is None:
+            sizes = _bincount(roi)
+            roi = roi.astype(minimal_dtype(len(sizes) - 1), copy=False)
+            statistics = LabelStatistics(len(sizes) - 1, sizes, self.calc_bounds(roi))
+        else:
+            roi = roi.astype(minimal_dtype(statistics.max_label), copy=False)
         self.roi = roi
-        self.bound_info = self.calc_bounds(roi)
-        self.sizes = np.bincount(roi.flat)
+        self.statistics = statistics
+        self.bound_info = statistics.bound_info
+        self.sizes = statistics.sizes
 
     def fit_to_image(self, image: Image) -> "ROIInfo":
         if self.roi is None:
             return ROIInfo(self.roi, self.annotations, self.alternative)
         roi = image.fit_array_to_image(self.roi)
         alternatives = {k: image.fit_array_to_image(v) for k, v in self.alternative.items()}
-        return ROIInfo(roi, self.annotations, alternatives)
+        return ROIInfo(roi, self.annotations, alternatives, self.statistics.expand_dims(self.roi.shape, roi.shape))
 
     def __str__(self):
         return f"ROIInfo; components: {len(self.bound_info)}, sizes: {self.sizes}"
@@ -92,15 +172,10 @@ class ROIInfo:
                 for num, (lower, upper) in enumerate(zip(min_bounds, max_bounds))
                 if num != 0 and upper[0] != -1
             }
-        except KeyError:
-            bound_info = {}
-            points = np.nonzero(roi)
-            comp_num = roi[points]
-            point_dict = defaultdict(list)
-            for num, point in zip(comp_num, np.transpose(points)):
-                point_dict[num].append(point)
-            for num, points_for_num in point_dict.items():
-                lower = np.min(points_for_num, 0)
-                upper = np.max(points_for_num, 0)
-                bound_info[num] = BoundInfo(lower=lower, upper=upper)
-            return bound_info
+        except (KeyError, TypeError):
+            # compiled backend supports only some types of arrays
+            return {
+                num: BoundInfo(lower=np.array([x.start for x in slices]), upper=np.array([x.stop - 1 for x in slices]))
+                for num, slices in enumerate(find_objects(roi.astype(np.intp, copy=False)), start=1)
+                if slices is not None
+            }
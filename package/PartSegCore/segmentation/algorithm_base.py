@@ -16,7 +16,7 @@ from PartSegCore.algorithm_describe_base import (
 )
 from PartSegCore.image_operations import RadiusType
 from PartSegCore.project_info import AdditionalLayerDescription
-from PartSegCore.roi_info import ROIInfo
+from PartSegCore.roi_info import LabelStatistics, ROIInfo
 from PartSegCore.utils import BaseModel, numpy_repr
 from PartSegImage import Channel, Image
 
@@ -63,6 +63,8 @@ class ROIExtractionResult:
     :ivar Optional[str] ~.file_path: information on which file roi extraction was performed.
     :ivar ROIInfo ~.roi_info: ROIInfo for current roi.
     :ivar Optional[np.ndarray] ~.points: array of points.
+    :ivar Optional[LabelStatistics] ~.roi_statistics: statistics of roi already calculated by algorithm,
+        reused when creating :py:attr:`roi_info`.
     """
 
     # TODO add alternative representation using dict mapping.
@@ -75,6 +77,7 @@ class ROIExtractionResult:
     file_path: Optional[str] = None
     roi_info: Optional[ROIInfo] = None
     points: Optional[np.ndarray] = None
+    roi_statistics: Optional[LabelStatistics] = None
 
     def __post_init__(self):
         if "ROI" in self.alternative_representation:
@@ -86,7 +89,12 @@ class ROIExtractionResult:
             object.__setattr__(
                 self,
                 "roi_info",
-                ROIInfo(roi=self.roi, annotations=self.roi_annotation, alternative=self.alternative_representation),
+                ROIInfo(
+                    roi=self.roi,
+                    annotations=self.roi_annotation,
+                    alternative=self.alternative_representation,
+                    statistics=self.roi_statistics,
+                ),
             )
 
     def __str__(self):  # pragma: no cover
@@ -223,7 +231,17 @@ class ROIExtractionAlgorithm(AlgorithmDescribeBase, ABC):
             )
         return self.image.get_data_by_axis(c=channel_idx, t=0)
 
+    @classmethod
+    def need_full_image(cls) -> bool:
+        """
+        If algorithm need whole image data in memory. For such algorithms memory mapped image
+        (see :py:attr:`PartSegImage.Image.is_lazy`) is materialized in :py:meth:`set_image`.
+        """
+        return False
+
     def set_image(self, image):
+        if self.need_full_image():
+            image = image.materialize()
         self.image = image
         self.channel = None
         self.mask = None
@@ -1,5 +1,8 @@
+import itertools
 import warnings
 from abc import ABC
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional
 
 import numpy as np
 import SimpleITK as sitk
@@ -7,6 +10,7 @@ from local_migrator import update_argument
 from pydantic import Field
 
 from PartSegCore.algorithm_describe_base import AlgorithmDescribeBase, AlgorithmSelection
+from PartSegCore.image_operations import get_default_workers
 from PartSegCore.segmentation.watershed import NeighType, get_neighbourhood
 from PartSegCore.utils import BaseModel
 
@@ -49,6 +53,112 @@ class OpeningSmoothing(BaseSmoothing):
         return sitk.GetArrayFromImage(sitk.BinaryMorphologicalOpening(sitk.GetImageFromArray(segmentation), radius))
 
 
+VOTE_TILE_SIZE = 64
+"""size of tiles used by :py:func:`vote_smoothing` (in each axis except last, which is not split)"""
+
+
+def _support_count(padded: np.ndarray, tile: tuple[slice, ...], shifts: list, per_label: bool) -> np.ndarray:
+    """
+    Number of supporting neighbours for voxels in ``tile``.
+
+    :param padded: labels padded by one voxel on each side
+    :param tile: part of array (without padding)
+    """
+    center = padded[tuple(slice(sl.start + 1, sl.stop + 1) for sl in tile)]
+    count = np.zeros(center.shape, dtype=np.uint8)
+    for shift in shifts:
+        # voxel at position ``p`` is supported by voxel at ``p - shift``
+        neighbours = padded[tuple(slice(sl.start + 1 - x, sl.stop + 1 - x) for sl, x in zip(tile, shift))]
+        if per_label:
+            count += neighbours == center
+        else:
+            count += neighbours
+    return count
+
+
+def _update_padding(padded: np.ndarray):
+    """Copy values to padding like for periodic array (like in :py:func:`numpy.roll`)"""
+    for axis in range(padded.ndim):
+        index = [slice(None)] * padded.ndim
+        index[axis] = [0, -1]
+        source = [slice(None)] * padded.ndim
+        source[axis] = [-2, 1]
+        padded[tuple(index)] = padded[tuple(source)]
+
+
+def vote_smoothing(
+    segmentation: np.ndarray,
+    neighbourhood_type: NeighType,
+    support_level: int,
+    *,
+    max_steps: int = 1,
+    per_label: bool = False,
+    workers: Optional[int] = None,
+) -> np.ndarray:
+    """
+    Iteratively remove voxels which have less than ``support_level`` labeled voxels in neighbourhood.
+    In each step voting is done for all voxels in parallel.
+
+    Array is split on tiles processed in thread pool. After first step only tiles containing
+    or touching voxels removed in previous step are processed, because voting in other tiles cannot change.
+    Calculation stops when no voxel is removed.
+
+    :param segmentation: labeled array
+    :param neighbourhood_type: neighbourhood used for voting
+    :param support_level: minimal number of supporting neighbours to preserve voxel
+    :param max_steps: maximum number of steps
+    :param per_label: if only neighbours with the same label support voxel, otherwise all labeled voxels
+    :param workers: number of threads, default from :py:func:`PartSegCore.image_operations.set_default_workers`
+    :return: copy of segmentation with removed voxels
+    """
+    segmentation = segmentation.copy()
+    if max_steps < 1:
+        return segmentation
+    labels = segmentation if per_label else (segmentation > 0).astype(np.uint8)
+    neighbourhood = get_neighbourhood(labels.squeeze().shape, neighbourhood_type)
+    shifts = [tuple(int(x) for x in shift[: labels.ndim]) for shift in neighbourhood]
+    padded = np.pad(labels, 1, mode="wrap")
+    labels = padded[(slice(1, -1),) * padded.ndim]
+    # last axis is not split to keep long contiguous rows
+    grid_shape = (*((size + VOTE_TILE_SIZE - 1) // VOTE_TILE_SIZE for size in labels.shape[:-1]), 1)
+
+    def _tile(tile_index: tuple[int, ...]) -> tuple[slice, ...]:
+        return (
+            *(
+                slice(i * VOTE_TILE_SIZE, min((i + 1) * VOTE_TILE_SIZE, size))
+                for i, size in zip(tile_index[:-1], labels.shape)
+            ),
+            slice(0, labels.shape[-1]),
+        )
+
+    def _removed(tile_index: tuple[int, ...]) -> np.ndarray:
+        tile = _tile(tile_index)
+        return (labels[tile] > 0) & (_support_count(padded, tile, shifts, per_label) < support_level)
+
+    active = set(np.ndindex(*grid_shape))
+    workers = workers or get_default_workers()
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        for _ in range(max_steps):
+            tiles = sorted(active)
+            if workers > 1 and len(tiles) > 1:
+                removed_list = list(executor.map(_removed, tiles))
+            else:
+                removed_list = [_removed(tile_index) for tile_index in tiles]
+            # all votes in step are done before any voxel is removed
+            changed = [(tile_index, removed) for tile_index, removed in zip(tiles, removed_list) if np.any(removed)]
+            if not changed:
+                break
+            active = set()
+            for tile_index, removed in changed:
+                tile = _tile(tile_index)
+                labels[tile][removed] = 0
+                segmentation[tile][removed] = 0
+                for shift in itertools.product((-1, 0, 1), repeat=len(grid_shape)):
+                    active.add(tuple((i + x) % size for i, x, size in zip(tile_index, shift, grid_shape)))
+            _update_padding(padded)
+    return segmentation
+
+
 class VoteSmoothingParams(BaseModel):
     neighbourhood_type: NeighType = Field(
         NeighType.edges, title="Side Neighbourhood", description="use 6, 18 or 26 neighbourhood (5, 8, 8 for 2d data)"
@@ -60,6 +170,9 @@ class VoteSmoothingParams(BaseModel):
         le=27,
         description="How many voxels in neighbourhood need to be labeled to preserve pixel",
     )
+    per_label: bool = Field(
+        False, title="Per label", description="Only voxels with the same label support pixel (for multiple components)"
+    )
 
 
 class VoteSmoothing(BaseSmoothing):
@@ -72,16 +185,9 @@ class VoteSmoothing(BaseSmoothing):
     @classmethod
     @update_argument("arguments")
     def smooth(cls, segmentation: np.ndarray, arguments: VoteSmoothingParams) -> np.ndarray:
-        segmentation_bin = (segmentation > 0).astype(np.uint8)
-        count_array = np.zeros(segmentation_bin.shape, dtype=segmentation.dtype)
-        neighbourhood = get_neighbourhood(segmentation_bin.squeeze().shape, arguments.neighbourhood_type)
-        axis = tuple(range(len(segmentation_bin.shape)))
-        for shift in neighbourhood:
-            count_array += np.roll(segmentation_bin, shift[: segmentation_bin.ndim], axis)
-        segmentation = segmentation.copy()
-        count_array = count_array.reshape(segmentation.shape)
-        segmentation[count_array < arguments.support_level] = 0
-        return segmentation
+        return vote_smoothing(
+            segmentation, arguments.neighbourhood_type, arguments.support_level, per_label=arguments.per_label
+        )
 
 
 class IterativeSmoothingParams(VoteSmoothingParams):
@@ -100,23 +206,13 @@ class IterativeVoteSmoothing(BaseSmoothing):
     @classmethod
     @update_argument("arguments")
     def smooth(cls, segmentation: np.ndarray, arguments: IterativeSmoothingParams) -> np.ndarray:
-        segmentation_bin = (segmentation > 0).astype(np.uint8)
-        count_array = np.zeros(segmentation_bin.shape, dtype=segmentation.dtype)
-        neighbourhood = get_neighbourhood(segmentation_bin.squeeze().shape, arguments.neighbourhood_type)
-        segmentation = segmentation.copy()
-        count_point = np.count_nonzero(segmentation)
-        axis = tuple(range(len(segmentation_bin.shape)))
-        for _ in range(arguments.max_steps):
-            for shift in neighbourhood:
-                count_array += np.roll(segmentation_bin, shift[: segmentation_bin.ndim], axis)
-            segmentation_bin[count_array < arguments.support_level] = 0
-            count_point2 = np.count_nonzero(segmentation_bin)
-            if count_point2 == count_point:
-                break
-            count_point = count_point2
-            count_array[:] = 0
-        segmentation[segmentation_bin.reshape(segmentation.shape) == 0] = 0
-        return segmentation
+        return vote_smoothing(
+            segmentation,
+            arguments.neighbourhood_type,
+            arguments.support_level,
+            max_steps=arguments.max_steps,
+            per_label=arguments.per_label,
+        )
 
 
 class SmoothAlgorithmSelection(AlgorithmSelection, class_methods=["smooth"], suggested_base_class=BaseSmoothing):
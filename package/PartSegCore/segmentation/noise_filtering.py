@@ -1,9 +1,12 @@
+import math
 import typing
 import warnings
 from abc import ABC
 from enum import Enum
+from functools import lru_cache
 
 import numpy as np
+import SimpleITK as sitk
 from local_migrator import register_class, rename_key, update_argument
 from pydantic import Field
 
@@ -37,6 +40,19 @@ class NoiseFilteringBase(AlgorithmDescribeBase, ABC):
         """
         raise NotImplementedError
 
+    @classmethod
+    def get_halo(cls, spacing: typing.Iterable[float], arguments: dict) -> typing.Optional[int]:
+        """
+        Number of neighbouring layers (along first axis) which influence filtering result.
+        Part of channel extended by this number of layers on each side could be filtered separately
+        with the same result as for whole channel.
+
+        :param spacing: image spacing
+        :param arguments: additional arguments defined by :py:meth:`get_fields`
+        :return: number of layers or None if unknown (then channel cannot be filtered in parts)
+        """
+        return None
+
 
 class NoneNoiseFiltering(NoiseFilteringBase):
     __argument_class__ = BaseModel
@@ -49,6 +65,20 @@ class NoneNoiseFiltering(NoiseFilteringBase):
     def noise_filter(cls, channel: np.ndarray, spacing: typing.Iterable[float], arguments: dict):
         return channel
 
+    @classmethod
+    def get_halo(cls, spacing: typing.Iterable[float], arguments: dict) -> int:
+        return 0
+
+
+@lru_cache
+def _gaussian_kernel_radius(variance: float) -> int:
+    """Radius of kernel used by :py:func:`SimpleITK.DiscreteGaussian`, measured on impulse response"""
+    size = 65  # default maximum kernel width of DiscreteGaussian is 32
+    impulse = np.zeros((size, 1, 1), dtype=np.float32)
+    impulse[size // 2] = 1
+    response = sitk.GetArrayFromImage(sitk.DiscreteGaussian(sitk.GetImageFromArray(impulse), variance))
+    return int(np.max(np.abs(np.nonzero(response[:, 0, 0])[0] - size // 2)))
+
 
 @register_class(version="0.0.1", migrations=[("0.0.1", rename_key("gauss_type", "dimension_type", optional=True))])
 class GaussNoiseFilteringParams(BaseModel):
@@ -70,6 +100,14 @@ class GaussNoiseFiltering(NoiseFilteringBase):
         layer = arguments.dimension_type == DimensionType.Layer
         return gaussian(channel, gauss_radius, layer=layer)
 
+    @classmethod
+    @update_argument("arguments")
+    def get_halo(cls, spacing: typing.Iterable[float], arguments: GaussNoiseFilteringParams) -> int:
+        if arguments.dimension_type == DimensionType.Layer or arguments.radius == 0:
+            return 0
+        gauss_radius = calculate_operation_radius(arguments.radius, spacing, arguments.dimension_type)
+        return _gaussian_kernel_radius(float(gauss_radius[0]))
+
 
 class BilateralNoiseFilteringParams(BaseModel):
     dimension_type: DimensionType = Field(DimensionType.Layer, title="Bilateral type")
@@ -92,6 +130,15 @@ class BilateralNoiseFiltering(NoiseFilteringBase):
         layer = arguments.dimension_type == DimensionType.Layer
         return bilateral(channel, max(gauss_radius), layer=layer)
 
+    @classmethod
+    @update_argument("arguments")
+    def get_halo(cls, spacing: typing.Iterable[float], arguments: BilateralNoiseFilteringParams) -> int:
+        if arguments.dimension_type == DimensionType.Layer:
+            return 0
+        gauss_radius = calculate_operation_radius(arguments.radius, spacing, arguments.dimension_type)
+        # domain kernel radius of SimpleITK.Bilateral is 2.5 of domain sigma
+        return math.ceil(2.5 * max(gauss_radius))
+
 
 def calculate_operation_radius(radius, spacing, gauss_type):
     res = _calculate_operation_radius(radius, spacing, gauss_type)
@@ -118,6 +165,13 @@ class MedianNoiseFiltering(NoiseFilteringBase):
         gauss_radius = [int(x) for x in gauss_radius]
         return median(channel, gauss_radius, layer=layer)
 
+    @classmethod
+    @update_argument("arguments")
+    def get_halo(cls, spacing: typing.Iterable[float], arguments: MedianNoiseFilteringParams) -> int:
+        if arguments.dimension_type == DimensionType.Layer:
+            return 0
+        return int(calculate_operation_radius(arguments.radius, spacing, arguments.dimension_type)[0])
+
 
 class NoiseFilterSelection(AlgorithmSelection, class_methods=["noise_filter"], suggested_base_class=NoiseFilteringBase):
     pass
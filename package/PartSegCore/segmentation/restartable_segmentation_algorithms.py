@@ -11,16 +11,18 @@ from local_migrator import REGISTER, class_to_str, register_class, rename_key
 from pydantic import Field, validator
 
 from PartSegCore.algorithm_describe_base import ROIExtractionProfile
+from PartSegCore.image_operations import get_default_workers
 from PartSegCore.mask_partition_utils import BorderRim as BorderRimBase
 from PartSegCore.mask_partition_utils import MaskDistanceSplit as MaskDistanceSplitBase
 from PartSegCore.project_info import AdditionalLayerDescription
+from PartSegCore.roi_info import label_statistics
 from PartSegCore.segmentation.algorithm_base import (
     ROIExtractionAlgorithm,
     ROIExtractionResult,
     SegmentationLimitException,
 )
 from PartSegCore.segmentation.mu_mid_point import BaseMuMid, MuMidSelection
-from PartSegCore.segmentation.noise_filtering import NoiseFilterSelection
+from PartSegCore.segmentation.noise_filtering import NoiseFilteringBase, NoiseFilterSelection, NoneNoiseFiltering
 from PartSegCore.segmentation.threshold import (
     BaseThreshold,
     DoubleThreshold,
@@ -31,11 +33,19 @@ from PartSegCore.segmentation.threshold import (
     SingleThresholdParams,
     ThresholdSelection,
 )
-from PartSegCore.segmentation.watershed import BaseWatershed, WatershedSelection, calculate_distances_array, get_neigh
+from PartSegCore.segmentation.utils import iter_slabs, tiled_connected_components
+from PartSegCore.segmentation.watershed import (
+    MultiLabelMSO,
+    SprawlCache,
+    WatershedSelection,
+    calculate_distances_array,
+    get_neigh,
+)
 from PartSegCore.universal_const import Units
 from PartSegCore.utils import BaseModel, bisect
-from PartSegCore_compiled_backend.multiscale_opening import PyMSO, calculate_mu_mid
+from PartSegCore_compiled_backend.multiscale_opening import calculate_mu_mid
 from PartSegImage import Channel
+from PartSegImage.image import minimal_dtype
 
 REQUIRE_MASK_STR = "Need mask"
 
@@ -177,6 +187,12 @@ class ThresholdBaseAlgorithm(RestartableAlgorithm, ABC):
     """
     Base class for most threshold Algorithm implemented in PartSeg analysis.
     Created for reduce code repetition.
+
+    If parameters contain positive ``tile_size``, then channel is processed in slabs of ``tile_size`` layers
+    to reduce peak memory usage. Noise filtering is done on slabs extended by halo required by filter
+    (see :py:meth:`.NoiseFilteringBase.get_halo`), threshold is applied per slab if it does not depend on
+    statistics of whole image (see :py:meth:`.BaseThreshold.is_voxel_wise`) and connected components are
+    calculated with :py:func:`.tiled_connected_components`. Result is identical to calculation on whole channel.
     """
 
     __argument_class__ = ThresholdBaseAlgorithmParameters
@@ -218,13 +234,14 @@ class ThresholdBaseAlgorithm(RestartableAlgorithm, ABC):
         :param roi: array with segmentation
         :return: algorithm result description
         """
-        sizes = np.bincount(roi.flat)
-        annotation = {i: {"component": i, "voxels": size} for i, size in enumerate(sizes[1:], 1) if size > 0}
+        statistics = label_statistics(roi)
+        annotation = {i: {"component": i, "voxels": size} for i, size in enumerate(statistics.sizes[1:], 1) if size > 0}
         return ROIExtractionResult(
             roi=roi,
             parameters=self.get_segmentation_profile(),
             additional_layers=self.get_additional_layers(),
             roi_annotation=annotation,
+            roi_statistics=statistics,
         )
 
     def set_image(self, image):
@@ -259,17 +276,56 @@ class ThresholdBaseAlgorithm(RestartableAlgorithm, ABC):
         if restarted or self.parameters["noise_filtering"] != self.new_parameters.noise_filtering:
             self.parameters["noise_filtering"] = deepcopy(self.new_parameters.noise_filtering)
             noise_filtering_parameters = self.new_parameters.noise_filtering
-            self.cleaned_image = NoiseFilterSelection[noise_filtering_parameters.name].noise_filter(
-                self.channel, self.image.spacing, noise_filtering_parameters.values
-            )
+            noise_filter = NoiseFilterSelection[noise_filtering_parameters.name]
+            tile_size = self._tile_size()
+            halo = noise_filter.get_halo(self.image.spacing, noise_filtering_parameters.values) if tile_size else None
+            # without filtering channel is used directly, so there is nothing to save
+            if halo is None or noise_filter is NoneNoiseFiltering:
+                self.cleaned_image = noise_filter.noise_filter(
+                    self.channel, self.image.spacing, noise_filtering_parameters.values
+                )
+            else:
+                self.cleaned_image = self._noise_filter_tiled(
+                    noise_filter, noise_filtering_parameters.values, tile_size, halo
+                )
             return True
         return False
 
+    def _tile_size(self) -> int:
+        """Number of layers in slab if channel should be processed in slabs, 0 otherwise"""
+        tile_size = getattr(self.new_parameters, "tile_size", 0)
+        if not tile_size or self.channel.ndim != 3 or self.channel.shape[0] <= tile_size:
+            return 0
+        return tile_size
+
+    def _noise_filter_tiled(
+        self, noise_filter: type[NoiseFilteringBase], arguments, tile_size: int, halo: int
+    ) -> np.ndarray:
+        result = None
+        for extended, inner, slab in iter_slabs(self.channel.shape[0], tile_size, halo):
+            filtered = noise_filter.noise_filter(self.channel[extended], self.image.spacing, arguments)[inner]
+            if result is None:
+                result = np.empty(self.channel.shape, dtype=filtered.dtype)
+            result[slab] = filtered
+        return result
+
+    def _threshold_tiled(self, tile_size: int) -> np.ndarray:
+        result = np.empty(self.cleaned_image.shape, dtype=np.uint8)
+        for _, _, slab in iter_slabs(self.cleaned_image.shape[0], tile_size):
+            mask = None if self.mask is None else self.mask[slab]
+            result[slab] = self._threshold(self.cleaned_image[slab], mask=mask)
+        return result
+
     def _calculate_threshold(self, restarted: bool):
         """Calculate threshold if cleaned image is changed"""
         if restarted or self.new_parameters.threshold != self.parameters["threshold"]:
             self.parameters["threshold"] = deepcopy(self.new_parameters.threshold)
-            self.threshold_image = self._threshold(self.cleaned_image)
+            threshold = self.new_parameters.threshold
+            tile_size = self._tile_size()
+            if tile_size and type(threshold)[threshold.name].is_voxel_wise(threshold.values):
+                self.threshold_image = self._threshold_tiled(tile_size)
+            else:
+                self.threshold_image = self._threshold(self.cleaned_image)
             return True
         return False
 
@@ -277,10 +333,15 @@ class ThresholdBaseAlgorithm(RestartableAlgorithm, ABC):
         """Calculate components if threshold image is changed"""
         if restarted or self.new_parameters.side_connection != self.parameters["side_connection"]:
             self.parameters["side_connection"] = self.new_parameters.side_connection
-            connect = SimpleITK.ConnectedComponent(
-                SimpleITK.GetImageFromArray(self.threshold_image), not self.new_parameters.side_connection
-            )
-            self.segmentation = SimpleITK.GetArrayFromImage(SimpleITK.RelabelComponent(connect))
+            if tile_size := self._tile_size():
+                self.segmentation = tiled_connected_components(
+                    self.threshold_image, not self.new_parameters.side_connection, tile_size, get_default_workers()
+                )
+            else:
+                connect = SimpleITK.ConnectedComponent(
+                    SimpleITK.GetImageFromArray(self.threshold_image), not self.new_parameters.side_connection
+                )
+                self.segmentation = SimpleITK.GetArrayFromImage(SimpleITK.RelabelComponent(connect))
             self._sizes_array = np.bincount(self.segmentation.flat)
             return True
         return False
@@ -337,18 +398,27 @@ class ThresholdBaseAlgorithm(RestartableAlgorithm, ABC):
         self.cleaned_image = None
         self.mask = None
 
-    def _threshold(self, image, thr=None):
+    def _threshold(self, image, thr=None, mask=None):
+        """
+        :param image: image to threshold
+        :param thr: threshold method, if not provided taken from parameters
+        :param mask: mask of image, :py:attr:`mask` is used if not provided
+        """
         if thr is None:
             thr: BaseThreshold = ThresholdSelection[self.new_parameters.threshold.name]
-        mask, thr_val = thr.calculate_mask(
-            image, self.mask, self.new_parameters.threshold.values, self.threshold_operator
-        )
+        if mask is None:
+            mask = self.mask
+        result, thr_val = thr.calculate_mask(image, mask, self.new_parameters.threshold.values, self.threshold_operator)
         self.threshold_info = thr_val
-        return mask
+        return result
+
+
+TILE_SIZE_DESCRIPTION = "If positive, image is processed in parts of given number of layers to reduce memory usage"
 
 
 class OneThresholdAlgorithmParameters(ThresholdBaseAlgorithmParameters):
     threshold: ThresholdSelection = Field(ThresholdSelection.get_default(), position=2)
+    tile_size: int = Field(0, title="Tile size (layers)", ge=0, le=10**4, description=TILE_SIZE_DESCRIPTION)
 
 
 class OneThresholdAlgorithm(ThresholdBaseAlgorithm, ABC):
@@ -431,6 +501,7 @@ def _rename_algorithm(dkt):
 )
 class RangeThresholdAlgorithmParameters(ThresholdBaseAlgorithmParameters):
     threshold: RangeThresholdSelection = Field(default_factory=RangeThresholdSelection.get_default, position=2)
+    tile_size: int = Field(0, title="Tile size (layers)", ge=0, le=10**4, description=TILE_SIZE_DESCRIPTION)
 
 
 class RangeThresholdAlgorithm(ThresholdBaseAlgorithm):
@@ -442,13 +513,15 @@ class RangeThresholdAlgorithm(ThresholdBaseAlgorithm):
 
     __argument_class__ = RangeThresholdAlgorithmParameters
 
-    def _threshold(self, image, thr=None):
+    def _threshold(self, image, thr=None, mask=None):
         if thr is None:
             thr: BaseThreshold = RangeThresholdSelection[self.new_parameters.threshold.name]
-        mask, thr_val = thr.calculate_mask(image, self.mask, self.new_parameters.threshold.values, operator.ge)
-        mask[mask == 2] = 0
+        if mask is None:
+            mask = self.mask
+        result, thr_val = thr.calculate_mask(image, mask, self.new_parameters.threshold.values, operator.ge)
+        result[result == 2] = 0
         self.threshold_info = thr_val[::-1]
-        return mask
+        return result
 
     @classmethod
     def get_name(cls):
@@ -461,12 +534,12 @@ class TwoLevelThresholdBaseAlgorithm(ThresholdBaseAlgorithm, ABC):
         self.sprawl_area = None
         self._original_output = None
 
-    def _threshold(self, image, thr=None):
+    def _threshold(self, image, thr=None, mask=None):
         if thr is None:
             thr: BaseThreshold = DoubleThresholdSelection[self.new_parameters.threshold.name]
-        mask, thr_val = thr.calculate_mask(
-            image, self.mask, self.new_parameters.threshold.values, self.threshold_operator
-        )
+        if mask is None:
+            mask = self.mask
+        mask, thr_val = thr.calculate_mask(image, mask, self.new_parameters.threshold.values, self.threshold_operator)
         self.threshold_info = thr_val
         self.sprawl_area = (mask >= 1).astype(np.uint8)
         self._original_output = mask
@@ -521,13 +594,16 @@ class BaseThresholdFlowAlgorithm(TwoLevelThresholdBaseAlgorithm, ABC):
         self.finally_segment = None
         self.final_sizes = []
         self.threshold_info = [None, None]
+        self._sprawl_cache = SprawlCache()
 
     def clean(self):
         self.sprawl_area = None
+        self._sprawl_cache.clear()
         super().clean()
 
     def set_image(self, image):
         super().set_image(image)
+        self._sprawl_cache.clear()
         self.threshold_info = [None, None]
 
     def calculation_run(self, report_fun) -> typing.Optional[ROIExtractionResult]:
@@ -553,17 +629,16 @@ class BaseThresholdFlowAlgorithm(TwoLevelThresholdBaseAlgorithm, ABC):
             if self.threshold_operator(self.threshold_info[1], self.threshold_info[0]):
                 self.final_sizes = np.bincount(finally_segment.flat)
                 return self.prepare_result(self.finally_segment)
-            path_sprawl: BaseWatershed = WatershedSelection[self.new_parameters.flow_type.name]
             self.parameters["flow_type"] = self.new_parameters.flow_type
-            new_segment = path_sprawl.sprawl(
+            new_segment = self._sprawl_cache.sprawl(
+                self.new_parameters.flow_type,
                 self.sprawl_area,
-                np.copy(finally_segment),  # TODO add tests for discover this problem
+                finally_segment,
                 self.channel,
                 self.components_num,
                 self.image.spacing,
                 self.new_parameters.side_connection,
                 self.threshold_operator,
-                self.new_parameters.flow_type.values,
                 self.threshold_info[1],
                 self.threshold_info[0],
             )
@@ -700,12 +775,12 @@ class BaseMultiScaleOpening(TwoLevelThresholdBaseAlgorithm, ABC):  # pragma: no
         self.final_sizes = []
         self.threshold_info = [float("nan"), float("nan")]
         self.steps = 0
-        self.mso = PyMSO()
+        self.mso = MultiLabelMSO()
         self.mso.set_use_background(True)
 
     def clean(self):
         self.sprawl_area = None
-        self.mso = PyMSO()
+        self.mso = MultiLabelMSO()
         self.mso.set_use_background(True)
         super().clean()
 
@@ -728,14 +803,10 @@ class BaseMultiScaleOpening(TwoLevelThresholdBaseAlgorithm, ABC):  # pragma: no
         else:
             self.finally_segment = segment_data.roi
             finally_segment = segment_data.roi
-            if np.max(finally_segment) > 250:
-                raise SegmentationLimitException(
-                    "Current implementation of MSO do not support more than 250 components"
-                )
-            components = finally_segment.astype(np.uint8)
+            components = finally_segment.astype(minimal_dtype(np.max(finally_segment) + 1))
             components[components > 0] += 1
             components[self.sprawl_area == 0] = 1
-            self.mso.set_components(components, self.components_num)
+            self.mso.set_components(components)
             restarted = True
 
         if (
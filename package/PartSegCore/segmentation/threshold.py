@@ -47,6 +47,14 @@ class BaseThreshold(AlgorithmDescribeBase, ABC):
     ):
         raise NotImplementedError
 
+    @classmethod
+    def is_voxel_wise(cls, arguments: BaseModel) -> bool:
+        """
+        If result for voxel depends only on its value (not on statistics of whole image),
+        so parts of image could be thresholded separately.
+        """
+        return False
+
 
 class ManualThreshold(BaseThreshold):
     __argument_class__ = SingleThresholdParams
@@ -65,6 +73,10 @@ class ManualThreshold(BaseThreshold):
             result[mask == 0] = 0
         return result, arguments.threshold
 
+    @classmethod
+    def is_voxel_wise(cls, arguments: SingleThresholdParams) -> bool:
+        return True
+
 
 class SitkThreshold(BaseThreshold, ABC):
     __argument_class__ = SimpleITKThresholdParams128
@@ -321,6 +333,14 @@ class DoubleThreshold(BaseThreshold):
         mask2[mask1 > 0] = 2
         return mask2, (thr_val1, thr_val2)
 
+    @classmethod
+    @update_argument("arguments")
+    def is_voxel_wise(cls, arguments: DoubleThresholdParams) -> bool:
+        return all(
+            ThresholdSelection[threshold.name].is_voxel_wise(threshold.values)
+            for threshold in (arguments.core_threshold, arguments.base_threshold)
+        )
+
 
 class RangeThresholdParams(DoubleThresholdParams):
     core_threshold: ThresholdSelection = Field(default_factory=ThresholdSelection.get_default, title="Upper threshold")
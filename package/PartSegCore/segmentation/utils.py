@@ -1,5 +1,11 @@
+import itertools
+import typing
+from concurrent.futures import ThreadPoolExecutor
+
 import numpy as np
 import SimpleITK as sitk
+from scipy.sparse import coo_matrix
+from scipy.sparse.csgraph import connected_components
 
 
 def close_small_holes(image, max_hole_size):
@@ -12,3 +18,109 @@ def close_small_holes(image, max_hole_size):
         rev_conn = sitk.ConnectedComponent(sitk.BinaryNot(sitk.GetImageFromArray(layer)), True)
         layer[...] = sitk.GetArrayFromImage(sitk.BinaryNot(sitk.RelabelComponent(rev_conn, max_hole_size)))
     return image
+
+
+def _slab_axis(shape) -> int:
+    """First axis with size above 1. All previous axes are trivial, so slabs along it are contiguous in memory."""
+    return next((i for i, size in enumerate(shape) if size > 1), 0)
+
+
+def _boundary_pairs(first: np.ndarray, second: np.ndarray, fully_connected: bool) -> np.ndarray:
+    """
+    Pairs of labels from two neighbouring planes which touch each other.
+
+    :return: array of shape (n, 2)
+    """
+    if fully_connected:
+        shifts = list(itertools.product((-1, 0, 1), repeat=first.ndim))
+    else:
+        shifts = [(0,) * first.ndim]
+    pairs = []
+    for shift in shifts:
+        first_slice = tuple(slice(max(s, 0), size + min(s, 0)) for s, size in zip(shift, first.shape))
+        second_slice = tuple(slice(max(-s, 0), size + min(-s, 0)) for s, size in zip(shift, first.shape))
+        first_part = first[first_slice]
+        second_part = second[second_slice]
+        touch = (first_part > 0) & (second_part > 0)
+        pairs.append(np.stack([first_part[touch], second_part[touch]], axis=1))
+    return np.unique(np.concatenate(pairs), axis=0)
+
+
+def iter_slabs(length: int, tile_size: int, halo: int = 0) -> typing.Iterator[tuple[slice, slice, slice]]:
+    """
+    Split axis of given length on slabs of ``tile_size`` layers.
+
+    :param length: length of axis
+    :param tile_size: number of layers in slab
+    :param halo: number of layers added on each side of slab (if available)
+    :return: iterator over triples (slab with halo, position of slab inside slab with halo, slab)
+    """
+    for start in range(0, length, tile_size):
+        stop = min(start + tile_size, length)
+        extended = slice(max(start - halo, 0), min(stop + halo, length))
+        yield extended, slice(start - extended.start, stop - extended.start), slice(start, stop)
+
+
+def tiled_connected_components(mask: np.ndarray, fully_connected: bool, tile_size: int, workers: int = 1) -> np.ndarray:
+    """
+    Equivalent of ``RelabelComponent(ConnectedComponent(mask, fully_connected))`` from SimpleITK
+    calculated in slabs of ``tile_size`` layers.
+
+    Each slab is labeled separately (in ``workers`` threads) directly to output array.
+    Components touching on slab borders are merged with union-find on component graph
+    and output is relabeled in place, slab by slab, so beside output only arrays of size of slab are allocated.
+    Components are ordered by size and, for equal size, by position of first voxel,
+    so the result is identical to the one calculated on whole array.
+
+    :param mask: binary array
+    :param fully_connected: if diagonal neighbours are connected
+    :param tile_size: number of layers in slab
+    :param workers: number of threads used to label slabs
+    :return: labeled array of type uint32
+    """
+    axis = _slab_axis(mask.shape)
+    slabs = [(slice(None),) * axis + (slab,) for _, _, slab in iter_slabs(mask.shape[axis], tile_size)]
+    result = np.empty(mask.shape, dtype=np.uint32)
+
+    def _label(slab) -> int:
+        part = mask[slab]
+        part = part.astype(np.uint8) if part.dtype == bool else np.ascontiguousarray(part)
+        labeled = sitk.ConnectedComponent(sitk.GetImageFromArray(part), fully_connected)
+        result[slab] = sitk.GetArrayFromImage(labeled)
+        return int(sitk.GetArrayViewFromImage(labeled).max())
+
+    if workers > 1:
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            counts = list(executor.map(_label, slabs))
+    else:
+        counts = [_label(x) for x in slabs]
+
+    offsets = np.cumsum([0, *counts])
+    total = int(offsets[-1])
+    sizes = np.zeros(total + 1, dtype=np.int64)
+    for slab, offset in zip(slabs, offsets):
+        part = result[slab]
+        if offset:
+            part[part > 0] += np.uint32(offset)
+        sizes += np.bincount(part.ravel(), minlength=total + 1)
+
+    pairs = [
+        _boundary_pairs(np.take(result[slab1], -1, axis=axis), np.take(result[slab2], 0, axis=axis), fully_connected)
+        for slab1, slab2 in zip(slabs[:-1], slabs[1:])
+    ]
+    pairs = np.concatenate(pairs) if pairs else np.zeros((0, 2), dtype=np.int64)
+    graph = coo_matrix((np.ones(len(pairs), dtype=np.uint8), (pairs[:, 0], pairs[:, 1])), shape=(total + 1,) * 2)
+    _, union = connected_components(graph, directed=False)
+    # label of component in calculation on whole array is order of its first (minimal) provisional label
+    first_label = np.full(union.max() + 1, total + 1, dtype=np.int64)
+    np.minimum.at(first_label, union, np.arange(total + 1))
+    union_sizes = np.bincount(union, weights=sizes).astype(np.int64)
+    union_sizes[union[0]] = 0
+    order = np.lexsort((first_label, -union_sizes))
+    new_labels = np.zeros(union.max() + 1, dtype=np.uint32)
+    new_labels[order] = np.arange(1, order.size + 1, dtype=np.uint32)
+    new_labels[union[0]] = 0
+    lookup = new_labels[union]
+    for slab in slabs:
+        result[slab] = lookup[result[slab]]
+    return result
@@ -2,16 +2,24 @@
 This module contains PartSeg wrappers for function for :py:mod:`..sprawl_utils.find_split`.
 """
 
+import math
 import warnings
+import weakref
 from abc import ABC
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from enum import Enum
-from typing import Any, Callable
+from functools import lru_cache
+from threading import RLock
+from typing import Any, Callable, Optional
 
 import numpy as np
 from local_migrator import update_argument
 from pydantic import Field
+from scipy import ndimage
 
 from PartSegCore.algorithm_describe_base import AlgorithmDescribeBase, AlgorithmSelection
+from PartSegCore.image_operations import get_default_workers
 from PartSegCore.segmentation.algorithm_base import SegmentationLimitException
 from PartSegCore.utils import BaseModel
 from PartSegCore_compiled_backend.multiscale_opening import MuType, PyMSO, calculate_mu
@@ -21,6 +29,10 @@ from PartSegCore_compiled_backend.sprawl_utils.find_split import (
     path_maximum_sprawl,
     path_minimum_sprawl,
 )
+from PartSegImage.image import minimal_dtype
+
+MSO_MAX_COMPONENTS = 250
+"""Maximum number of components in one connected part of sprawl area supported by compiled MSO"""
 
 
 class BaseWatershed(AlgorithmDescribeBase, ABC):
@@ -28,6 +40,11 @@ class BaseWatershed(AlgorithmDescribeBase, ABC):
 
     __argument_class__ = BaseModel
 
+    @classmethod
+    def depends_on_bounds(cls) -> bool:
+        """If result of sprawl depends on ``lower_bound`` and ``upper_bound`` arguments"""
+        return True
+
     @classmethod
     def sprawl(
         cls,
@@ -65,6 +82,10 @@ class PathWatershed(BaseWatershed):
     def get_name(cls):
         return "Path"
 
+    @classmethod
+    def depends_on_bounds(cls) -> bool:
+        return False
+
     @classmethod
     def sprawl(
         cls,
@@ -94,6 +115,10 @@ class DistanceWatershed(BaseWatershed):
     def get_name(cls):
         return "Euclidean"
 
+    @classmethod
+    def depends_on_bounds(cls) -> bool:
+        return False
+
     @classmethod
     def sprawl(
         cls,
@@ -142,6 +167,10 @@ class PathDistanceWatershed(BaseWatershed):
     def get_name(cls):
         return "Path euclidean"
 
+    @classmethod
+    def depends_on_bounds(cls) -> bool:
+        return False
+
     @classmethod
     def sprawl(
         cls,
@@ -182,6 +211,175 @@ class PathDistanceWatershed(BaseWatershed):
         )
 
 
+class _MSORegion:
+    """One connected part of sprawl area with components relabeled to ``uint8``"""
+
+    def __init__(self, box: tuple[slice, ...], region_mask: np.ndarray, labels: np.ndarray, components: np.ndarray):
+        self.box = box
+        self.region_mask = region_mask
+        self.labels = labels
+        """global label of local component, index is local label"""
+        self.components = components
+        self.mso = PyMSO()
+
+
+class MultiLabelMSO:
+    """
+    MultiScale Opening for components stored in array of any unsigned integer type.
+
+    Interface follows :py:class:`PyMSO`. Components array use the same convention:
+    ``0`` is sprawl area, ``1`` is background and components are numbered from ``2``.
+
+    Components from different connected parts of sprawl area (joined with components) never meet,
+    so each part is calculated separately by :py:class:`PyMSO` in thread pool.
+    Compiled implementation stores components as ``uint8``,
+    so number of components in single connected part is still limited by :py:data:`MSO_MAX_COMPONENTS`.
+    For example touching cells, whose sprawl areas form one connected part, count together.
+
+    :param Optional[int] workers: number of threads,
+        default from :py:func:`PartSegCore.image_operations.set_default_workers`
+    """
+
+    def __init__(self, workers: Optional[int] = None):
+        self.workers = workers
+        self._use_background = False
+        self._neighbourhood: Optional[np.ndarray] = None
+        self._distances: Optional[np.ndarray] = None
+        self._components: Optional[np.ndarray] = None
+        self._mu_array: Optional[np.ndarray] = None
+        self._regions: Optional[list[_MSORegion]] = None
+
+    def set_use_background(self, use: bool):
+        self._use_background = use
+
+    def set_neighbourhood(self, neighbourhood: np.ndarray, distances: np.ndarray):
+        self._neighbourhood = neighbourhood
+        self._distances = distances
+        self._regions = None
+
+    def set_components(self, components: np.ndarray):
+        self._components = components
+        self._regions = None
+
+    def set_mu_array(self, mu: np.ndarray):
+        self._mu_array = mu
+        if self._regions is not None:
+            for region in self._regions:
+                region.mso.set_mu_array(np.ascontiguousarray(mu[region.box]))
+
+    def _structure(self) -> np.ndarray:
+        structure = np.zeros((3,) * self._components.ndim, dtype=bool)
+        structure[(1,) * self._components.ndim] = True
+        for shift in self._neighbourhood:
+            structure[tuple(x + 1 for x in shift[-self._components.ndim :])] = True
+        return structure
+
+    def _create_regions(self) -> list[_MSORegion]:
+        if self._components is None or self._neighbourhood is None or self._mu_array is None:
+            raise RuntimeError("Components, neighbourhood and mu array need to be set before run")
+        components = self._components
+        region_labels, _ = ndimage.label(components != 1, self._structure())
+        regions = []
+        for num, region_box in enumerate(ndimage.find_objects(region_labels), start=1):
+            if region_box is None:
+                continue
+            # background voxels around region are sources for FDT
+            box = tuple(
+                slice(max(sl.start - 1, 0), min(sl.stop + 1, size)) for sl, size in zip(region_box, components.shape)
+            )
+            region_mask = region_labels[box] == num
+            region_components = components[box][region_mask]
+            labels = np.unique(region_components)
+            labels = np.concatenate(([0, 1], labels[labels > 1]))
+            if labels.size == 2:
+                continue
+            if labels.size - 2 > MSO_MAX_COMPONENTS:
+                raise SegmentationLimitException(
+                    f"Current implementation of MSO do not support more than {MSO_MAX_COMPONENTS} components "
+                    f"in one connected part of sprawl area (found {labels.size - 2}). "
+                    "Components with touching sprawl areas belong to the same part."
+                )
+            local_components = np.ones(region_mask.shape, dtype=np.uint8)
+            local_components[region_mask] = np.searchsorted(labels, region_components)
+            region = _MSORegion(box, region_mask, labels, local_components)
+            region.mso.set_neighbourhood(self._neighbourhood, self._distances)
+            region.mso.set_components(local_components, labels.size - 1)
+            region.mso.set_use_background(self._use_background)
+            region.mso.set_mu_array(np.ascontiguousarray(self._mu_array[box]))
+            regions.append(region)
+        return regions
+
+    def run_MSO(self, step_limits: int = 1, count_steps_factor: int = 3):
+        """
+        Run MSO on all parts of sprawl area. If called again with bigger ``step_limits``,
+        then calculation is continued.
+
+        :param step_limits: maximum number of steps
+        :param count_steps_factor: limits of constrained dilation steps relative to size of whole array
+        """
+        if self._regions is None:
+            self._regions = self._create_regions()
+        size = self._components.size
+
+        def _run(region: _MSORegion):
+            # keep limit relative to whole array, not to size of cut part
+            region.mso.run_MSO(step_limits, math.ceil(count_steps_factor * size / region.components.size))
+
+        workers = min(self.workers or get_default_workers(), len(self._regions))
+        if workers <= 1:
+            for region in self._regions:
+                _run(region)
+            return
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            # list is used to propagate exceptions
+            list(executor.map(_run, self._regions))
+
+    def steps_done(self) -> int:
+        return max((region.mso.steps_done() for region in self._regions or []), default=0)
+
+    def get_result_catted(self) -> np.ndarray:
+        """Result in the same convention as components array"""
+        result = np.copy(self._components)
+        if not self._use_background:
+            result[result == 1] = 0
+        for region in self._regions or []:
+            local_result = region.mso.get_result_catted()
+            result[region.box][region.region_mask] = region.labels[local_result[region.region_mask]]
+        return result
+
+
+class MuCache:
+    """
+    Cache of last calculated mu array.
+    Stored array is valid as long as ``data`` is the same object and is not modified.
+    It is released when ``data`` is garbage collected.
+    Cache is shared between threads, so entry is read and replaced under lock.
+    """
+
+    def __init__(self):
+        self._lock = RLock()
+        self._entry: Optional[tuple[tuple, weakref.ref, np.ndarray]] = None
+
+    def _release(self, data_ref: weakref.ref):
+        with self._lock:
+            if self._entry is not None and self._entry[1] is data_ref:
+                self._entry = None
+
+    def get(self, data: np.ndarray, lower_bound, upper_bound) -> np.ndarray:
+        """
+        Mu array for :py:class:`MuType.base_mu`. Returned array should not be modified.
+        """
+        key = (data.shape, data.dtype, lower_bound, upper_bound)
+        with self._lock:
+            if self._entry is not None and self._entry[0] == key and self._entry[1]() is data:
+                return self._entry[2]
+            # release previous array before calculation of new one
+            self._entry = None
+            mu_array = calculate_mu(np.ascontiguousarray(data), lower_bound, upper_bound, MuType.base_mu)
+            self._entry = key, weakref.ref(data, self._release), mu_array
+            return mu_array
+
+
 class MSOWatershedParams(BaseModel):
     step_limits: int = Field(100, ge=1, le=1000, title="Steep limits", description="Limits of Steps")
     reflective: bool = False
@@ -189,6 +387,7 @@ class MSOWatershedParams(BaseModel):
 
 class MSOWatershed(BaseWatershed):
     __argument_class__ = MSOWatershedParams
+    _mu_cache = MuCache()
 
     @classmethod
     def get_name(cls):
@@ -209,22 +408,20 @@ class MSOWatershed(BaseWatershed):
         lower_bound,
         upper_bound,
     ):
-        if components_num > 250:
-            raise SegmentationLimitException("Current implementation of MSO do not support more than 250 components")
-        mso = PyMSO()
+        mso = MultiLabelMSO()
         neigh, dist = calculate_distances_array(spacing, get_neigh(side_connection))
-        components_arr = np.copy(core_objects).astype(np.uint8)
+        components_arr = core_objects.astype(minimal_dtype(components_num + 1))
         components_arr[components_arr > 0] += 1
         components_arr[sprawl_area == 0] = 1
         mso.set_neighbourhood(neigh, dist)
-        mso.set_components(components_arr, components_num + 1)
+        mso.set_components(components_arr)
         mso.set_use_background(False)
         try:
-            mu_array = calculate_mu(data.copy("C"), lower_bound, upper_bound, MuType.base_mu)
+            mu_array = cls._mu_cache.get(data, lower_bound, upper_bound)
         except OverflowError as e:
             raise SegmentationLimitException("Wrong range for ") from e
         if arguments.reflective:
-            mu_array[mu_array < 0.5] = 1 - mu_array[mu_array < 0.5]
+            mu_array = np.where(mu_array < 0.5, 1 - mu_array, mu_array)
         mso.set_mu_array(mu_array)
         try:
             mso.run_MSO(arguments.step_limits)
@@ -251,6 +448,82 @@ WatershedSelection.register(FDTWatershed, old_names=["Fuzzy distance sprawl"])
 FlowMethodSelection = WatershedSelection
 
 
+class SprawlCache:
+    """
+    Cache of sprawl results used by restartable flow algorithms.
+
+    Stored results are valid as long as sprawl area, core objects, data and spacing are unchanged.
+    So changing only flow method, its parameters or post-processing (like removing objects touching border)
+    or moving core threshold in a way that does not change core objects do not need new sprawl calculation.
+
+    :param int max_size: maximum number of stored results (for different flow methods and parameters)
+    """
+
+    def __init__(self, max_size: int = 4):
+        self.max_size = max_size
+        self._inputs: Optional[tuple[np.ndarray, np.ndarray, np.ndarray, tuple]] = None
+        self._results: OrderedDict[str, np.ndarray] = OrderedDict()
+
+    def clear(self):
+        self._inputs = None
+        self._results.clear()
+
+    def __len__(self):
+        return len(self._results)
+
+    def _same_inputs(self, sprawl_area: np.ndarray, core_objects: np.ndarray, data: np.ndarray, spacing) -> bool:
+        if self._inputs is None:
+            return False
+        old_sprawl_area, old_core_objects, old_data, old_spacing = self._inputs
+        return (
+            old_data is data
+            and old_spacing == tuple(spacing)
+            and np.array_equal(old_sprawl_area, sprawl_area)
+            and np.array_equal(old_core_objects, core_objects)
+        )
+
+    def sprawl(
+        self,
+        flow_type: WatershedSelection,
+        sprawl_area: np.ndarray,
+        core_objects: np.ndarray,
+        data: np.ndarray,
+        components_num: int,
+        spacing,
+        side_connection: bool,
+        operator: Callable[[Any, Any], bool],
+        lower_bound,
+        upper_bound,
+    ) -> np.ndarray:
+        """
+        Calculate sprawl with method described by ``flow_type`` or return stored result.
+        Description of other arguments in :py:meth:`BaseWatershed.sprawl`.
+        """
+        if not self._same_inputs(sprawl_area, core_objects, data, spacing):
+            self._results.clear()
+            self._inputs = (sprawl_area, np.copy(core_objects), data, tuple(spacing))
+        method: BaseWatershed = WatershedSelection[flow_type.name]
+        bounds = (lower_bound, upper_bound) if method.depends_on_bounds() else None
+        key = repr((flow_type.name, flow_type.values, components_num, side_connection, operator, bounds))
+        if key not in self._results:
+            self._results[key] = method.sprawl(
+                sprawl_area,
+                np.copy(core_objects),
+                data,
+                components_num,
+                spacing,
+                side_connection,
+                operator,
+                flow_type.values,
+                lower_bound,
+                upper_bound,
+            )
+            while len(self._results) > self.max_size:
+                self._results.popitem(last=False)
+        self._results.move_to_end(key)
+        return np.copy(self._results[key])
+
+
 def __getattr__(name):  # pragma: no cover
     if name == "flow_dict":
         warnings.warn(
@@ -280,10 +553,17 @@ class NeighType(Enum):
 
 def calculate_distances_array(spacing, neigh_type: NeighType):
     """
+    Result is cached, so returned arrays are read only.
+
     :param spacing: image spacing
     :param neigh_type: neighbourhood type
     :return: neighbourhood array, distance array
     """
+    return _calculate_distances_array(tuple(spacing), neigh_type)
+
+
+@lru_cache(maxsize=32)
+def _calculate_distances_array(spacing: tuple, neigh_type: NeighType):
     min_dist = min(spacing)
     normalized_spacing = [x / min_dist for x in spacing]
     if len(normalized_spacing) == 2:
@@ -294,7 +574,11 @@ def calculate_distances_array(spacing, neigh_type: NeighType):
     else:
         neighbourhood_array = neighbourhood[: neigh_type.value]
     normalized_spacing = np.array(normalized_spacing)
-    return neighbourhood_array, np.sqrt(np.sum((neighbourhood_array * normalized_spacing) ** 2, axis=1))
+    neighbourhood_array = neighbourhood_array.copy()
+    distances = np.sqrt(np.sum((neighbourhood_array * normalized_spacing) ** 2, axis=1))
+    neighbourhood_array.flags.writeable = False
+    distances.flags.writeable = False
+    return neighbourhood_array, distances
 
 
 def get_neighbourhood(spacing, neigh_type: NeighType):
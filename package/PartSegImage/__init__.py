@@ -7,6 +7,7 @@ from PartSegImage.image import ChannelInfo, ChannelInfoFull, Image
 from PartSegImage.image_reader import (
     CziImageReader,
     GenericImageReader,
+    ImageDescriptor,
     ObsepImageReader,
     OifImagReader,
     TiffFileException,
@@ -23,6 +24,7 @@ __all__ = (
     "GenericImageReader",
     "IMAGEJImageWriter",
     "Image",
+    "ImageDescriptor",
     "ImageWriter",
     "ObsepImageReader",
     "OifImagReader",
@@ -447,6 +447,24 @@ class Image:
         """dtype of image array"""
         return self._channel_arrays[0].dtype
 
+    @property
+    def is_lazy(self) -> bool:
+        """
+        Check if image data is memory mapped from file.
+        For such image only requested part of data is read from disc.
+        """
+        return any(_is_memmap(x) for x in self._channel_arrays)
+
+    def materialize(self) -> Image:
+        """
+        Load whole image data to memory.
+
+        :return: image with data in memory. If data is already in memory then return self.
+        """
+        if not self.is_lazy:
+            return self
+        return self.substitute(data=self._image_data_normalize([np.array(x) for x in self._channel_arrays]))
+
     @staticmethod
     def _reorder_axes(array: np.ndarray, input_axes: str, return_axes) -> np.ndarray:
         if array.ndim != len(input_axes):
@@ -971,6 +989,14 @@ class Image:
         return np.stack(data, axis=cls.axis_order.index("C"))
 
 
+def _is_memmap(array: np.ndarray) -> bool:
+    while array is not None:
+        if isinstance(array, np.memmap):
+            return True
+        array = getattr(array, "base", None)
+    return False
+
+
 def _hex_to_rgb(hex_code: str) -> tuple[int, int, int]:
     """
     Convert a hex color code to an RGB tuple.
@@ -3,6 +3,7 @@ import os.path
 import typing
 from abc import abstractmethod
 from contextlib import suppress
+from functools import lru_cache, wraps
 from importlib.metadata import version
 from io import BytesIO
 from itertools import zip_longest
@@ -106,6 +107,75 @@ class TiffFileException(Exception):
     """
 
 
+class ImageDescriptor(typing.NamedTuple):
+    """
+    Lightweight description of image, which could be read without decoding image data.
+
+    :ivar shape: shape of image data in ``axes`` order
+    :ivar axes: axes order of ``shape``, if there is no ``C`` axis, then shape is shape of single channel
+    :ivar dtype: data type of image
+    :ivar channels: number of channels
+    :ivar spacing: voxel size (in meters)
+    :ivar channel_names: names of channels, could be empty if not stored in file
+    """
+
+    shape: tuple[int, ...]
+    axes: str
+    dtype: str
+    channels: int
+    spacing: tuple[float, ...]
+    channel_names: tuple[str, ...] = ()
+
+    @property
+    def nbytes(self) -> int:
+        """size of decoded image data in bytes"""
+        size = int(np.prod(self.shape, dtype=np.int64)) * np.dtype(self.dtype).itemsize
+        return size if "C" in self.axes else size * self.channels
+
+    @classmethod
+    def from_image(cls, image: Image) -> "ImageDescriptor":
+        return cls(
+            shape=tuple(image.shape),
+            axes=image.array_axis_order,
+            dtype=image.dtype.str,
+            channels=image.channels,
+            spacing=tuple(float(x) for x in image.spacing),
+            channel_names=tuple(image.channel_names),
+        )
+
+    def as_dict(self) -> dict:
+        """Representation which could be serialized to json"""
+        return {key: list(value) if isinstance(value, tuple) else value for key, value in self._asdict().items()}
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "ImageDescriptor":
+        return cls(**{key: tuple(value) if isinstance(value, list) else value for key, value in data.items()})
+
+
+def cache_by_file_state(maxsize: int = 1024):
+    """
+    Decorator for caching result of function which takes file path as only argument.
+    Cache entry is invalidated when file modification time or size changes.
+    """
+
+    def decorator(func):
+        @lru_cache(maxsize=maxsize)
+        def _cached(path: str, _mtime: int, _size: int):
+            return func(path)
+
+        @wraps(func)
+        def wrapper(path: typing.Union[str, Path]):
+            path = os.path.abspath(path)
+            stat = os.stat(path)
+            return _cached(path, stat.st_mtime_ns, stat.st_size)
+
+        wrapper.cache_clear = _cached.cache_clear
+        wrapper.cache_info = _cached.cache_info
+        return wrapper
+
+    return decorator
+
+
 class BaseImageReader:
     """
     Base class for reading image using Christopher Gholike libraries
@@ -230,7 +300,7 @@ class BaseImageReader:
             i = 0
             while i < len(axes_li):
                 if array.shape[i] == 1:
-                    array = array.take(0, i)
+                    array = array[(slice(None),) * i + (0,)]
                     axes_li.pop(i)
                 else:
                     i += 1
@@ -463,15 +533,20 @@ class TiffImageReader(BaseImageReaderBuffer):
 
     image_file: tifffile.TiffFile
     mask_file: tifffile.TiffFile
+
+    :ivar bool memmap: if data should be memory mapped instead of read to memory (if file layout allows)
     """
 
-    def __init__(self, callback_function=None):
+    def __init__(self, callback_function=None, memmap: bool = False):
         super().__init__(callback_function)
+        self.memmap = memmap
         self.shift = (0, 0, 0)
         self.name = ""
         self.metadata = {}
 
-    def read(self, image_path: typing.Union[str, BytesIO, Path], mask_path=None, ext=None) -> Image:
+    def read(
+        self, image_path: typing.Union[str, BytesIO, Path, tifffile.FileHandle], mask_path=None, ext=None
+    ) -> Image:
         """
         Read tiff image from tiff_file
         """
@@ -518,7 +593,7 @@ class TiffImageReader(BaseImageReaderBuffer):
 
             image_file.report_func = report_func
             try:
-                image_data = image_file.asarray()
+                image_data = self._read_image_data(image_file, image_path)
             except ValueError as e:  # pragma: no cover
                 raise TiffFileException(*e.args) from e
             image_data = self.update_array_shape(image_data, axes)
@@ -537,6 +612,101 @@ class TiffImageReader(BaseImageReaderBuffer):
             metadata_dict=self.metadata,
         )
 
+    def _read_image_data(self, image_file: tifffile.TiffFile, image_path) -> np.ndarray:
+        """
+        If :py:attr:`memmap` is set and data of file is stored uncompressed and contiguous
+        then return array memory mapped from file (in copy on write mode),
+        so only accessed planes are read from disc. Otherwise, read whole array.
+        Tiff file embedded in other file (like project archive) could be passed as :py:class:`tifffile.FileHandle`.
+        """
+        series = image_file.series[0]
+        if not self.memmap or series.dataoffset is None:
+            return image_file.asarray()
+        if isinstance(image_path, (str, Path)):
+            return tifffile.memmap(image_path, series=0, mode="c")
+        if isinstance(image_path, tifffile.FileHandle) and image_path.is_file:
+            return image_path.memmap_array(
+                image_file.byteorder + series.dtype.char, series.shape, series.dataoffset, mode="c"
+            )
+        return image_file.asarray()
+
+    @classmethod
+    def read_image(
+        cls,
+        image_path: typing.Union[str, Path, BytesIO],
+        mask_path=None,
+        callback_function: typing.Optional[typing.Callable] = None,
+        default_spacing: typing.Optional[tuple[float, float, float]] = None,
+        memmap: bool = False,
+    ) -> Image:
+        """
+        read image file with optional mask file
+
+        :param image_path: path or opened file contains image
+        :param mask_path:
+        :param callback_function: function for provide information about progress in reading file (for progressbar)
+        :param default_spacing: used if file do not contains information about spacing
+            (or metadata format is not supported)
+        :param memmap: if possible, memory map image data instead of reading it to memory.
+            Use :py:meth:`.Image.materialize` to load whole data.
+        :return: image
+        """
+        instance = cls(callback_function, memmap=memmap)
+        if default_spacing is not None:
+            instance.set_default_spacing(default_spacing)
+        return instance.read(image_path, mask_path)
+
+    @staticmethod
+    def read_shape(image_path: typing.Union[str, BytesIO, Path]) -> tuple[tuple[int, ...], np.dtype]:
+        """
+        Read shape and data type of first series of tiff file without decoding image data.
+
+        :param image_path: path to image or buffer
+        :return: shape in file axes order and data type
+        """
+        with tifffile.TiffFile(image_path) as image_file:
+            series = image_file.series[0]
+            return tuple(series.shape), np.dtype(series.dtype)
+
+    @classmethod
+    def read_metadata(
+        cls, image_path: typing.Union[str, BytesIO, Path, tifffile.FileHandle], default_spacing=None
+    ) -> ImageDescriptor:
+        """
+        Read description of first series of tiff file (shape, channels, spacing) using only file header.
+        Image data are not decoded.
+
+        :param image_path: path to image or buffer
+        :param default_spacing: spacing used if it is not stored in file
+        """
+        instance = cls()
+        if default_spacing is not None:
+            instance.set_default_spacing(default_spacing)
+        instance.spacing, instance.channel_names = instance.default_spacing, []
+        with tifffile.TiffFile(image_path) as image_file:
+            series = image_file.series[0]
+            if image_file.is_lsm:
+                instance.read_lsm_metadata(image_file)
+            elif image_file.is_imagej:
+                instance.read_imagej_metadata(image_file)
+            elif image_file.is_ome:
+                instance.read_ome_metadata(image_file)
+            else:
+                x_spacing, y_spacing = instance.read_resolution_from_tags(image_file)
+                instance.spacing = instance.default_spacing[0], y_spacing, x_spacing
+            axes = series.axes
+            shape = tuple(series.shape)
+            dtype = np.dtype(series.dtype).str
+        channels = shape[axes.index("C")] if "C" in axes else 1
+        return ImageDescriptor(
+            shape=shape,
+            axes=axes,
+            dtype=dtype,
+            channels=channels,
+            spacing=tuple(float(x) for x in instance.spacing),
+            channel_names=tuple(str(x) for x in instance.channel_names),
+        )
+
     @staticmethod
     def verify_mask(mask_file, image_file):
         """
@@ -653,6 +823,22 @@ class TiffImageReader(BaseImageReaderBuffer):
         self.metadata = image_file.lsm_metadata
 
 
+TIFF_EXTENSIONS = (".tif", ".tiff", ".lsm")
+
+
+@cache_by_file_state()
+def probe_image(image_path: typing.Union[str, Path]) -> ImageDescriptor:
+    """
+    Read description of image. Result is cached until file is modified.
+    For tiff files only header is read, other formats are read whole.
+
+    :param image_path: path to image
+    """
+    if os.path.splitext(image_path)[1].lower() in TIFF_EXTENSIONS:
+        return TiffImageReader.read_metadata(image_path)
+    return ImageDescriptor.from_image(GenericImageReader.read_image(image_path))
+
+
 name_to_scalar = {
     "micron": 10**-6,
     "µm": 10**-6,
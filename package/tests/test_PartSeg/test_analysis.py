@@ -46,6 +46,24 @@ class TestMeasurementWidget:
         assert widget.info_field.columnCount() == 2
         assert widget.info_field.rowCount() == 2
 
+    @pytest.mark.enablethread
+    @pytest.mark.enabledialog
+    def test_disk_cache(self, qtbot, analysis_segmentation, part_settings):
+        widget = MeasurementWidget(part_settings)
+        qtbot.addWidget(widget)
+        assert part_settings.measurement_cache is None
+        assert widget.cache_info.text() == ""
+        widget.disk_cache.setChecked(True)
+        assert part_settings.measurement_cache is not None
+        part_settings.set_project_info(analysis_segmentation)
+        widget.measurement_type.setCurrentIndex(1)
+        widget.recalculate_button.click()
+        widget.recalculate_button.click()
+        assert part_settings.measurement_cache.hits > 0
+        assert "hits" in widget.cache_info.text()
+        widget.disk_cache.setChecked(False)
+        assert part_settings.measurement_cache is None
+
     @pytest.mark.enablethread
     @pytest.mark.enabledialog
     def test_base2(self, qtbot, analysis_segmentation2, part_settings):
@@ -576,4 +576,4 @@ class TestROIExtractionProfile:
             algorithm=LowerThresholdAlgorithm.get_name(),
             values=LowerThresholdAlgorithm.get_default_values(),
         )
-        assert prof2.pretty_print(AnalysisAlgorithmSelection).count("\n") == 7
+        assert prof2.pretty_print(AnalysisAlgorithmSelection).count("\n") == 8
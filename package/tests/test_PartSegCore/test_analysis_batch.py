@@ -1,9 +1,13 @@
 # pylint: disable=no-self-use
 import json
+import logging
 import os
 import shutil
 import sys
+import tarfile
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
 from glob import glob
 from itertools import dropwhile
 from typing import Callable
@@ -13,16 +17,24 @@ import pandas as pd
 import pytest
 import tifffile
 
+from PartSegCore import image_operations
 from PartSegCore.algorithm_describe_base import ROIExtractionProfile
 from PartSegCore.analysis import AnalysisAlgorithmSelection
 from PartSegCore.analysis.batch_processing import batch_backend
 from PartSegCore.analysis.batch_processing.batch_backend import (
     CalculationManager,
     CalculationProcess,
+    FileData,
     ResponseData,
     SheetData,
     do_calculation,
 )
+from PartSegCore.analysis.batch_processing.scheduler import (
+    CostCalibration,
+    estimate_file_cost,
+    format_cost_report,
+    order_by_cost,
+)
 from PartSegCore.analysis.calculation_plan import (
     Calculation,
     CalculationPlan,
@@ -37,9 +49,10 @@ from PartSegCore.analysis.calculation_plan import (
     RootType,
     Save,
 )
+from PartSegCore.analysis.io_utils import ProjectTuple
 from PartSegCore.analysis.measurement_base import AreaType, Leaf, MeasurementEntry, Node, PerComponent
-from PartSegCore.analysis.measurement_calculation import MeasurementProfile
-from PartSegCore.analysis.save_functions import save_dict
+from PartSegCore.analysis.measurement_calculation import ComponentsInfo, MeasurementProfile, MeasurementResult
+from PartSegCore.analysis.save_functions import SaveAsTiff, SaveProject, save_dict
 from PartSegCore.image_operations import RadiusType
 from PartSegCore.io_utils import LoadPlanExcel, SaveBase
 from PartSegCore.json_hooks import PartSegEncoder
@@ -678,6 +691,99 @@ class TestCalculationProcess:
         assert isinstance(res, list)
         assert isinstance(res[0], ResponseData)
 
+    def test_do_calculation_prefetched(self, tmp_path, simple_plan, monkeypatch):
+        monkeypatch.setattr(image_operations, "_default_workers", 4)
+        data = np.zeros((1, 10, 40, 40), dtype=np.uint16)
+        data[0, 2:8, 5:35, 5:35] = 20000
+        file_path = str(tmp_path / "image.tif")
+        ImageWriter.save(Image(data, spacing=(1, 1, 1), axes_order="CZYX"), file_path)
+        save_desc = Save(
+            suffix="_test",
+            directory="",
+            algorithm=SaveAsTiff.get_name(),
+            short_name=SaveAsTiff.get_short_name(),
+            values=SaveAsTiff.get_default_values(),
+        )
+        calc = Calculation(
+            [file_path],
+            base_prefix=str(tmp_path),
+            result_prefix=str(tmp_path / "result"),
+            measurement_file_path=str(tmp_path / "test3.xlsx"),
+            sheet_name="Sheet1",
+            calculation_plan=simple_plan(RootType.Image, save_desc),
+            voxel_size=(1, 1, 1),
+        )
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            prefetched = executor.submit(do_calculation.prefetch, (0, file_path), calc)
+            index, res = do_calculation((0, file_path), calc, prefetched=prefetched)
+        assert index == 0
+        assert isinstance(res[0], ResponseData)
+        assert os.path.exists(tmp_path / "result" / "image_test.tiff")
+        assert image_operations.get_default_workers() == 1
+
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            prefetched = executor.submit(do_calculation.prefetch, (0, str(tmp_path / "missing.tif")), calc)
+            _, res = do_calculation((0, str(tmp_path / "missing.tif")), calc, prefetched=prefetched)
+        assert isinstance(res[0][0], Exception)
+
+    @pytest.mark.parametrize("workers", [1, 2])
+    def test_do_calculation_time_series(self, tmp_path, simple_measurement_list, workers):
+        data = np.zeros((3, 1, 10, 20, 20), dtype=np.uint16)
+        roi = np.zeros((3, 10, 20, 20), dtype=np.uint8)
+        for t in range(3):
+            roi[t, 2:4, 2 : 5 + t, 2:8] = 1
+        file_path = str(tmp_path / "image.tif")
+        image = Image(data, spacing=(1, 1, 1), axes_order="TCZYX", file_path=file_path)
+        measurement = simple_measurement_list.copy(update={"channel": 0, "workers": workers})
+        calc = Calculation(
+            [file_path],
+            base_prefix=str(tmp_path),
+            result_prefix=str(tmp_path),
+            measurement_file_path=str(tmp_path / "test.xlsx"),
+            sheet_name="Sheet1",
+            calculation_plan=CalculationPlan(
+                tree=CalculationTree(RootType.Project, [CalculationTree(measurement, [])]), name="test"
+            ),
+            voxel_size=(1, 1, 1),
+        )
+        project = ProjectTuple(file_path, image, roi_info=ROIInfo(roi).fit_to_image(image))
+        res = CalculationProcess().do_calculation(FileCalculation(file_path, calc), project)
+        assert [x.path_to_file for x in res] == [f"image.tif [T={t}]" for t in range(3)]
+        for t, response in enumerate(res):
+            expected = measurement.measurement_profile.calculate(image, 0, roi, Units.µm, time=t)
+            assert response.values[0]["Segmentation Volume"] == expected["Segmentation Volume"]
+
+    def test_do_calculation_save_error(self, tmp_path, simple_plan, monkeypatch):
+        data = np.zeros((1, 10, 40, 40), dtype=np.uint16)
+        data[0, 2:8, 5:35, 5:35] = 20000
+        file_path = str(tmp_path / "image.tif")
+        ImageWriter.save(Image(data, spacing=(1, 1, 1), axes_order="CZYX"), file_path)
+
+        def _raise(*_args, **_kwargs):
+            raise OSError("save error")
+
+        monkeypatch.setattr(SaveAsTiff, "save", _raise)
+        save_desc = Save(
+            suffix="_test",
+            directory="",
+            algorithm=SaveAsTiff.get_name(),
+            short_name=SaveAsTiff.get_short_name(),
+            values=SaveAsTiff.get_default_values(),
+        )
+        calc = Calculation(
+            [file_path],
+            base_prefix=str(tmp_path),
+            result_prefix=str(tmp_path),
+            measurement_file_path=str(tmp_path / "test3.xlsx"),
+            sheet_name="Sheet1",
+            calculation_plan=simple_plan(RootType.Image, save_desc),
+            voxel_size=(1, 1, 1),
+        )
+        calc_process = CalculationProcess()
+        res = calc_process.do_calculation(FileCalculation(file_path, calc))
+        assert isinstance(res[0][0], OSError)
+        assert calc_process.save_executor is None
+
     def test_do_calculation_calculation_process(self, tmpdir, data_test_dir, calculation_plan3):
         file_path = os.path.join(data_test_dir, "stack1_components", "stack1_component1.tif")
         calc = Calculation(
@@ -818,7 +924,186 @@ class TestSheetData:
         assert sheet_data.get_data_to_write()[0] == "test_name"
         assert "wait_rows=0" in repr(sheet_data)
 
+    def test_get_new_data(self):
+        cols = [("aa", "nm"), ("bb", "nm")]
+        sheet_data = SheetData("test_name", cols)
+        sheet_data.add_data(["aa", 1, 2], 1)
+        sheet_data.add_data(["bb", 3, 4], 0)
+        name, df = sheet_data.get_new_data()
+        assert name == "test_name"
+        assert list(df["name"]["units"]) == ["bb", "aa"]
+        sheet_data.add_data(["cc", 5, 6], 2)
+        assert len(sheet_data.get_new_data()[1]) == 1
+        assert len(sheet_data.get_new_data()[1]) == 0
+        assert list(sheet_data.get_data_to_write()[1]["name"]["units"]) == ["bb", "aa", "cc"]
+
+    def test_same_index_order(self):
+        sheet_data = SheetData("test_name", [("aa", "nm")])
+        for t in [0, 2, 10]:
+            sheet_data.add_data([f"a [T={t}]", None if t == 2 else t], 1)
+        sheet_data.add_data(["b", 1], 0)
+        assert list(sheet_data.get_new_data()[1]["name"]["units"]) == ["b", "a [T=0]", "a [T=2]", "a [T=10]"]
+
+
+class TestFileData:
+    @staticmethod
+    def _response(file_path, value):
+        result = MeasurementResult(ComponentsInfo(np.arange(0), np.arange(0), {}))
+        result.set_filename(file_path)
+        result["Segmentation Volume"] = value, "µm**3", (PerComponent.No, AreaType.ROI)
+        return ResponseData(file_path, [result])
+
+    def test_spill_and_excel(self, tmp_path, calculation_plan_dummy):
+        file_list = [str(tmp_path / f"file_{i}.tif") for i in range(5)]
+        calc = Calculation(
+            file_list,
+            base_prefix=str(tmp_path),
+            result_prefix=str(tmp_path),
+            measurement_file_path=str(tmp_path / "test.xlsx"),
+            sheet_name="Sheet1",
+            calculation_plan=calculation_plan_dummy,
+            voxel_size=(1, 1, 1),
+        )
+        file_data = FileData(calc, write_threshold=2)
+        for i, file_path in enumerate(file_list[:4]):
+            file_data.wrote_data(calc.uuid, self._response(file_path, i), i)
+        file_data.wrote_errors(file_list[4], "test error")
+        file_data.dump_data()
+        for _ in range(100):
+            if file_data.finished():
+                break
+            time.sleep(0.05)
+        assert not (tmp_path / "test.xlsx").exists()
+        df = pd.read_csv(tmp_path / "test.xlsx.partial" / "0_Sheet1.csv", index_col=0, header=[0, 1])
+        assert df.shape == (4, 2)
+        assert list(df.index) == [0, 1, 2, 3]
+        assert (tmp_path / "test.xlsx.partial" / "Errors.csv").exists()
+
+        file_data.dump_data(full=True)
+        file_data.finish()
+        file_data.write_thread.join()
+        assert not (tmp_path / "test.xlsx.partial").exists()
+        df = pd.read_excel(tmp_path / "test.xlsx", index_col=0, header=[0, 1], engine=ENGINE)
+        assert df.shape == (4, 2)
+        assert list(df["name"]["units"]) == file_list[:4]
+
+
+def test_estimate_file_cost(tmp_path):
+    tifffile.imwrite(tmp_path / "test.tif", np.zeros((5, 20, 30), dtype=np.uint16))
+    (tmp_path / "test.txt").write_text("a" * 100)
+    (tmp_path / "broken.tif").write_text("a" * 10)
+    assert estimate_file_cost(str(tmp_path / "test.tif")) == 5 * 20 * 30 * 2
+    assert estimate_file_cost(str(tmp_path / "test.txt")) == 100
+    assert estimate_file_cost(str(tmp_path / "broken.tif")) == 10
+    assert estimate_file_cost(str(tmp_path / "missing.tif")) == 0
+
+
+def test_estimate_project_cost(tmp_path, analysis_segmentation2):
+    SaveProject.save(tmp_path / "test.tgz", analysis_segmentation2)
+    assert estimate_file_cost(str(tmp_path / "test.tgz")) == analysis_segmentation2.image.get_data().nbytes
+    # projects saved by older versions are not decompressed
+    with tarfile.open(tmp_path / "old.tgz", "w:gz") as tar_file:
+        tar_file.add(tmp_path / "test.tgz", arcname="image.tif")
+        tar_file.add(tmp_path / "test.tgz", arcname="metadata.json")
+    assert estimate_file_cost(str(tmp_path / "old.tgz")) == os.path.getsize(tmp_path / "old.tgz")
+
+
+def test_order_by_cost(tmp_path):
+    file_list = []
+    for i, size in enumerate([10, 30, 20, 30]):
+        file_path = tmp_path / f"file_{i}.tif"
+        tifffile.imwrite(file_path, np.zeros((size, size), dtype=np.uint8))
+        file_list.append(str(file_path))
+    ordered = order_by_cost(file_list)
+    assert [x[0] for x in ordered] == [1, 3, 2, 0]
+    assert [x[1] for x in ordered] == [file_list[i] for i in [1, 3, 2, 0]]
+
+
+def test_cost_calibration():
+    calibration = CostCalibration()
+    assert calibration.time_per_cost == 0
+    calibration.add_prediction(1, "a.tif", 100)
+    calibration.add_prediction(2, "b.tif", 300)
+    calibration.add_prediction(3, "c.tif", 50)
+    calibration.add_measurement(4, 10)
+    assert calibration.report() == []
+    calibration.add_measurement(1, 2)
+    calibration.add_measurement(2, 6)
+    assert calibration.time_per_cost == pytest.approx(0.02)
+    assert calibration.remaining_time() == pytest.approx(1)
+    report = calibration.report()
+    assert [x.file_path for x in report] == ["a.tif", "b.tif"]
+    assert report[0].predicted_time == pytest.approx(2)
+    assert report[1].measured_time == 6
+    assert [x.file_path for x in calibration.report([2, 3])] == ["b.tif"]
+    text = format_cost_report(report)
+    assert text.startswith("Files: 2, predicted time: 8.0 s, measured time: 8.0 s")
+    assert text.index("a.tif") < text.index("b.tif")
+    assert format_cost_report([]) == "No finished tasks"
+
+
+@pytest.fixture
+def blocked_order_by_cost(monkeypatch):
+    ordering = threading.Event()
+
+    def _order_by_cost(file_list):
+        ordering.wait(30)
+        return order_by_cost(file_list)
+
+    monkeypatch.setattr(batch_backend, "order_by_cost", _order_by_cost)
+    return ordering
+
+
+@pytest.fixture
+def save_calculation(tmp_path, simple_plan):
+    data = np.zeros((1, 10, 40, 40), dtype=np.uint16)
+    data[0, 2:8, 5:35, 5:35] = 20000
+    file_list = []
+    for i in range(2):
+        file_list.append(str(tmp_path / f"image{i}.tif"))
+        ImageWriter.save(Image(data, spacing=(1, 1, 1), axes_order="CZYX"), file_list[-1])
+    save_desc = Save(
+        suffix="_test",
+        directory="",
+        algorithm=SaveAsTiff.get_name(),
+        short_name=SaveAsTiff.get_short_name(),
+        values=SaveAsTiff.get_default_values(),
+    )
+    return Calculation(
+        file_list,
+        base_prefix=str(tmp_path),
+        result_prefix=str(tmp_path / "result"),
+        measurement_file_path=str(tmp_path / "test.xlsx"),
+        sheet_name="Sheet1",
+        calculation_plan=simple_plan(RootType.Image, save_desc),
+        voxel_size=(1, 1, 1),
+    )
+
+
+def test_calculation_manager_order_in_background(tmp_path, save_calculation, blocked_order_by_cost, caplog):
+    manager = CalculationManager()
+    manager.add_calculation(save_calculation)
+    # files are not ordered yet, but calculation is pending
+    assert manager.has_work
+    assert manager.batch_manager.work_task == 0
+    blocked_order_by_cost.set()
+    with caplog.at_level(logging.INFO):
+        wait_for_calculation(manager)
+    assert os.path.exists(tmp_path / "result" / "image0_test.tiff")
+    assert len(manager.get_cost_report(save_calculation)) == 2
+    assert "Files: 2, predicted time" in caplog.text
+
+
+def test_calculation_manager_cancel_before_order(tmp_path, save_calculation, blocked_order_by_cost):
+    manager = CalculationManager()
+    manager.add_calculation(save_calculation)
+    manager.cancel_calculation(save_calculation)
+    blocked_order_by_cost.set()
+    wait_for_calculation(manager)
+    assert manager.counter_dict[save_calculation.uuid] == 2
+    assert not os.path.exists(tmp_path / "result" / "image0_test.tiff")
+
 
 def test_calculation_plan_serialize(calculation_plan_long):
     text = json.dumps(calculation_plan_long, cls=PartSegEncoder, indent=2)
-    assert text.count("\n") == 7627
+    assert text.count("\n") == 7647
@@ -3,7 +3,7 @@
 import numpy as np
 import pytest
 
-from PartSegCore.image_operations import gaussian, median
+from PartSegCore.image_operations import dilate, erode, gaussian, get_default_workers, median, set_default_workers
 
 
 class TestImageOperation:
@@ -24,3 +24,27 @@ class TestImageOperation:
         data[slices] = 1
         res = method(data, 2, per_layer)
         assert not np.all(res == data)
+
+    @pytest.mark.parametrize("method", [gaussian, median, dilate, erode])
+    @pytest.mark.parametrize("per_layer", [True, False])
+    def test_filter_workers(self, method, per_layer):
+        data = np.random.default_rng(0).integers(0, 100, size=(3, 4, 10, 10), dtype=np.uint16)
+        data_copy = np.copy(data)
+        radius = [1] * (2 if per_layer else 3)
+        res1 = method(data, radius, per_layer, workers=1)
+        res4 = method(data, radius, per_layer, workers=4)
+        assert np.array_equal(data, data_copy)
+        assert res4.dtype == data.dtype
+        assert np.array_equal(res1, res4)
+        assert np.array_equal(res1[1], method(data[1], radius, per_layer))
+
+
+def test_set_default_workers():
+    workers = get_default_workers()
+    try:
+        set_default_workers(3)
+        assert get_default_workers() == 3
+        set_default_workers(None)
+        assert get_default_workers() >= 1
+    finally:
+        set_default_workers(workers)
@@ -19,12 +19,28 @@ import tifffile
 
 from PartSegCore import UNIT_SCALE, Units
 from PartSegCore.algorithm_describe_base import ROIExtractionProfile
-from PartSegCore.analysis import ProjectTuple
+from PartSegCore.analysis import ProjectTuple, chunked_project
 from PartSegCore.analysis.calculation_plan import CalculationPlan, MaskSuffix, MeasurementCalculate
-from PartSegCore.analysis.load_functions import LoadImageForBatch, LoadProject
+from PartSegCore.analysis.io_utils import create_history_element_from_project
+from PartSegCore.analysis.load_functions import (
+    LoadImageForBatch,
+    LoadProject,
+    LoadProjectChunked,
+    load_project,
+    probe_project,
+    probe_project_image,
+)
 from PartSegCore.analysis.measurement_base import Leaf, MeasurementEntry
 from PartSegCore.analysis.measurement_calculation import MEASUREMENT_DICT, MeasurementProfile
-from PartSegCore.analysis.save_functions import SaveAsNumpy, SaveAsTiff, SaveCmap, SaveProject, SaveXYZ
+from PartSegCore.analysis.save_functions import (
+    SaveAsNumpy,
+    SaveAsTiff,
+    SaveCmap,
+    SaveProject,
+    SaveProjectChunked,
+    SaveXYZ,
+)
+from PartSegCore.history_store import HistoryStore
 from PartSegCore.io_utils import (
     LoadBase,
     LoadPlanExcel,
@@ -34,6 +50,7 @@ from PartSegCore.io_utils import (
     SaveMaskAsTiff,
     SaveROIAsNumpy,
     SaveScreenshot,
+    WrongFileTypeException,
     find_problematic_entries,
     find_problematic_leafs,
     load_metadata_base,
@@ -53,6 +70,7 @@ from PartSegCore.mask.io_functions import (
     SaveComponents,
     SaveParametersJSON,
     SaveROI,
+    probe_stack_segmentation,
     save_components,
 )
 from PartSegCore.mask_create import MaskProperty
@@ -197,6 +215,47 @@ class TestHistoryElement:
         assert mask2 is None
         assert np.all(roi_info2.roi == roi_info.roi)
 
+    def test_sparse_diff(self, mask_prop):
+        store = HistoryStore()
+        data = np.zeros((20, 100, 100), dtype=np.uint16)
+        data[2:18, 10:90, 10:90] = np.random.default_rng(0).integers(1, 100, size=(16, 80, 80), dtype=np.uint16)
+        mask = (data > 0).astype(np.uint8)
+        elem = HistoryElement.create(ROIInfo(data), mask, {}, mask_prop, store=store)
+        data2 = np.copy(data)
+        data2[5, 20:30, 20:30] = 50
+        roi_info2 = ROIInfo(data2)
+        elem2 = HistoryElement.create(roi_info2, mask, {}, mask_prop, previous=elem, store=store)
+        data2 = np.copy(roi_info2.roi)
+        roi_info2.roi[:] = 0
+        assert not elem.arrays.is_diff
+        assert elem2.arrays.is_diff
+        roi_info, mask2 = elem2.get_roi_info_and_mask()
+        assert np.array_equal(roi_info.roi, data2)
+        assert np.array_equal(mask, mask2)
+        with np.load(elem2.get_arrays_buffer()) as arrays:
+            assert set(arrays.keys()) == {"roi", "mask"}
+            assert np.array_equal(arrays["roi"], data2)
+
+    def test_memory_budget(self, mask_prop, tmp_path):
+        store = HistoryStore(memory_budget=2000, directory=str(tmp_path))
+        rng = np.random.default_rng(0)
+        elements = [
+            HistoryElement.create(
+                ROIInfo(rng.integers(0, 10, size=(30, 30), dtype=np.uint8)), None, {}, mask_prop, store=store
+            )
+            for _ in range(4)
+        ]
+        for element in elements:
+            element.arrays.wait()
+        assert store.memory_size <= 2000
+        assert not elements[0].arrays.in_memory
+        assert elements[-1].arrays.in_memory
+        assert len(list(tmp_path.iterdir())) >= 1
+        roi_info, _ = elements[0].get_roi_info_and_mask()
+        assert roi_info.roi.shape == (30, 30)
+        del elements, element
+        assert store.memory_size == 0
+
 
 class TestSaveHistory:
     def test_save_roi_info_project_tuple(self, analysis_segmentation2, tmp_path):
@@ -472,6 +531,17 @@ class TestSegmentationMask:
             tf.getmember("history/history.json")
             tf.getmember("history/arrays_0.npz")
 
+    def test_probe_stack_segmentation(self, tmp_path, stack_segmentation1):
+        SaveROI.save(tmp_path / "test1.seg", stack_segmentation1, {"relative_path": False})
+        descriptor = probe_stack_segmentation(tmp_path / "test1.seg")
+        assert descriptor.image is None
+        assert descriptor.roi_shape == stack_segmentation1.roi_info.roi.shape
+        assert descriptor.roi_components == 4
+        assert descriptor.selected_components == (1, 3)
+        assert not descriptor.has_mask
+        with tarfile.open(tmp_path / "test1.seg") as tf:
+            assert tf.getnames()[0] == "metadata.json"
+
     def test_load_project_with_history(self, tmp_path, stack_segmentation1, mask_property):
         image_location = tmp_path / "test1.tif"
         SaveAsTiff.save(image_location, stack_segmentation1)
@@ -635,6 +705,106 @@ class TestSaveFunctions:
         LoadProject.load([os.path.join(tmpdir, "test1.tgz")])
         # TODO add more
 
+    def test_chunked_project(self, tmp_path, analysis_segmentation2, mask_property, monkeypatch):
+        monkeypatch.setattr(chunked_project, "CHUNK_SIZE", 1000)
+        roi = analysis_segmentation2.roi_info.roi
+        project = dataclasses.replace(
+            analysis_segmentation2,
+            roi_info=ROIInfo(roi, annotations={1: "a"}, alternative={"alt": roi * 2}),
+            history=[create_history_element_from_project(analysis_segmentation2, mask_property)],
+            algorithm_parameters={"algorithm_name": "Lower threshold", "values": {"threshold": 10}},
+            additional_layers={"layer": AdditionalLayerDescription(data=roi, layer_type="labels", name="aa")},
+            points=np.array([[0, 1, 2, 3]]),
+        )
+        SaveProjectChunked.save(tmp_path / "test.psz", project)
+        loaded = LoadProjectChunked.load([tmp_path / "test.psz"])
+        assert loaded.file_path == str(tmp_path / "test.psz")
+        assert np.array_equal(loaded.image.get_data(), project.image.get_data())
+        assert loaded.image.spacing == project.image.spacing
+        assert loaded.image.channel_names == project.image.channel_names
+        assert np.array_equal(loaded.roi_info.roi, roi)
+        assert np.array_equal(loaded.roi_info.alternative["alt"], roi * 2)
+        assert loaded.roi_info.annotations == {1: "a"}
+        assert np.array_equal(loaded.mask, project.mask)
+        assert np.array_equal(loaded.image.mask, project.image.fit_mask_to_image(project.mask))
+        assert np.array_equal(loaded.points, project.points)
+        assert loaded.algorithm_parameters == project.algorithm_parameters
+        assert np.array_equal(loaded.additional_layers["layer"].data, roi)
+        assert loaded.additional_layers["layer"].name == "aa"
+        assert len(loaded.history) == 1
+        assert loaded.history[0].mask_property == mask_property
+        assert np.array_equal(loaded.history[0].get_roi_info_and_mask()[0].roi, roi)
+        with chunked_project.ChunkedProjectReader(tmp_path / "test.psz") as reader:
+            assert reader.metadata["arrays"]["roi"]["chunks"] > 1
+            assert np.array_equal(reader.read_array("roi"), roi)
+            assert reader.read_algorithm_parameters() == project.algorithm_parameters
+
+    def test_probe_project(self, tmp_path, analysis_segmentation2):
+        project = dataclasses.replace(
+            analysis_segmentation2, algorithm_parameters={"algorithm_name": "Lower threshold", "values": {}}
+        )
+        image = project.image
+        SaveProject.save(tmp_path / "test1.tgz", project)
+        descriptor = probe_project(tmp_path / "test1.tgz")
+        assert descriptor.image.shape == image.shape
+        assert descriptor.image.channels == image.channels
+        assert descriptor.image.spacing == image.spacing
+        assert descriptor.image.nbytes == image.get_data().nbytes
+        assert descriptor.roi_shape == project.roi_info.roi.shape
+        assert descriptor.roi_components == 4
+        assert descriptor.has_mask
+        assert descriptor.algorithm_name == "Lower threshold"
+        assert probe_project(tmp_path / "test1.tgz") is descriptor
+        assert probe_project_image(tmp_path / "test1.tgz") == descriptor.image
+
+        SaveProjectChunked.save(tmp_path / "test1.psz", project)
+        assert probe_project(tmp_path / "test1.psz") == descriptor._replace(file_path=str(tmp_path / "test1.psz"))
+        assert probe_project_image(tmp_path / "test1.psz") == descriptor.image
+
+        # layout of projects saved by older versions, metadata after image and without description
+        with tarfile.open(tmp_path / "test1.tgz") as src, tarfile.open(tmp_path / "test2.tgz", "w:gz") as dst:
+            metadata = json.loads(src.extractfile("metadata.json").read())
+            metadata = {"project_version_info": metadata["project_version_info"], "roi_annotations": {}}
+            for member in src.getmembers()[2:]:
+                dst.addfile(member, src.extractfile(member))
+            for member in src.getmembers()[:2]:
+                data = src.extractfile(member).read()
+                if member.name == "metadata.json":
+                    data = json.dumps(metadata).encode()
+                    member.size = len(data)
+                dst.addfile(member, BytesIO(data))
+        old_descriptor = probe_project(tmp_path / "test2.tgz")
+        assert old_descriptor.image.channels == image.channels
+        assert np.allclose(old_descriptor.image.spacing, image.spacing)
+        assert old_descriptor.image.nbytes == image.get_data().nbytes
+        assert old_descriptor.roi_components is None
+        assert old_descriptor.has_mask
+        assert probe_project_image(tmp_path / "test2.tgz") is None
+        assert load_project(tmp_path / "test2.tgz").image.shape == image.shape
+
+    def test_probe_project_cache(self, tmp_path, analysis_segmentation, analysis_segmentation2):
+        SaveProject.save(tmp_path / "test1.tgz", analysis_segmentation)
+        assert not probe_project(tmp_path / "test1.tgz").has_mask
+        SaveProject.save(tmp_path / "test1.tgz", analysis_segmentation2)
+        assert probe_project(tmp_path / "test1.tgz").has_mask
+        with pytest.raises(WrongFileTypeException):
+            probe_stack_segmentation(tmp_path / "test1.tgz")
+
+    @pytest.mark.parametrize("memmap", [True, False])
+    def test_load_uncompressed_project(self, tmp_path, analysis_segmentation2, memmap):
+        SaveProject.save(tmp_path / "test1.tgz", analysis_segmentation2)
+        with tarfile.open(tmp_path / "test1.tgz") as src, tarfile.open(tmp_path / "test1.tar", "w") as dst:
+            for member in src.getmembers():
+                dst.addfile(member, src.extractfile(member))
+        project = load_project(tmp_path / "test1.tar", memmap=memmap)
+        assert project.image.is_lazy == memmap
+        assert np.array_equal(project.image.get_data(), analysis_segmentation2.image.get_data())
+        assert np.array_equal(project.roi_info.roi, analysis_segmentation2.roi_info.roi)
+        assert np.array_equal(project.mask, analysis_segmentation2.mask)
+        project_gz = load_project(tmp_path / "test1.tgz", memmap=memmap)
+        assert not project_gz.image.is_lazy
+        assert np.array_equal(project_gz.image.get_data(), project.image.get_data())
+
     def test_save_tiff(self, tmpdir, analysis_project):
         SaveAsTiff.save(os.path.join(tmpdir, "test1.tiff"), analysis_project)
         array = tifffile.imread(os.path.join(tmpdir, "test1.tiff"))
@@ -152,6 +152,21 @@ class TestFillHoles:
         assert np.all(mask == fill_holes_in_mask(mask2, -1))
         assert np.all(mask == fill_2d_holes_in_mask(mask2, -1))
 
+    def test_fill_many_holes(self):
+        mask = np.ones((10, 30), dtype=np.uint8)
+        mask[2:4, 2:4] = 0
+        mask[2:5, 10:13] = 0
+        mask[2:8, 20:24] = 0
+        mask[0:3, 27:29] = 0
+        res = fill_holes_in_mask(mask, 9)
+        expected = np.ones(mask.shape, dtype=bool)
+        expected[2:8, 20:24] = False
+        expected[0:3, 27:29] = False
+        assert res.dtype == bool
+        assert np.all(res == expected)
+        expected[2:8, 20:24] = True
+        assert np.all(fill_holes_in_mask(mask, -1) == expected)
+
 
 class TestCalculateMask:
     def test_single(self):
@@ -314,6 +329,35 @@ class TestCalculateMask:
         mask1 = calculate_mask(mp2, mask2, None, (1, 1, 1))
         assert np.all(mask == mask1)
 
+    @pytest.mark.parametrize("fill_holes", [RadiusType.R2D, RadiusType.R3D])
+    def test_save_components_fill_holes_many(self, fill_holes):
+        components = np.zeros((6, 40, 40), dtype=np.uint16)
+        for i, (y, x) in enumerate(np.ndindex(4, 4)):
+            components[1:5, 2 + y * 10 : 9 + y * 10, 2 + x * 10 : 9 + x * 10] = 3 * i + 5  # gaps in numeration
+        holes = [
+            (slice(2, 4), slice(4, 7), slice(4, 7)),
+            (slice(2, 4), slice(25, 27), slice(35, 37)),
+            (slice(None), slice(14, 17), slice(14, 17)),
+            (slice(None), slice(34, 36), slice(4, 6)),
+        ]
+        mask = np.copy(components)
+        for hole in holes:
+            mask[hole] = 0
+        mp = MaskProperty(
+            dilate=RadiusType.NO,
+            dilate_radius=0,
+            fill_holes=fill_holes,
+            max_holes_size=-1,
+            save_components=True,
+            clip_to_mask=False,
+        )
+        for max_holes_size, filled in [(-1, [0, 1, 2, 3]), (8, [1, 3])]:
+            expected = np.copy(mask)
+            for i in filled:
+                expected[holes[i]] = components[holes[i]]
+            res = calculate_mask(mp.copy(update={"max_holes_size": max_holes_size}), mask, None, (1, 1, 1))
+            assert np.all(res == expected)
+
     @pytest.mark.xfail(reason="problem with alone pixels")
     def test_save_component_fill_holes_problematic(self):
         mask = np.zeros((12, 12, 12), dtype=np.uint8)
@@ -447,5 +491,39 @@ class TestCalculateMask:
         mask1 = calculate_mask(mp, mask, None, (1, 1, 1))
         assert mask1.shape == mask.shape
 
+    @pytest.mark.parametrize("save_components", [True, False])
+    @pytest.mark.parametrize("time_axis", [0, 1])
+    def test_time_axis_workers(self, save_components, time_axis):
+        roi = np.zeros((5, 8, 20, 20), dtype=np.uint8)
+        for i in range(5):
+            roi[i, 2:6, 3 + i : 9 + i, 3:9] = 1
+            roi[i, 2:6, 10:16, 4 + i : 10 + i] = 2
+        roi[:, 3:5, 5:7, 5:7] = 0
+        old_mask = np.zeros(roi.shape, dtype=np.uint8)
+        old_mask[:, 1:7, 1:19, 1:15] = 1
+        roi = np.moveaxis(roi, 0, time_axis)
+        old_mask = np.moveaxis(old_mask, 0, time_axis)
+        mp = MaskProperty(
+            dilate=RadiusType.R3D,
+            dilate_radius=1,
+            fill_holes=RadiusType.R3D,
+            max_holes_size=-1,
+            save_components=save_components,
+            clip_to_mask=True,
+        )
+        expected = np.stack(
+            [
+                calculate_mask(
+                    mp, np.take(roi, i, time_axis), np.take(old_mask, i, time_axis), (1, 1, 1), time_axis=None
+                )
+                for i in range(5)
+            ],
+            axis=time_axis,
+        )
+        for workers in (1, 3):
+            res = calculate_mask(mp, roi, old_mask, (1, 1, 1), time_axis=time_axis, workers=workers)
+            assert res.dtype == expected.dtype
+            assert np.array_equal(res, expected)
+
 
 # TODO add test with touching boundaries.
@@ -13,11 +13,13 @@ import pytest
 from sympy import symbols
 
 from PartSegCore.algorithm_describe_base import ROIExtractionProfile
-from PartSegCore.analysis import load_metadata
+from PartSegCore.analysis import load_metadata, measurement_cache
 from PartSegCore.analysis.measurement_base import AreaType, Leaf, MeasurementEntry, Node, PerComponent
+from PartSegCore.analysis.measurement_cache import CACHE_MISS, DiskMeasurementCache, hash_arrays
 from PartSegCore.analysis.measurement_calculation import (
     HARALIC_FEATURES,
     MEASUREMENT_DICT,
+    NO_COMPONENT,
     ColocalizationMeasurement,
     ComponentsInfo,
     ComponentsNumber,
@@ -30,6 +32,7 @@ from PartSegCore.analysis.measurement_calculation import (
     Haralick,
     MaximumPixelBrightness,
     MeanPixelBrightness,
+    MeasurementCache,
     MeasurementProfile,
     MeasurementResult,
     MedianPixelBrightness,
@@ -48,6 +51,8 @@ from PartSegCore.analysis.measurement_calculation import (
     ThirdPrincipalAxisLength,
     Volume,
     Voxels,
+    haralick_per_label,
+    shared_geometry,
 )
 from PartSegCore.autofit import density_mass_center
 from PartSegCore.roi_info import ROIInfo
@@ -2143,6 +2148,75 @@ class TestHaralick:
         mask = data > 0
         Haralick.calculate_property(mask, data, distance=distance, feature=feature)
 
+    @pytest.mark.parametrize("shape", [(30, 30), (1, 30, 30), (6, 30, 30)])
+    @pytest.mark.parametrize(("dtype", "max_val"), [(np.uint8, 200), (np.uint16, 100), (np.uint16, 5000), (float, 3)])
+    @pytest.mark.parametrize("distance", [1, 2])
+    def test_per_label(self, shape, dtype, max_val, distance):
+        rng = np.random.default_rng(5)
+        data = (rng.random(shape) * max_val).astype(dtype)
+        labels = np.zeros(shape, dtype=np.uint16)
+        labels[..., 2:9, 2:12] = 1
+        labels[..., 12:20, 5:9] = 3
+        labels[..., 20:, 15:] = 4
+        res = haralick_per_label(data, labels, distance)
+        assert res.shape == (5, len(HARALIC_FEATURES))
+        assert np.all(np.isnan(res[[0, 2]]))
+        roi_info = ROIInfo(labels)
+        for num in [1, 3, 4]:
+            slices = tuple(roi_info.bound_info[num].get_slices(margin=1))
+            expected = Haralick.calculate_haralick(data[slices], labels[slices] == num, distance)
+            assert np.allclose(res[num], expected)
+
+    def test_per_label_not_supported(self):
+        data = np.ones((20, 20), dtype=np.int16)
+        data[10:] = -5
+        labels = np.zeros(data.shape, dtype=np.uint8)
+        labels[2:8, 2:8] = 1
+        labels[12:18, 2:8] = 2
+        labels[2:8, 12:13] = 3
+        res = haralick_per_label(data, labels)
+        assert not np.any(np.isnan(res[1]))
+        assert np.all(np.isnan(res[2:]))
+        with pytest.raises(ValueError, match="empty"):
+            Haralick.calculate_haralick(data[1:9, 11:14], labels[1:9, 11:14] == 3, 1)
+        assert Haralick.calculate_per_label(
+            labels=labels, components=np.array([1]), channel=data, distance=1, feature=HARALIC_FEATURES[0]
+        ) == pytest.approx(res[1, 0])
+        # only component which cannot be calculated at once is calculated on crop
+        res_mixed = Haralick.calculate_per_label(
+            labels=labels, components=np.array([2, 1]), channel=data, distance=1, feature=HARALIC_FEATURES[1]
+        )
+        expected = Haralick.calculate_haralick(data[11:19, 1:9], labels[11:19, 1:9] == 2, 1)[1]
+        assert res_mixed == pytest.approx([expected, res[1, 1]])
+        with pytest.raises(ValueError, match="empty"):
+            Haralick.calculate_per_label(
+                labels=labels, components=np.array([1, 3]), channel=data, distance=1, feature=HARALIC_FEATURES[0]
+            )
+
+    def test_per_label_cache(self):
+        data = np.zeros((5, 20, 20), dtype=np.uint8)
+        data[1:-1, 3:-3, 3:-3] = 2
+        data[1:-1, 4:-4, 4:-4] = 3
+        labels = (data > 0).astype(np.uint8)
+        labels[:, 10:] *= 2
+        help_dict = MeasurementCache()
+        kwargs = {
+            "help_dict": help_dict,
+            "_area": AreaType.ROI,
+            "_per_component": PerComponent.Mean,
+            "channel_num": 0,
+            "_cache": True,
+        }
+        components = np.array([1, 2])
+        res = [
+            Haralick.calculate_per_label(
+                labels=labels, components=components, channel=data, distance=1, feature=name, **kwargs
+            )
+            for name in HARALIC_FEATURES
+        ]
+        assert len(help_dict) == 1
+        assert np.allclose(np.array(res).T, next(iter(help_dict.values()))[components])
+
 
 @pytest.fixture
 def roi_to_roi_extract():
@@ -2433,3 +2507,285 @@ def test_per_mask_component():
     assert df["Mask component"][1] == df["Mask component"][2] == 1
     assert df["Mask component"][3] == df["Mask component"][4] == 2
     assert df["Volume (nm**3)"][1] == df["Volume (nm**3)"][2] == df["Volume (nm**3)"][3] == df["Volume (nm**3)"][4]
+
+
+@pytest.mark.parametrize(
+    "method",
+    [
+        Volume,
+        Voxels,
+        PixelBrightnessSum,
+        MaximumPixelBrightness,
+        MinimumPixelBrightness,
+        MeanPixelBrightness,
+        StandardDeviationOfPixelBrightness,
+        Haralick,
+    ],
+)
+@pytest.mark.parametrize(
+    ("area", "per_component"),
+    [
+        (AreaType.ROI, PerComponent.Yes),
+        (AreaType.ROI, PerComponent.Mean),
+        (AreaType.ROI, PerComponent.Per_Mask_component),
+        (AreaType.Mask, PerComponent.Yes),
+        (AreaType.Mask_without_ROI, PerComponent.Yes),
+    ],
+)
+def test_per_label_calculation(method, area, per_component, monkeypatch):
+    rng = np.random.default_rng(10)
+    data = rng.integers(0, 100, size=(5, 30, 30)).astype(np.uint16)
+    roi = np.zeros(data.shape, dtype=np.uint8)
+    for i in range(1, 10):
+        y, x = divmod(i - 1, 3)
+        roi[1:-1, 2 + y * 9 : 8 + y * 9, 2 + x * 9 : 8 + x * 9] = i
+    roi[:, 2:8, 2:8] = 0  # component 1 removed to check label gaps
+    mask = np.zeros(data.shape, dtype=np.uint8)
+    mask[:, :, :15] = 1
+    mask[:, :, 15:] = 2
+    image = Image(data, spacing=(10**-8,) * 3, axes_order="ZYX", mask=mask)
+    profile = MeasurementProfile(
+        name="test",
+        chosen_fields=[
+            MeasurementEntry(
+                name="Measurement",
+                calculation_tree=method.get_starting_leaf().replace_(area=area, per_component=per_component),
+            )
+        ],
+    )
+    result = profile.calculate(image=image, channel_num=0, roi=roi, result_units=Units.nm)
+    monkeypatch.setattr(method, "calculate_per_label", classmethod(lambda cls, **_: None))
+    expected = profile.calculate(image=image, channel_num=0, roi=roi, result_units=Units.nm)
+    assert np.allclose(result["Measurement"][0], expected["Measurement"][0])
+
+
+def test_shared_geometry():
+    fun = MagicMock(return_value=1, __name__="fun")
+    help_dict = MeasurementCache()
+    kwargs = {"help_dict": help_dict, "_area": AreaType.Mask, "_per_component": PerComponent.Yes}
+    for component_num in [NO_COMPONENT, 1, 2]:
+        assert shared_geometry({**kwargs, "_component_num": component_num}, fun, {"a": 1}, 5) == 1
+    assert fun.call_count == 1
+    shared_geometry({**kwargs, "_component_num": 1}, fun, {"a": 2}, 5)
+    assert fun.call_count == 2
+    kwargs["_area"] = AreaType.ROI
+    for component_num in [NO_COMPONENT, 1, 2]:
+        shared_geometry({**kwargs, "_component_num": component_num}, fun, {"a": 1}, 5)
+    assert fun.call_count == 4
+    shared_geometry({**kwargs, "_component_num": 3}, fun, {"a": 1}, 5, full_data=True)
+    assert fun.call_count == 4
+    shared_geometry({}, fun, {"a": 1}, 5)
+    assert fun.call_count == 5
+    fun.assert_called_with(5)
+
+
+@pytest.mark.parametrize("area", [AreaType.Mask, AreaType.Mask_without_ROI, AreaType.ROI])
+def test_shared_geometry_measurements(area, monkeypatch):
+    rng = np.random.default_rng(3)
+    data = rng.integers(0, 100, size=(6, 40, 40)).astype(np.uint16)
+    mask = np.zeros(data.shape, dtype=np.uint8)
+    mask[:, 2:38, 2:20] = 1
+    mask[:, 2:38, 21:38] = 2
+    roi = np.zeros(data.shape, dtype=np.uint8)
+    for i in range(1, 7):
+        y, x = divmod(i - 1, 3)
+        roi[1:-1, 4 + y * 16 : 12 + y * 16, 4 + x * 12 : 9 + x * 12] = i
+    data[roi > 0] += 100
+    data[1:-1, 14:17, 24:27] = 1000
+    data[1:-1, 30:34, 10:13] = 1000
+    image = Image(data, spacing=(10**-7, 10**-8, 10**-8), axes_order="ZYX", mask=mask)
+    values = LowerThresholdAlgorithm.get_default_values()
+    threshold = values.threshold.copy(update={"values": values.threshold.values.copy(update={"threshold": 500})})
+    profile_parameters = ROIExtractionProfile(
+        name="test",
+        algorithm=LowerThresholdAlgorithm.get_name(),
+        values=values.copy(update={"minimum_size": 5, "threshold": threshold}),
+    )
+    leaves = [
+        DistanceMaskROI.get_starting_leaf(),
+        DistanceMaskROI.get_starting_leaf().replace_(
+            parameters=DistanceMaskROI.__argument_class__(distance_from_mask=DistancePoint.Mass_center)
+        ),
+        DistanceROIROI.get_starting_leaf().replace_(
+            parameters=DistanceROIROI.__argument_class__(profile=profile_parameters)
+        ),
+        ROINeighbourhoodROI.get_starting_leaf().replace_(
+            parameters=ROINeighbourhoodROI.__argument_class__(profile=profile_parameters, distance=200)
+        ),
+        RimVolume.get_starting_leaf(),
+        RimPixelBrightnessSum.get_starting_leaf(),
+        SplitOnPartVolume.get_starting_leaf(),
+        SplitOnPartPixelBrightnessSum.get_starting_leaf(),
+    ]
+    profile = MeasurementProfile(
+        name="test",
+        chosen_fields=[
+            MeasurementEntry(
+                name=f"Measurement {i}",
+                calculation_tree=leaf.replace_(area=area, per_component=PerComponent.Yes, channel=Channel(0)),
+            )
+            for i, leaf in enumerate(leaves)
+        ],
+    )
+    result = profile.calculate(image=image, channel_num=0, roi=roi, result_units=Units.nm)
+    monkeypatch.setattr(
+        "PartSegCore.analysis.measurement_calculation.shared_geometry",
+        lambda kwargs, fun, arguments, *args, **_: fun(*args),
+    )
+    for method in [RimVolume, RimPixelBrightnessSum, SplitOnPartVolume, SplitOnPartPixelBrightnessSum]:
+        monkeypatch.setattr(method, "calculate_per_label", classmethod(lambda cls, **_: None))
+    expected = profile.calculate(image=image, channel_num=0, roi=roi, result_units=Units.nm)
+    for key in expected:
+        assert len(result[key][0]) == 6
+        assert np.allclose(result[key][0], expected[key][0]), key
+
+
+@pytest.mark.parametrize("workers", [1, 3])
+def test_calculate_time_series(workers):
+    rng = np.random.default_rng(4)
+    data = rng.integers(0, 100, size=(7, 4, 20, 20)).astype(np.uint16)
+    roi = np.zeros(data.shape, dtype=np.uint8)
+    mask = np.zeros(data.shape, dtype=np.uint8)
+    mask[:, 1:-1, 1:-1, 1:-1] = 1
+    for t in range(data.shape[0]):
+        roi[t, 1:3, 2 : 5 + t, 2:8] = 1
+        roi[t, 1:3, 10:15, 10 : 12 + t % 3] = 2
+    image = Image(data, spacing=(10**-7, 10**-8, 10**-8), axes_order="TZYX", mask=mask)
+    profile = MeasurementProfile(
+        name="test",
+        chosen_fields=[
+            MeasurementEntry(
+                name="Volume",
+                calculation_tree=Volume.get_starting_leaf().replace_(area=AreaType.ROI, per_component=PerComponent.Yes),
+            ),
+            MeasurementEntry(
+                name="Brightness",
+                calculation_tree=PixelBrightnessSum.get_starting_leaf().replace_(
+                    area=AreaType.Mask, per_component=PerComponent.No, channel=Channel(0)
+                ),
+            ),
+        ],
+    )
+    range_changed, step_changed = MagicMock(), MagicMock()
+    result = profile.calculate_time_series(
+        image, 0, roi, Units.nm, range_changed, step_changed, times=[6, 2, 3, 0, 5], workers=workers
+    )
+    range_changed.assert_called_once_with(0, 5)
+    assert step_changed.call_count == 5
+    for res, time in zip(result, [6, 2, 3, 0, 5]):
+        expected = profile.calculate(image, 0, roi, Units.nm, time=time)
+        assert res["Volume"] == expected["Volume"]
+        assert res["Brightness"] == expected["Brightness"]
+        assert res["Volume"][0][0] == pytest.approx(2 * (3 + time) * 6 * 10**4)
+    times = [time for time, _ in profile.calculate_time_yield(image, 0, roi, Units.nm, workers=workers)]
+    assert times == list(range(7))
+
+
+def test_calculate_with_workers(bundle_test_dir):
+    profile = load_metadata(os.path.join(bundle_test_dir, "measurements_profile.json"))["all_statistic"]
+    image = get_two_components_image()
+    image.set_mask(get_two_component_mask())
+    segmentation = np.zeros(image.mask.shape, dtype=np.uint8)
+    segmentation[image.get_channel(0) == 50] = 1
+    segmentation[image.get_channel(0) == 60] = 2
+    result = profile.calculate(image, 0, segmentation, result_units=Units.nm)
+    result_threads = profile.calculate(image, 0, segmentation, result_units=Units.nm, workers=4)
+    assert list(result.keys()) == list(result_threads.keys())
+    for key in result:
+        assert result[key][1] == result_threads[key][1]
+        if isinstance(result[key][0], str):
+            assert result[key][0] == result_threads[key][0]
+        else:
+            assert result[key][0] == pytest.approx(result_threads[key][0], nan_ok=True)
+
+
+class TestDiskMeasurementCache:
+    def test_put_get(self, tmp_path):
+        cache = DiskMeasurementCache(str(tmp_path))
+        assert cache.get("a") is None
+        cache.put("a", np.arange(5))
+        assert np.all(cache.get("a") == np.arange(5))
+        assert cache.statistics()[:3] == (1, 1, 1)
+        cache2 = DiskMeasurementCache(str(tmp_path))
+        assert "a" in cache2
+        assert cache2.size == cache.size
+
+    def test_cached_none(self, tmp_path):
+        cache = DiskMeasurementCache(str(tmp_path))
+        assert cache.get("a", CACHE_MISS) is CACHE_MISS
+        cache.put("a", None)
+        assert cache.get("a", CACHE_MISS) is None
+        assert cache.statistics()[:2] == (1, 1)
+
+    def test_lru_eviction(self, tmp_path):
+        cache = DiskMeasurementCache(str(tmp_path), max_size=3000)
+        for key in "abc":
+            cache.put(key, np.zeros(800, dtype=np.uint8))
+        cache.get("a")
+        cache.put("d", np.zeros(800, dtype=np.uint8))
+        assert "a" in cache
+        assert "b" not in cache
+        assert cache.size <= 3000
+        assert len(os.listdir(tmp_path)) == len(cache)
+        cache.clear()
+        assert len(cache) == 0
+        assert not os.listdir(tmp_path)
+
+    def test_make_key_version(self, monkeypatch):
+        key = DiskMeasurementCache.make_key("a", "b")
+        assert key == DiskMeasurementCache.make_key("a", "b")
+        monkeypatch.setattr(measurement_cache, "CACHE_VERSION", "0-0.0.0")
+        assert key != DiskMeasurementCache.make_key("a", "b")
+
+    def test_hash_arrays(self):
+        data = np.zeros((5, 5), dtype=np.uint8)
+        assert hash_arrays([data, None]) == hash_arrays([data.copy(), None])
+        assert hash_arrays([data]) != hash_arrays([data.astype(np.uint16)])
+        assert hash_arrays([data], (1, 1)) != hash_arrays([data], (1, 2))
+
+
+def test_calculate_with_disk_cache(bundle_test_dir, tmp_path):
+    profile = load_metadata(os.path.join(bundle_test_dir, "measurements_profile.json"))["all_statistic"]
+    image = get_two_components_image()
+    image.set_mask(get_two_component_mask())
+    segmentation = np.zeros(image.mask.shape, dtype=np.uint8)
+    segmentation[image.get_channel(0) == 50] = 1
+    segmentation[image.get_channel(0) == 60] = 2
+    cache = DiskMeasurementCache(str(tmp_path))
+    result = profile.calculate(image, 0, segmentation, result_units=Units.nm, disk_cache=cache)
+    assert cache.hits == 0
+    assert len(cache) > 0
+    misses = cache.misses
+    result_cached = profile.calculate(image, 0, segmentation, result_units=Units.nm, disk_cache=cache)
+    assert cache.misses == misses
+    assert cache.hits == misses
+    for key in result:
+        if isinstance(result[key][0], str):
+            assert result[key][0] == result_cached[key][0]
+        else:
+            assert result[key][0] == pytest.approx(result_cached[key][0], nan_ok=True)
+    segmentation[segmentation == 2] = 0
+    profile.calculate(image, 0, segmentation, result_units=Units.nm, disk_cache=cache)
+    assert cache.misses == 2 * misses
+
+
+def test_disk_cache_none_result(tmp_path, monkeypatch):
+    # for example rim measurements return None if there is no mask
+    calls = []
+
+    def calculate_leaf_value(*args, **kwargs):
+        calls.append(1)
+
+    monkeypatch.setattr(MeasurementProfile, "_calculate_leaf_value", calculate_leaf_value)
+    image = get_two_components_image()
+    segmentation = (image.get_channel(0) == 50).astype(np.uint8)
+    profile = MeasurementProfile(
+        name="statistic",
+        chosen_fields=[MeasurementEntry(name="Volume", calculation_tree=Volume.get_starting_leaf())],
+    )
+    cache = DiskMeasurementCache(str(tmp_path))
+    profile.calculate(image, 0, segmentation, result_units=Units.nm, disk_cache=cache)
+    assert len(calls) == 1
+    profile.calculate(image, 0, segmentation, result_units=Units.nm, disk_cache=cache)
+    assert len(calls) == 1
+    assert cache.hits == 1
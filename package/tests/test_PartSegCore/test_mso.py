@@ -1,11 +1,23 @@
 # pylint: disable=no-self-use
 
+import gc
 import itertools
+import operator
+from concurrent.futures import ThreadPoolExecutor
 
 import numpy as np
 import pytest
 
-from PartSegCore.segmentation.watershed import NeighType, calculate_distances_array
+from PartSegCore.segmentation.algorithm_base import SegmentationLimitException
+from PartSegCore.segmentation.watershed import (
+    MSO_MAX_COMPONENTS,
+    MSOWatershed,
+    MSOWatershedParams,
+    MuCache,
+    MultiLabelMSO,
+    NeighType,
+    calculate_distances_array,
+)
 from PartSegCore_compiled_backend.multiscale_opening import MuType, PyMSO, calculate_mu, calculate_mu_mid
 from PartSegCore_compiled_backend.sprawl_utils.euclidean_cython import calculate_euclidean
 
@@ -544,6 +556,110 @@ class TestMSO:
         mso.get_result_catted()
 
 
+class TestMultiLabelMSO:
+    @staticmethod
+    def two_components_bridge():
+        components = np.zeros((10, 10, 20), dtype=np.uint8)
+        components[:] = 1
+        components[2:8, 2:8, 2:18] = 0
+        components[4:6, 4:6, 4:6] = 2
+        components[4:6, 4:6, 14:16] = 3
+        mu_arr = np.zeros(components.shape, dtype=np.float64)
+        mu_arr[components == 0] = 0.5
+        mu_arr[components > 1] = 1
+        mu_arr[2:8, 2:8, (9, 10)] = 0.1
+        return components, mu_arr
+
+    @pytest.mark.parametrize("use_background", [True, False])
+    def test_compare_with_compiled(self, use_background):
+        components, mu_arr = self.two_components_bridge()
+        neigh, dist = calculate_distances_array((1, 1, 1), NeighType.vertex)
+        results = []
+        for mso in (PyMSO(), MultiLabelMSO()):
+            mso.set_neighbourhood(neigh, dist)
+            mso.set_use_background(use_background)
+            if isinstance(mso, PyMSO):
+                mso.set_components(components, 3)
+            else:
+                mso.set_components(components)
+            mso.set_mu_array(mu_arr)
+            mso.run_MSO(10)
+            assert mso.steps_done() == 2
+            results.append(mso.get_result_catted())
+        assert np.array_equal(results[0], results[1])
+
+    @pytest.mark.parametrize("workers", [1, 4])
+    def test_many_components(self, workers):
+        count = MSO_MAX_COMPONENTS + 50
+        components = np.ones((10, 10, 10 * count), dtype=np.uint16)
+        mu_arr = np.zeros(components.shape, dtype=np.float64)
+        expected = np.zeros(components.shape, dtype=np.uint16)
+        for i in range(count):
+            components[2:8, 2:8, 10 * i + 2 : 10 * i + 8] = 0
+            components[4:6, 4:6, 10 * i + 4 : 10 * i + 6] = i + 2
+            mu_arr[2:8, 2:8, 10 * i + 2 : 10 * i + 8] = 0.5
+            mu_arr[4:6, 4:6, 10 * i + 4 : 10 * i + 6] = 1
+            expected[2:8, 2:8, 10 * i + 2 : 10 * i + 8] = i + 2
+        mso = MultiLabelMSO(workers=workers)
+        neigh, dist = calculate_distances_array((1, 1, 1), NeighType.vertex)
+        mso.set_neighbourhood(neigh, dist)
+        mso.set_components(components)
+        mso.set_mu_array(mu_arr)
+        mso.run_MSO(10)
+        res = mso.get_result_catted()
+        assert res.dtype == np.uint16
+        assert np.array_equal(res, expected)
+
+    def test_limit_in_connected_area(self):
+        count = MSO_MAX_COMPONENTS + 1
+        components = np.zeros((3, 3, 2 * count + 1), dtype=np.uint16)
+        components[1, 1, 1::2] = np.arange(2, count + 2)
+        mso = MultiLabelMSO()
+        neigh, dist = calculate_distances_array((1, 1, 1), NeighType.vertex)
+        mso.set_neighbourhood(neigh, dist)
+        mso.set_components(components)
+        mso.set_mu_array(np.ones(components.shape))
+        with pytest.raises(SegmentationLimitException, match="connected part"):
+            mso.run_MSO(10)
+
+    def test_watershed_many_components(self):
+        count = 300
+        data = np.zeros((10, 10, 10 * count), dtype=np.uint8)
+        core_objects = np.zeros(data.shape, dtype=np.uint16)
+        for i in range(count):
+            data[2:8, 2:8, 10 * i + 2 : 10 * i + 8] = 50
+            data[4:6, 4:6, 10 * i + 4 : 10 * i + 6] = 100
+            core_objects[4:6, 4:6, 10 * i + 4 : 10 * i + 6] = i + 1
+        res = MSOWatershed.sprawl(
+            data > 0, core_objects, data, count, (1, 1, 1), True, operator.gt, MSOWatershedParams(), 0, 100
+        )
+        assert np.array_equal(np.bincount(res.flat)[1:], np.full(count, 216))
+
+
+def test_mu_cache():
+    data = np.arange(1000, dtype=np.uint16).reshape((10, 10, 10))
+    cache = MuCache()
+    mu_array = cache.get(data, 100, 900)
+    assert np.array_equal(mu_array, calculate_mu(data, 100, 900, MuType.base_mu))
+    assert cache.get(data, 100, 900) is mu_array
+    assert cache.get(data, 100, 800) is not mu_array
+    assert cache.get(np.copy(data), 100, 800) is not cache.get(data, 100, 800)
+    del data
+    gc.collect()
+    assert cache._entry is None  # pylint: disable=protected-access
+
+
+def test_mu_cache_threads():
+    data = np.arange(1000, dtype=np.uint16).reshape((10, 10, 10))
+    reversed_data = data[::-1].copy()
+    expected = [calculate_mu(x, 100, 900, MuType.base_mu) for x in (data, reversed_data)]
+    cache = MuCache()
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        res = list(executor.map(lambda x: cache.get(x, 100, 900), [data, reversed_data] * 20))
+    for i, mu_array in enumerate(res):
+        assert np.array_equal(mu_array, expected[i % 2])
+
+
 class TestMuMid:
     def test_simple(self):
         data = np.zeros((10, 10, 10))
@@ -0,0 +1,197 @@
+import io
+import pickle
+import time
+import uuid
+from multiprocessing import shared_memory
+from queue import Queue
+
+import numpy as np
+import pytest
+
+from PartSegCore.analysis.batch_processing import parallel_backend
+from PartSegCore.analysis.batch_processing.parallel_backend import (
+    BatchManager,
+    BatchWorker,
+    SubprocessOrder,
+    WorkersCounter,
+    decode_result,
+    encode_result,
+    release_result,
+)
+
+
+def shared_memory_names(data):
+    names = []
+
+    class Pickler(parallel_backend._SharedArrayPickler):  # pylint: disable=protected-access
+        def reducer_override(self, obj):
+            res = super().reducer_override(obj)
+            if res is not NotImplemented:
+                names.append(res[1][0])
+            return res
+
+    buffer = io.BytesIO()
+    Pickler(buffer, protocol=pickle.HIGHEST_PROTOCOL).dump(data)
+    return buffer.getvalue(), names
+
+
+def assert_released(names):
+    for name in names:
+        with pytest.raises(FileNotFoundError):
+            shared_memory.SharedMemory(name=name)
+
+
+class GlobalParameters:
+    def __init__(self, size):
+        self.uuid = uuid.uuid4()
+        self.size = size
+
+
+def create_array(value, global_parameters):
+    return value, np.full(global_parameters.size, value, dtype=np.uint16)
+
+
+def prefetch_value(value, global_parameters):
+    return np.full(global_parameters.size, value * 2, dtype=np.uint16)
+
+
+def create_array_prefetched(value, global_parameters, prefetched=None):
+    assert prefetched is not None
+    return value, prefetched.result() // 2
+
+
+create_array_prefetched.prefetch = prefetch_value
+
+
+@pytest.mark.parametrize("size", [10, 2**20])
+def test_encode_decode_result(size):
+    data = {"array": np.arange(size, dtype=np.uint32).reshape(-1, 2), "text": "aaa"}
+    encoded = encode_result(data)
+    if size * 4 >= parallel_backend.SHARED_MEMORY_THRESHOLD and parallel_backend.USE_SHARED_MEMORY:
+        assert len(encoded) < parallel_backend.SHARED_MEMORY_THRESHOLD
+    decoded = decode_result(encoded)
+    assert decoded["text"] == "aaa"
+    assert np.array_equal(decoded["array"], data["array"])
+
+
+@pytest.mark.skipif(not parallel_backend.USE_SHARED_MEMORY, reason="shared memory is not used")
+def test_release_result():
+    encoded, names = shared_memory_names((5, [np.zeros(2**20, dtype=np.uint8), "aaa"]))
+    assert len(names) == 1
+    assert release_result(encoded) == (5, [None, "aaa"])
+    assert_released(names)
+
+
+@pytest.mark.skipif(not parallel_backend.USE_SHARED_MEMORY, reason="shared memory is not used")
+def test_batch_manager_release_canceled():
+    manager = BatchManager()
+    global_parameters = GlobalParameters(2**20)
+    manager.calculation_dict[global_parameters.uuid] = global_parameters, create_array
+    encoded, names = shared_memory_names(create_array(3, global_parameters))
+    manager.result_queue.put((global_parameters.uuid, encoded, 0.0))
+    manager.work_task = 1
+    manager.cancel_work(global_parameters)
+    assert global_parameters.uuid not in manager.calculation_dict
+    for _ in range(50):
+        if res := manager.get_result():
+            break
+        time.sleep(0.1)
+    assert res == [(global_parameters.uuid, (3, [SubprocessOrder.cancel_job]))]
+    assert_released(names)
+
+
+@pytest.mark.skipif(not parallel_backend.USE_SHARED_MEMORY, reason="shared memory is not used")
+def test_batch_manager_kill_release():
+    manager = BatchManager()
+    encoded, names = shared_memory_names((1, np.zeros(2**20, dtype=np.uint8)))
+    manager.result_queue.put(("a", encoded, 0.0))
+    for _ in range(50):
+        if not manager.result_queue.empty():
+            break
+        time.sleep(0.1)
+    manager.kill_jobs()
+    assert_released(names)
+
+
+@pytest.mark.parametrize("function", [create_array, create_array_prefetched])
+def test_batch_manager(function):
+    manager = BatchManager()
+    global_parameters = GlobalParameters(2**20)
+    manager.add_work([1, 2, 3], global_parameters, function)
+    res = []
+    for _ in range(600):
+        res.extend(manager.get_result())
+        if not manager.has_work:
+            break
+        time.sleep(0.1)
+    else:  # pragma: no cover
+        manager.kill_jobs()
+        pytest.fail("jobs hanged")
+    assert len(res) == 3
+    assert {x[0] for x in res} == {global_parameters.uuid}
+    for _, (value, array) in res:
+        assert array.shape == (2**20,)
+        assert np.all(array == value)
+
+
+def test_batch_manager_work_added_when_idle():
+    manager = BatchManager()
+    global_parameters = GlobalParameters(10)
+    manager.add_work([], global_parameters, create_array)
+    # idle worker is scheduled to be stopped, but new work is added before it happens
+    assert manager.get_result() == []
+    manager.add_work([1, 2], global_parameters, create_array)
+    res = []
+    for _ in range(100):
+        res.extend(manager.get_result())
+        if not manager.has_work:
+            break
+        time.sleep(0.1)
+    else:  # pragma: no cover
+        manager.kill_jobs()
+        pytest.fail("jobs hanged")
+    assert sorted(x[1][0] for x in res) == [1, 2]
+
+
+def test_batch_worker_prefetch():
+    task_queue, result_queue = Queue(), Queue()
+    global_parameters = GlobalParameters(10)
+    calculation_dict = {global_parameters.uuid: (global_parameters, create_array_prefetched)}
+    worker = BatchWorker(task_queue, Queue(), result_queue, calculation_dict, read_ahead=1)
+    for i in range(3):
+        task_queue.put((i, global_parameters.uuid))
+    worker.fill_pending()
+    assert len(worker.pending) == 2
+    assert task_queue.qsize() == 1
+    task, prefetched = worker.pending.popleft()
+    worker.calculate_task(task, prefetched)
+    value, array = decode_result(result_queue.get()[1])
+    assert value == 0
+    assert np.all(array == 0)
+    worker.return_pending()
+    assert not worker.pending
+    assert task_queue.qsize() == 2
+
+
+def test_batch_worker_read_ahead_large_first():
+    task_queue = Queue()
+    global_parameters = GlobalParameters(10)
+    calculation_dict = {global_parameters.uuid: (global_parameters, create_array_prefetched)}
+    workers = WorkersCounter()
+    workers.spawned.value = 2
+    worker1, worker2 = (
+        BatchWorker(task_queue, Queue(), Queue(), calculation_dict, read_ahead=1, workers=workers) for _ in range(2)
+    )
+    # tasks are ordered largest first
+    for value in [100, 90, 3, 2, 1]:
+        task_queue.put((value, global_parameters.uuid))
+    worker1.fill_pending()
+    assert [x[0][0] for x in worker1.pending] == [100]
+    worker2.fill_pending()
+    assert [x[0][0] for x in worker2.pending] == [90, 3]
+    assert workers.started.value == 2
+    worker1.calculate_task(*worker1.pending.popleft())
+    worker1.fill_pending()
+    # queue holds less tasks than workers
+    assert [x[0][0] for x in worker1.pending] == [2]
+    assert task_queue.qsize() == 1
@@ -0,0 +1,57 @@
+import numpy as np
+import pytest
+
+from PartSegCore.roi_info import LabelStatistics, ROIInfo, label_statistics
+from PartSegImage import Image
+
+
+@pytest.fixture
+def roi():
+    data = np.zeros((10, 20, 20), dtype=np.uint8)
+    data[2:5, 3:8, 4:10] = 1
+    data[6:9, 10:15, 12:18] = 3
+    data[0, 0, 0] = 3
+    return data
+
+
+@pytest.mark.parametrize("dtype", [np.uint8, np.uint16, np.uint32, np.int32, np.int64])
+def test_label_statistics(roi, dtype):
+    statistics = label_statistics(roi.astype(dtype), centroids=True)
+    assert statistics.max_label == 3
+    assert list(statistics.sizes) == [np.sum(roi == i) for i in range(4)]
+    assert set(statistics.bound_info) == {1, 3}
+    assert list(statistics.bound_info[1].lower) == [2, 3, 4]
+    assert list(statistics.bound_info[1].upper) == [4, 7, 9]
+    assert list(statistics.bound_info[3].lower) == [0, 0, 0]
+    assert list(statistics.bound_info[3].upper) == [8, 14, 17]
+    assert np.allclose(statistics.centroids[1], [3, 5, 6.5])
+    assert np.all(np.isnan(statistics.centroids[2]))
+    assert label_statistics(roi).centroids is None
+
+
+def test_roi_info_no_copy(roi):
+    assert ROIInfo(roi).roi is roi
+    roi_info = ROIInfo(roi.astype(np.uint32))
+    assert roi_info.roi.dtype == np.uint8
+    assert np.array_equal(roi_info.roi, roi)
+
+
+def test_roi_info_reuse_statistics(roi):
+    statistics = LabelStatistics(
+        max_label=3, sizes=np.array([1, 2, 3, 4]), bound_info=ROIInfo.calc_bounds(roi), centroids=None
+    )
+    roi_info = ROIInfo(roi, statistics=statistics)
+    assert roi_info.statistics is statistics
+    assert roi_info.sizes is statistics.sizes
+
+
+def test_fit_to_image_statistics(roi):
+    image = Image(np.zeros((1, 10, 20, 20), dtype=np.uint8), spacing=(1, 1, 1), axes_order="TZYX")
+    roi_info = ROIInfo(roi).fit_to_image(image)
+    assert roi_info.roi.ndim == 4
+    expected = ROIInfo(image.fit_array_to_image(roi))
+    assert roi_info.bound_info.keys() == expected.bound_info.keys()
+    for num, bound in expected.bound_info.items():
+        assert np.array_equal(roi_info.bound_info[num].lower, bound.lower)
+        assert np.array_equal(roi_info.bound_info[num].upper, bound.upper)
+    assert np.array_equal(roi_info.sizes, expected.sizes)
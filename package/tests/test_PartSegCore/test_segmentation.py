@@ -1,5 +1,6 @@
 # pylint: disable=no-self-use
 
+import itertools
 import operator
 from abc import ABC
 from copy import deepcopy
@@ -7,19 +8,21 @@ from typing import Union
 
 import numpy as np
 import pytest
+import SimpleITK
 from pydantic import BaseModel
 
 from PartSegCore.algorithm_describe_base import ROIExtractionProfile
 from PartSegCore.analysis.algorithm_description import AnalysisAlgorithmSelection
 from PartSegCore.analysis.analysis_utils import SegmentationPipeline, SegmentationPipelineElement
 from PartSegCore.analysis.calculate_pipeline import calculate_pipeline
-from PartSegCore.convex_fill import _convex_fill, convex_fill
+from PartSegCore.convex_fill import _convex_fill, check, convex_fill, create_polygon
 from PartSegCore.image_operations import RadiusType
 from PartSegCore.mask_create import MaskProperty, calculate_mask
 from PartSegCore.roi_info import BoundInfo, ROIInfo
-from PartSegCore.segmentation import ROIExtractionAlgorithm, algorithm_base
+from PartSegCore.segmentation import ROIExtractionAlgorithm, algorithm_base, utils
 from PartSegCore.segmentation import restartable_segmentation_algorithms as sa
-from PartSegCore.segmentation.noise_filtering import NoiseFilterSelection
+from PartSegCore.segmentation.noise_filtering import DimensionType, NoiseFilterSelection
+from PartSegCore.segmentation.utils import tiled_connected_components
 from PartSegCore.segmentation.watershed import WatershedSelection
 from PartSegImage import Image
 
@@ -94,6 +97,48 @@ def test_base_parameters(algorithm_name):
     assert parameters.values == values
 
 
+TILED_NOISE_FILTERING = [
+    {"name": "None", "values": {}},
+    {"name": "Gauss", "values": {"dimension_type": DimensionType.Layer, "radius": 1}},
+    {"name": "Gauss", "values": {"dimension_type": DimensionType.Stack, "radius": 1.5}},
+    {"name": "Median", "values": {"dimension_type": DimensionType.Stack, "radius": 2}},
+    {"name": "Bilateral", "values": {"dimension_type": DimensionType.Stack, "radius": 1}},
+]
+
+
+def check_tiled(algorithm_class, image, parameters, monkeypatch):
+    alg = algorithm_class()
+    alg.set_image(image)
+    alg.set_parameters(parameters)
+    result = alg.calculation_run(empty)
+
+    slab_calls = []
+
+    def iter_slabs(*args, **kwargs):
+        slab_calls.append(args)
+        return utils.iter_slabs(*args, **kwargs)
+
+    monkeypatch.setattr(sa, "iter_slabs", iter_slabs)
+    parameters = parameters.copy(update={"tile_size": 7})
+    alg_tiled = algorithm_class()
+    alg_tiled.set_image(image)
+    alg_tiled.set_parameters(parameters)
+    result_tiled = alg_tiled.calculation_run(empty)
+    assert np.array_equal(result.roi, result_tiled.roi)
+    denoised, denoised_tiled = (
+        result.additional_layers["denoised image"],
+        result_tiled.additional_layers["denoised image"],
+    )
+    assert denoised.data.dtype == denoised_tiled.data.dtype
+    assert np.array_equal(denoised.data, denoised_tiled.data)
+    assert alg.get_info_text() == alg_tiled.get_info_text()
+    threshold = parameters.threshold
+    tiled_steps = (parameters.noise_filtering.name != "None") + type(threshold)[threshold.name].is_voxel_wise(
+        threshold.values
+    )
+    assert len(slab_calls) == tiled_steps
+
+
 class BaseThreshold:
     def check_result(self, result, sizes, op, parameters):
         assert result.roi.max() == len(sizes)
@@ -153,6 +198,21 @@ class BaseOneThreshold(BaseThreshold, ABC):  # pylint: disable=W0223
         result = alg.calculation_run(empty)
         self.check_result(result, [96000 + 5 + 72000 + 5], operator.eq, parameters)
 
+    @pytest.mark.parametrize("side_connection", [True, False])
+    @pytest.mark.parametrize("noise_filtering", TILED_NOISE_FILTERING)
+    def test_tiled(self, side_connection, noise_filtering, monkeypatch):
+        parameters = self.get_parameters()
+        parameters.side_connection = side_connection
+        parameters.noise_filtering = NoiseFilterSelection(**noise_filtering)
+        check_tiled(self.get_algorithm_class(), self.get_side_object(), parameters, monkeypatch)
+
+    def test_tiled_automatic_threshold(self, monkeypatch):
+        parameters = self.get_parameters()
+        parameters.threshold = sa.ThresholdSelection(
+            name="Otsu", values=sa.ThresholdSelection["Otsu"].__argument_class__()
+        )
+        check_tiled(self.get_algorithm_class(), self.get_side_object(), parameters, monkeypatch)
+
 
 class TestLowerThreshold(BaseOneThreshold):
     parameters = sa.LowerThresholdAlgorithm.__argument_class__(
@@ -243,6 +303,23 @@ class TestRangeThresholdAlgorithm:
         assert result.parameters.values == parameters
         assert result.parameters.algorithm == alg.get_name()
 
+    @pytest.mark.parametrize("noise_filtering", TILED_NOISE_FILTERING)
+    def test_tiled(self, noise_filtering, monkeypatch):
+        parameters = sa.RangeThresholdAlgorithm.__argument_class__(
+            threshold={
+                "name": "Range",
+                "values": {
+                    "base_threshold": {"name": "Manual", "values": {"threshold": 45}},
+                    "core_threshold": {"name": "Manual", "values": {"threshold": 60}},
+                },
+            },
+            channel=0,
+            minimum_size=8000,
+            noise_filtering=noise_filtering,
+            side_connection=True,
+        )
+        check_tiled(sa.RangeThresholdAlgorithm, get_two_parts_side(), parameters, monkeypatch)
+
     def test_side_connection(self):
         image = get_two_parts_side()
         alg = sa.RangeThresholdAlgorithm()
@@ -321,6 +398,27 @@ class BaseFlowThreshold(BaseThreshold, ABC):  # pylint: disable=W0223
         result = alg.calculation_run(empty)
         self.check_result(result, [96000 + 5, 72000 + 5], operator.eq, parameters)
 
+    def test_sprawl_cache(self, monkeypatch):
+        alg = self.get_algorithm_class()()
+        parameters = self.get_parameters()
+        alg.set_image(self.get_multiple_part(3))
+        alg.set_parameters(parameters)
+        result1 = alg.calculation_run(empty)
+        assert len(alg._sprawl_cache) == 1
+        parameters.flow_type = WatershedSelection(name="Path", values={})
+        alg.set_parameters(parameters)
+        alg.calculation_run(empty)
+        assert len(alg._sprawl_cache) == 2
+
+        def _fail(*_args, **_kwargs):
+            raise AssertionError("sprawl should not be recalculated")
+
+        monkeypatch.setattr(WatershedSelection[self.get_parameters().flow_type.name], "sprawl", _fail)
+        alg.set_parameters(self.get_parameters())
+        result2 = alg.calculation_run(empty)
+        assert np.all(result1.roi == result2.roi)
+        assert result2.roi is not result1.roi
+
     def get_multiple_part(self, parts_num):
         raise NotImplementedError
 
@@ -760,6 +858,29 @@ class TestConvexFill:
         arr = np.zeros((20, 20), dtype=bool)
         assert _convex_fill(arr) is None
 
+    @pytest.mark.parametrize("workers", [1, 4])
+    def test_many_components(self, workers):
+        arr = np.zeros((5, 100, 100), dtype=np.uint16)
+        expected = np.zeros(arr.shape, dtype=np.uint16)
+        for i, (y, x) in enumerate(itertools.product(range(0, 100, 10), repeat=2), start=300):
+            expected[1:4, y + 1 : y + 9, x + 1 : x + 9] = i
+            arr[1:4, y + 1 : y + 9, x + 1 : x + 9] = i
+            arr[2, y + 3 : y + 7, x + 3 : x + 7] = 0
+            arr[1:4, y + 2 : y + 8, x + 4] = 0
+            arr[1:4, y + 3 : y + 5, x + 1 : x + 9] = 0
+        res = convex_fill(arr, workers=workers)
+        assert res.dtype == np.uint16
+        assert np.array_equal(res, expected)
+
+    @pytest.mark.parametrize(
+        "vertices", [[[8, 1], [1, 1], [1, 8]], [[9, 4], [6, 9], [2, 7], [0, 2], [5, 0]], [[7, 2], [2, 8], [3, 2]]]
+    )
+    def test_create_polygon(self, vertices):
+        vertices = np.array(vertices)
+        idxs = np.indices((10, 12))
+        expected = np.all([check(vertices[k - 1], vertices[k], idxs) for k in range(vertices.shape[0])], axis=0)
+        assert np.array_equal(create_polygon((10, 12), vertices), expected.astype(float))
+
 
 class TestSegmentationInfo:
     def test_none(self):
@@ -818,6 +939,20 @@ class TestSegmentationInfo:
         assert np.all(si.bound_info[1].upper == [10 * comp_num - 1, 8])
 
 
+@pytest.mark.parametrize("fully_connected", [True, False])
+@pytest.mark.parametrize("shape", [(9, 30, 30), (1, 40, 41)])
+@pytest.mark.parametrize("tile_size", [1, 4])
+def test_tiled_connected_components(fully_connected, shape, tile_size):
+    mask = (np.random.default_rng(0).random(shape) > 0.6).astype(np.uint8)
+    expected = SimpleITK.GetArrayFromImage(
+        SimpleITK.RelabelComponent(SimpleITK.ConnectedComponent(SimpleITK.GetImageFromArray(mask), fully_connected))
+    )
+    result = tiled_connected_components(mask, fully_connected, tile_size, workers=2)
+    assert result.dtype == expected.dtype
+    assert np.array_equal(result, expected)
+    assert not np.any(tiled_connected_components(np.zeros(shape, dtype=bool), fully_connected, tile_size))
+
+
 def test_bound_info():
     bi = BoundInfo(lower=np.array([1, 1, 1]), upper=np.array([5, 6, 7]))
     assert np.all(bi.box_size() == [5, 6, 7])
@@ -12,8 +12,9 @@ from PartSegCore.segmentation.border_smoothing import (
     OpeningSmoothingParams,
     VoteSmoothing,
     VoteSmoothingParams,
+    vote_smoothing,
 )
-from PartSegCore.segmentation.watershed import NeighType
+from PartSegCore.segmentation.watershed import NeighType, get_neighbourhood
 
 
 class TestVoteSmoothing:
@@ -557,6 +558,59 @@ class TestIterativeVoteSmoothing:
             assert np.all(res2 == res)
 
 
+def roll_vote_smoothing(segmentation, neighbourhood_type, support_level, max_steps, per_label=False):
+    segmentation = segmentation.copy()
+    neighbourhood = get_neighbourhood(segmentation.squeeze().shape, neighbourhood_type)
+    for _ in range(max_steps):
+        labels = segmentation if per_label else (segmentation > 0).astype(np.uint8)
+        count = np.zeros(segmentation.shape, dtype=np.uint8)
+        for shift in neighbourhood:
+            rolled = np.roll(labels, tuple(shift[: segmentation.ndim]), axis=tuple(range(segmentation.ndim)))
+            count += (rolled == labels) if per_label else rolled
+        removed = (segmentation > 0) & (count < support_level)
+        if not np.any(removed):
+            break
+        segmentation[removed] = 0
+    return segmentation
+
+
+class TestVoteSmoothingFunction:
+    def test_no_steps(self):
+        data = np.zeros((1, 10, 10), dtype=np.uint8)
+        data[0, 5, 5] = 1
+        res = vote_smoothing(data, NeighType.sides, 1, max_steps=0)
+        assert np.array_equal(res, data)
+        assert res is not data
+
+    def test_per_label(self):
+        data = np.zeros((1, 20, 20), dtype=np.uint8)
+        data[:, 2:-2, 2:10] = 1
+        data[:, 2:-2, 10:-2] = 2
+        res = vote_smoothing(data, NeighType.sides, 3)
+        res2 = np.copy(data)
+        for pos in itertools.product([2, -3], repeat=2):
+            res2[(0, *pos)] = 0
+        assert np.array_equal(res, res2)
+        res = vote_smoothing(data, NeighType.sides, 3, per_label=True)
+        for pos in itertools.product([2, -3], [9, 10]):
+            res2[(0, *pos)] = 0
+        assert np.array_equal(res, res2)
+        assert np.array_equal(res, roll_vote_smoothing(data, NeighType.sides, 3, 1, per_label=True))
+
+    @pytest.mark.parametrize("neighbourhood_type", NeighType.__members__.values())
+    @pytest.mark.parametrize("per_label", [True, False])
+    def test_multiple_tiles(self, neighbourhood_type, per_label):
+        data = np.random.default_rng(0).integers(0, 3, size=(3, 150, 70), dtype=np.uint8)
+        data[:, :, :20] = 0
+        support_level = {NeighType.sides: 3, NeighType.edges: 9, NeighType.vertex: 13}[neighbourhood_type]
+        expected = roll_vote_smoothing(data, neighbourhood_type, support_level, 10, per_label)
+        for workers in [1, 4]:
+            res = vote_smoothing(
+                data, neighbourhood_type, support_level, max_steps=10, per_label=per_label, workers=workers
+            )
+            assert np.array_equal(res, expected)
+
+
 class TestOpeningSmooth:
     def test_cube(self):
         data = np.zeros((50, 50, 50), dtype=np.uint8)
@@ -12,7 +12,16 @@ import tifffile
 from packaging.version import parse as parse_version
 
 import PartSegData
-from PartSegImage import CziImageReader, GenericImageReader, Image, ObsepImageReader, OifImagReader, TiffImageReader
+from PartSegImage import (
+    CziImageReader,
+    GenericImageReader,
+    Image,
+    ImageDescriptor,
+    ObsepImageReader,
+    OifImagReader,
+    TiffImageReader,
+)
+from PartSegImage.image_reader import probe_image
 
 
 @pytest.fixture(autouse=True)
@@ -34,6 +43,56 @@ class TestImageClass:
         assert isinstance(image, Image)
         assert np.all(np.isclose(image.spacing, (7.752248561753867e-08,) * 2))
 
+    def test_tiff_read_metadata(self, tmp_path):
+        tifffile.imwrite(
+            tmp_path / "test.tif",
+            np.zeros((3, 2, 10, 20), dtype=np.uint16),
+            imagej=True,
+            resolution=(0.5, 0.5),
+            metadata={"axes": "ZCYX", "spacing": 3, "unit": "um"},
+        )
+        descriptor = TiffImageReader.read_metadata(tmp_path / "test.tif")
+        assert descriptor.shape == (3, 2, 10, 20)
+        assert descriptor.axes == "ZCYX"
+        assert descriptor.channels == 2
+        assert np.allclose(descriptor.spacing, (3 * 10**-6, 2 * 10**-6, 2 * 10**-6))
+        assert descriptor.nbytes == 3 * 2 * 10 * 20 * 2
+        image = TiffImageReader.read_image(tmp_path / "test.tif")
+        assert ImageDescriptor.from_image(image).nbytes == descriptor.nbytes
+        assert ImageDescriptor.from_dict(descriptor.as_dict()) == descriptor
+
+    def test_probe_image_cache(self, tmp_path):
+        tifffile.imwrite(tmp_path / "test.tif", np.zeros((10, 20), dtype=np.uint8))
+        descriptor = probe_image(tmp_path / "test.tif")
+        assert descriptor.shape == (10, 20)
+        assert probe_image(str(tmp_path / "test.tif")) is descriptor
+        tifffile.imwrite(tmp_path / "test.tif", np.zeros((3, 10, 20), dtype=np.uint8), photometric="minisblack")
+        assert probe_image(tmp_path / "test.tif").shape == (3, 10, 20)
+
+    def test_tiff_read_shape(self, tmp_path):
+        tifffile.imwrite(tmp_path / "test.tif", np.zeros((3, 10, 20), dtype=np.uint16))
+        assert TiffImageReader.read_shape(tmp_path / "test.tif") == ((3, 10, 20), np.uint16)
+
+    def test_tiff_read_memmap(self, tmp_path):
+        data = np.arange(2 * 3 * 10 * 20, dtype=np.uint16).reshape((3, 2, 10, 20))
+        tifffile.imwrite(tmp_path / "test.tif", data, imagej=True, metadata={"axes": "ZCYX"})
+        image = TiffImageReader.read_image(tmp_path / "test.tif", memmap=True)
+        assert image.is_lazy
+        assert image.channels == 2
+        assert np.all(image.get_channel(1)[0] == data[:, 1])
+        assert np.all(image.get_data_by_axis(c=0, z=1)[0] == data[1, 0])
+        assert image.cut_image([slice(None), slice(1, 2), slice(2, 5), slice(3, 6)], frame=0).is_lazy
+        materialized = image.materialize()
+        assert not materialized.is_lazy
+        assert np.all(materialized.get_data() == image.get_data())
+        assert materialized.materialize() is materialized
+        assert not TiffImageReader.read_image(tmp_path / "test.tif").is_lazy
+
+    def test_tiff_read_memmap_compressed(self, tmp_path):
+        tifffile.imwrite(tmp_path / "test.tif", np.zeros((3, 10, 20), dtype=np.uint16), compression="zlib")
+        image = TiffImageReader.read_image(tmp_path / "test.tif", memmap=True)
+        assert not image.is_lazy
+
     def test_czi_file_read(self, data_test_dir):
         """Check if czi file is read correctly."""
         image = CziImageReader.read_image(os.path.join(data_test_dir, "test_czi.czi"))